@@ -27,6 +27,7 @@ except ImportError:
     parhugin_installed = False
 
 from mapreader.utils.load_frames import eval_dataframe, load_from_csv, load_from_geojson
+from mapreader.utils.patch_shards import load_patch_from_shard
 
 
 class PatchDataset(Dataset):
@@ -46,6 +47,7 @@ class PatchDataset(Dataset):
         The delimiter to use when reading the CSV/TSV file. By default ``","``.
     patch_paths_col : str, optional
         The name of the column in the DataFrame containing the image paths. Default is "image_path".
+        Patches with a ``shard_path`` (i.e. created using ``patchify_all(container="tar")``) are read from their shard instead.
     label_col : str, optional
         The name of the column containing the image labels. Default is None.
     label_index_col : str, optional
@@ -203,15 +205,7 @@ class PatchDataset(Dataset):
         if torch.is_tensor(idx):
             idx = idx.tolist()
 
-        img_path = self.patch_df.iloc[idx][self.patch_paths_col]
-
-        if os.path.exists(img_path):
-            img = Image.open(img_path).convert(self.image_mode)
-        else:
-            raise ValueError(
-                f'[ERROR] "{img_path} cannot be found.\n\n\
-Please check the image exists, your file paths are correct and that ``.patch_paths_col`` is set to the correct column.'
-            )
+        img = self._load_image(idx)
 
         img = self.transform(img)
 
@@ -253,6 +247,30 @@ Please check the image exists, your file paths are correct and that ``.patch_pat
         if torch.is_tensor(idx):
             idx = idx.tolist()
 
+        img = self._load_image(idx)
+
+        return img
+
+    def _load_image(self, idx: int) -> Image:
+        """
+        Load the image at the given index, either from its file or, if the
+        patch is stored in a shard (``shard_path`` column), from the shard.
+
+        Parameters
+        ----------
+        idx : int
+            The index of the image.
+
+        Returns
+        -------
+        PIL.Image.Image
+            The image, converted to ``image_mode``.
+        """
+        shard_path = self.patch_df.iloc[idx].get("shard_path")
+        if isinstance(shard_path, str):
+            patch_id = self.patch_df.index[idx]
+            return load_patch_from_shard(shard_path, patch_id).convert(self.image_mode)
+
         img_path = self.patch_df.iloc[idx][self.patch_paths_col]
 
         if os.path.exists(img_path):
@@ -262,7 +280,6 @@ Please check the image exists, your file paths are correct and that ``.patch_pat
                 f'[ERROR] "{img_path} cannot be found.\n\n\
 Please check the image exists, your file paths are correct and that ``.patch_paths_col`` is set to the correct column.'
             )
-
         return img
 
     def _default_transform(
@@ -3,8 +3,21 @@ from __future__ import annotations
 
 import numpy as np
 import rasterio
-from geopy.distance import geodesic, great_circle
-from pyproj import Transformer
+from pyproj import Geod, Transformer
+
+# mean radius of the earth (in meters), as used by ``geopy.distance.great_circle``
+_EARTH_RADIUS = 6371009
+_GEODS = {
+    "great-circle": Geod(a=_EARTH_RADIUS, f=0),
+    "geodesic": Geod(ellps="WGS84"),
+}
+_METHODS = {
+    "gc": "great-circle",
+    "great-circle": "great-circle",
+    "great_circle": "great-circle",
+    "geodesic": "geodesic",
+    "gd": "geodesic",
+}
 
 
 def extractGeoInfo(image_path):
@@ -39,6 +52,45 @@ def extractGeoInfo(image_path):
     return tiff_shape, tiff_proj, tiff_coord
 
 
+def calc_edge_lengths(
+    coordinates: np.ndarray | list[tuple], method: str = "great-circle"
+) -> np.ndarray:
+    """Calculate the length in meters of the edges of many images at once.
+
+    Parameters
+    ----------
+    coordinates : numpy.ndarray or list of tuple
+        Coordinates (xmin, ymin, xmax, ymax) of each image, in EPSG:4326.
+    method : str, optional
+        Method to use for calculating lengths, choices between ``"great-circle"`` (default), ``"gc"``, ``"great_circle"``, ``"geodesic"`` or ``"gd"``.
+        Great-circle lengths are calculated on a sphere with the mean radius of the earth and geodesic lengths on the WGS84 ellipsoid.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (images, 4) containing the length of the left, bottom, right and top edges (anticlockwise order) of each image.
+
+    Notes
+    -----
+    Lengths of all edges of all images are calculated in a single call to ``pyproj.Geod.inv``.
+    These match those calculated using ``geopy.distance.great_circle`` and ``geopy.distance.geodesic``.
+    """
+    if method not in _METHODS:
+        raise NotImplementedError(
+            f'[ERROR] Method must be one of "great-circle", "great_circle", "gc", "geodesic" or "gd", not: {method}'
+        )
+    geod = _GEODS[_METHODS[method]]
+
+    xmin, ymin, xmax, ymax = np.asarray(coordinates, dtype=float).reshape(-1, 4).T
+    _, _, lengths = geod.inv(
+        np.concatenate([xmin, xmin, xmax, xmax]),
+        np.concatenate([ymax, ymin, ymin, ymax]),
+        np.concatenate([xmin, xmax, xmax, xmin]),
+        np.concatenate([ymin, ymin, ymax, ymax]),
+    )
+    return lengths.reshape(4, -1).T
+
+
 def reproject_geo_info(image_path, target_crs="EPSG:4326", calc_size_in_m=False):
     """Extract geographic information from GeoTiff files and reproject to specified CRS (`target_crs`).
 
@@ -67,25 +119,13 @@ def reproject_geo_info(image_path, target_crs="EPSG:4326", calc_size_in_m=False)
     height, width, _ = tiff_shape
 
     # Calculate the size of image in meters
-    xmin, ymin, xmax, ymax = coord
     if calc_size_in_m:
-        if calc_size_in_m in ["geodesic", "gd"]:
-            bottom = geodesic((ymin, xmin), (ymin, xmax)).meters
-            right = geodesic((ymin, xmax), (ymax, xmax)).meters
-            top = geodesic((ymax, xmax), (ymax, xmin)).meters
-            left = geodesic((ymax, xmin), (ymin, xmin)).meters
-
-        elif calc_size_in_m in ["gc", "great-circle", "great_circle"]:
-            bottom = great_circle((ymin, xmin), (ymin, xmax)).meters
-            right = great_circle((ymin, xmax), (ymax, xmax)).meters
-            top = great_circle((ymax, xmax), (ymax, xmin)).meters
-            left = great_circle((ymax, xmin), (ymin, xmin)).meters
-
-        else:
+        if calc_size_in_m not in _METHODS:
             raise NotImplementedError(
                 f'[ERROR] ``calc_size_in_m`` must be one of "great-circle", "great_circle", "gc", "geodesic" or "gd", not: {calc_size_in_m}'
             )
 
+        left, bottom, right, top = calc_edge_lengths(coord, calc_size_in_m)[0].tolist()
         size_in_m = (left, bottom, right, top)  # anticlockwise order
 
         mean_pixel_height = np.mean([right / height, left / height])
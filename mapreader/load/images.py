@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-try:
-    from geopy.distance import geodesic, great_circle
-except ImportError:
-    pass
-
+import json
 import os
 import pathlib
 import random
 import re
 import warnings
 from ast import literal_eval
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
 from glob import glob
 from typing import Literal
 
@@ -20,20 +21,33 @@ import numpy as np
 import pandas as pd
 import PIL
 import rasterio
-from PIL import Image, ImageOps, ImageStat
+import shapely
+from PIL import Image, ImageOps
 from pyproj import Transformer
-from rasterio.plot import reshape_as_raster
 from shapely.geometry import box
 from tqdm.auto import tqdm
 
 from mapreader.download.data_structures import GridBoundingBox, GridIndex
 from mapreader.download.downloader_utils import get_polygon_from_grid_bb
+from mapreader.load.geo_utils import calc_edge_lengths
+from mapreader.utils.header_cache import ImageHeaderCache
+from mapreader.utils.image_store import ColumnarImageStore
 from mapreader.utils.load_frames import (
     get_geodataframe,
     load_from_csv,
     load_from_excel,
     load_from_geojson,
+    load_from_parquet,
+    save_to_parquet,
+)
+from mapreader.utils.parent_cache import ParentPixelCache
+from mapreader.utils.patch_shards import (
+    PatchShardWriter,
+    is_complete_shard,
+    load_patch_from_shard,
+    read_shard_index,
 )
+from mapreader.utils.sqlite_store import SQLiteImageStore
 
 os.environ[
     "USE_PYGEOS"
@@ -43,6 +57,13 @@ import geopandas as gpd  # noqa: E402
 # Ignore warnings
 warnings.filterwarnings("ignore")
 
+# size of the tiles of tiled geotiffs (in pixels)
+_GEOTIFF_TILE_SIZE = 256
+# approximate number of bytes of pixel values to hold in memory when copying an image to a geotiff
+_GEOTIFF_BLOCK_BYTES = 64 * 2**20
+# approximate number of bytes of pixel values (as floats) to hold in memory at once when calculating pixel stats
+_PIXEL_STATS_BATCH_BYTES = 64 * 2**20
+
 
 class MapImages:
     """
@@ -61,6 +82,25 @@ class MapImages:
         ``"parent"`` (default) and ``"patch"``.
     parent_path : str or None, optional
         Path to parent images (if applicable), by default ``None``.
+    storage : str, optional
+        How to store the image data, either ``"dict"`` (one dictionary per image), ``"columnar"`` (typed columns per key, see :class:`~.utils.image_store.ColumnarImageStore`) or ``"sqlite"`` (tables in a SQLite database, see :class:`~.utils.sqlite_store.SQLiteImageStore`).
+        Use ``"columnar"`` to reduce memory use when working with very large numbers of patches and ``"sqlite"`` to keep the images on disk so memory use does not grow with the number of patches.
+        By default ``"dict"``.
+    num_workers : int, optional
+        Number of threads to use to read image headers, by default ``1``.
+    header_cache : str or None, optional
+        Path to a SQLite database used to cache image headers (mode, shape, CRS and bounds), see :class:`~.utils.header_cache.ImageHeaderCache`.
+        Headers are keyed by file path, size and modification time so only new or changed images are opened when loading the same images again.
+        If None (default), no cache is used.
+    parent_cache : str, ParentPixelCache or None, optional
+        Directory (or :class:`~.utils.parent_cache.ParentPixelCache`) used to cache decoded parent images.
+        If given, each parent image is decoded once and its pixel values are then memory-mapped when patchifying, reading virtual patches and calculating pixel stats, including in worker processes.
+        Pass a :class:`~.utils.parent_cache.ParentPixelCache` to limit the size of the cache.
+        If None (default), parent images are decoded each time they are read.
+    catalog : str or None, optional
+        Directory in which to keep the SQLite databases used to store the images if ``storage="sqlite"`` (``parent.db`` and ``patch.db``).
+        It is created if it does not exist. Images already in the databases are kept, so a catalog can be reopened by passing the same directory.
+        If None (default), temporary databases are used.
     **kwargs : dict, optional
         Keyword arguments to pass to the
         :meth:`~.load.images.MapImages._images_constructor` method.
@@ -75,16 +115,39 @@ class MapImages:
         the ``tree_level`` parameter.
     """
 
+    # number of decoded parent images to keep in memory for reading virtual patches
+    _parent_image_cache_size = 2
+    # number of patches read by each task when calculating pixel stats
+    _pixel_stats_chunk_size = 1000
+
     def __init__(
         self,
         path_images: str | None = None,
         file_ext: str | None = None,
         tree_level: str = "parent",
         parent_path: str | None = None,
+        storage: str = "dict",
+        num_workers: int = 1,
+        header_cache: str | None = None,
+        parent_cache: str | ParentPixelCache | None = None,
+        catalog: str | None = None,
         **kwargs: dict,
     ):
         """Initializes the MapImages class."""
 
+        if storage not in ["dict", "columnar", "sqlite"]:
+            raise ValueError(
+                f'[ERROR] ``storage`` must be one of "dict", "columnar" or "sqlite", not: {storage}.'
+            )
+        self.storage = storage
+        self.catalog = catalog
+        self.header_cache = ImageHeaderCache(header_cache) if header_cache else None
+        self.parent_cache = (
+            ParentPixelCache(parent_cache)
+            if isinstance(parent_cache, str)
+            else parent_cache
+        )
+
         if path_images:
             self.path_images = self._resolve_file_path(path_images, file_ext)
 
@@ -93,21 +156,65 @@ class MapImages:
 
         # Create images variable (MAIN object variable)
         # New methods (e.g., reading/loading) should construct images this way
-        self.images = {"parent": {}, "patch": {}}
-        self.parents = self.images["parent"]
-        self.patches = self.images["patch"]
+        self._clear_images()
         self.georeferenced = False
 
-        for image_path in tqdm(self.path_images):
+        # decoded parent images, used to read patches which have not been saved
+        self._parent_image_cache = OrderedDict()
+
+        # read image headers (mode, shape and, for parents, CRS and bounds) up front
+        image_headers = self._read_image_headers(
+            self.path_images, num_workers, geo=tree_level == "parent"
+        )
+
+        for image_path, image_header in zip(tqdm(self.path_images), image_headers):
             self._images_constructor(
                 image_path=image_path,
                 parent_path=parent_path,
                 tree_level=tree_level,
+                image_header=image_header,
                 **kwargs,
             )
 
         self.check_georeferencing()
 
+    def _clear_images(self) -> None:
+        """Reset the ``images`` dictionary (and its ``parents`` and ``patches`` aliases) to empty."""
+        if self.storage == "columnar":
+            self.images = {
+                "parent": ColumnarImageStore(),
+                "patch": ColumnarImageStore(),
+            }
+        elif self.storage == "sqlite":
+            if hasattr(self, "images"):
+                for images in self.images.values():
+                    images.clear()
+            else:  # keep any images already in the catalog
+                if self.catalog is not None:
+                    os.makedirs(self.catalog, exist_ok=True)
+                self.images = {
+                    tree_level: SQLiteImageStore(
+                        (
+                            os.path.join(self.catalog, f"{tree_level}.db")
+                            if self.catalog is not None
+                            else None
+                        ),
+                        table=tree_level,
+                    )
+                    for tree_level in ["parent", "patch"]
+                }
+        else:
+            self.images = {"parent": {}, "patch": {}}
+        self.parents = self.images["parent"]
+        self.patches = self.images["patch"]
+
+        # sets of patch IDs for each parent, used to check membership of each parent's "patches" list
+        self._parent_patch_sets = {}
+        # spatial index of patch coordinates, built by ``query_patches``
+        self._patch_index = None
+        # grid positions of patches within their parents, built by ``neighbors``
+        self._patch_grid = None
+
     def check_georeferencing(self):
         if all(
             "coordinates" in self.parents[parent_id].keys()
@@ -147,11 +254,19 @@ class MapImages:
         If a directory is provided, the method will search for files with the specified extension (if provided) in the directory. Else it will search for all files in the directory.
         """
         if pathlib.Path(file_path).is_dir():
-            if file_ext:
-                files = [*pathlib.Path(file_path).glob(f"*.{file_ext}")]
-            else:
-                files = [*pathlib.Path(file_path).glob("*.*")]
-            files = [str(file) for file in files]  # convert to string
+            # list the directory once, without matching a glob pattern per file
+            dir_path = str(pathlib.Path(file_path))
+            with os.scandir(dir_path) as entries:
+                files = [
+                    os.path.join(dir_path, entry.name)
+                    for entry in entries
+                    if (
+                        entry.name.endswith(f".{file_ext}")
+                        if file_ext
+                        else "." in entry.name
+                    )
+                    and not entry.is_dir()
+                ]
 
         else:
             files = glob(
@@ -161,8 +276,8 @@ class MapImages:
         if len(files) == 0:
             raise ValueError("[ERROR] No files found!")
 
-        valid_file_exts = r"png$|jpg$|jpeg$|tif$|tiff$"
-        if any(re.search(valid_file_exts, file) is None for file in files):
+        valid_file_exts = ("png", "jpg", "jpeg", "tif", "tiff")
+        if not all(file.endswith(valid_file_exts) for file in files):
             raise ValueError(
                 "[ERROR] Non-image file types detected - please specify a file extension. Supported file types include: png, jpg, jpeg, tif, tiff."
             )
@@ -201,6 +316,7 @@ class MapImages:
         image_path: str,
         parent_path: str | None = None,
         tree_level: str | None = "parent",
+        image_header: dict | None = None,
         **kwargs: dict,
     ) -> None:
         """
@@ -217,6 +333,9 @@ class MapImages:
         tree_level : str, optional
             Level of the image hierarchy to construct, either ``"parent"``
             (default) or ``"parent"``.
+        image_header : dict or None, optional
+            Header of the image, if already read using :meth:`~.load.images.MapImages._read_image_headers`.
+            If None (default), the image is opened to check its mode and get its shape.
         **kwargs : dict, optional
             Additional keyword arguments to be included in the constructed
             image data.
@@ -254,7 +373,8 @@ class MapImages:
 
         abs_image_path, image_id, _ = self._convert_image_path(image_path)
 
-        self._check_image_mode(image_path)
+        if image_header is None:
+            image_header = self._read_image_header(image_path)
 
         # if parent_path is defined get absolute parent path and parent id (tree_level = "patch" is implied)
         if parent_path:
@@ -267,11 +387,11 @@ class MapImages:
         }
         if tree_level == "parent":
             try:
-                self._add_geo_info_id(image_id, verbose=False)
+                self._add_geo_info_id(image_id, verbose=False, geo_header=image_header)
             except:
                 pass
 
-        self._add_shape_id(image_id)
+        self.images[tree_level][image_id]["shape"] = image_header["shape"]
         for k, v in kwargs.items():
             self.images[tree_level][image_id][k] = v
 
@@ -288,6 +408,27 @@ class MapImages:
 
     @staticmethod
     def _check_image_mode(image_path):
+        MapImages._read_image_header(image_path)
+
+    @staticmethod
+    def _read_image_header(image_path: str, geo: bool = False) -> dict:
+        """Read the header of an image, checking that it is an image file with an accepted mode.
+
+        Only the image header is read, the pixel values are not decoded.
+
+        Parameters
+        ----------
+        image_path : str
+            Path to the image.
+        geo : bool, optional
+            If True, also read the CRS and bounds of the image using rasterio, by default ``False``.
+
+        Returns
+        -------
+        dict
+            The ``mode`` and ``shape`` (height, width, channels) of the image and, if ``geo=True``, its ``crs`` (None if the image has no CRS) and ``bounds``.
+            If rasterio cannot read the image, ``crs`` and ``bounds`` are not included.
+        """
         try:
             img = Image.open(image_path)
         except PIL.UnidentifiedImageError:
@@ -296,12 +437,145 @@ class MapImages:
 See https://pillow.readthedocs.io/en/stable/reference/Image.html#PIL.Image.open for more information."
             )
 
-        if img.mode not in ["1", "L", "LA", "I", "P", "RGB", "RGBA"]:
-            raise NotImplementedError(
-                f"[ERROR] Image mode '{img.mode}' not currently accepted.\n\n\
+        with img:
+            if img.mode not in ["1", "L", "LA", "I", "P", "RGB", "RGBA"]:
+                raise NotImplementedError(
+                    f"[ERROR] Image mode '{img.mode}' not currently accepted.\n\n\
 Please save your image(s) as one the following image modes: 1, L, LA, I, P, RGB or RGBA.\n\
 See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for more information."
-            )
+                )
+            header = {
+                "mode": img.mode,
+                "shape": (img.height, img.width, len(img.getbands())),
+            }
+
+        if geo:
+            try:
+                header["crs"], header["bounds"] = MapImages._read_geo_header(image_path)
+            except Exception:
+                pass
+
+        return header
+
+    @staticmethod
+    def _read_geo_header(image_path: str) -> tuple[str | None, tuple | None]:
+        """Read the CRS (as a string) and bounds of an image using rasterio.
+
+        Returns ``(None, None)`` if the image has no CRS.
+        """
+        with rasterio.open(image_path) as src:
+            if src.crs is None:
+                return None, None
+            return MapImages._crs_to_string(src.crs.to_wkt()), tuple(src.bounds)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _crs_to_string(crs_wkt: str) -> str:
+        """Convert a CRS (as WKT) to a string (e.g. ``"EPSG:27700"``).
+
+        Finding the authority code of a CRS is slow and most images share the same CRS, so strings are reused for each CRS.
+        """
+        return rasterio.crs.CRS.from_wkt(crs_wkt).to_string()
+
+    def _read_image_headers(
+        self, image_paths: list[str], num_workers: int = 1, geo: bool = False
+    ) -> list[dict]:
+        """Read the headers of many images (see :meth:`~.load.images.MapImages._read_image_header`).
+
+        If the MapImages instance has a ``header_cache``, headers of images which have not changed since they were cached are read from the cache and only the remaining images are opened.
+
+        Parameters
+        ----------
+        image_paths : list of str
+            Paths to the images.
+        num_workers : int, optional
+            Number of threads to use to read image headers, by default ``1``.
+            Reading headers is mostly waiting for file I/O so threads (rather than processes) are used.
+        geo : bool, optional
+            If True, also read the CRS and bounds of each image, by default ``False``.
+
+        Returns
+        -------
+        list of dict
+            Header of each image.
+        """
+        cached = self.header_cache.read(image_paths) if self.header_cache else {}
+        if geo:
+            # headers cached without geo info must be read again
+            cached = {
+                image_path: header
+                for image_path, header in cached.items()
+                if "crs" in header
+            }
+        to_read = [image_path for image_path in image_paths if image_path not in cached]
+
+        read_header = partial(MapImages._read_image_header, geo=geo)
+        if num_workers > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                new_headers = dict(zip(to_read, executor.map(read_header, to_read)))
+        else:
+            new_headers = {
+                image_path: read_header(image_path) for image_path in to_read
+            }
+
+        if self.header_cache and new_headers:
+            self.header_cache.write(new_headers)
+
+        headers = {**cached, **new_headers}
+        return [headers[image_path] for image_path in image_paths]
+
+    def _read_geo_headers(
+        self, image_paths: list[str], num_workers: int = 1
+    ) -> list[dict]:
+        """Read the CRS and bounds of many images using rasterio (see :meth:`~.load.images.MapImages._read_geo_header`).
+
+        Unlike :meth:`~.load.images.MapImages._read_image_headers`, images are not opened with PIL so the image mode is not checked (e.g. single-band float32 geotiffs can be read).
+
+        If the MapImages instance has a ``header_cache``, the CRS and bounds of images which have not changed since they were cached are read from the cache.
+        The CRS and bounds of the remaining images are only added to the cache if it already holds the rest of their headers.
+
+        Parameters
+        ----------
+        image_paths : list of str
+            Paths to the images.
+        num_workers : int, optional
+            Number of threads to use to read the CRS and bounds, by default ``1``.
+
+        Returns
+        -------
+        list of dict
+            The ``crs`` and ``bounds`` of each image.
+        """
+        cached = self.header_cache.read(image_paths) if self.header_cache else {}
+        to_read = [
+            image_path
+            for image_path in image_paths
+            if "crs" not in cached.get(image_path, {})
+        ]
+
+        if num_workers > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                geo_infos = list(executor.map(MapImages._read_geo_header, to_read))
+        else:
+            geo_infos = [
+                MapImages._read_geo_header(image_path) for image_path in to_read
+            ]
+        new_headers = {
+            image_path: {"crs": crs, "bounds": bounds}
+            for image_path, (crs, bounds) in zip(to_read, geo_infos)
+        }
+
+        if self.header_cache:
+            updated = {
+                image_path: {**cached[image_path], **header}
+                for image_path, header in new_headers.items()
+                if image_path in cached
+            }
+            if updated:
+                self.header_cache.write(updated)
+
+        headers = {**cached, **new_headers}
+        return [headers[image_path] for image_path in image_paths]
 
     @staticmethod
     def _convert_image_path(inp_path: str) -> tuple[str, str, str]:
@@ -482,20 +756,71 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                     f"[ERROR] Metadata contains information about non-existent images: {[*extra_metadata]}"
                 )
 
-        for key in self.images[tree_level].keys():
-            if key in missing_metadata:
-                continue
-            else:
-                data_series = metadata_df[metadata_df[image_id_col] == key].squeeze()
-                for column, item in data_series.items():
-                    try:
-                        self.images[tree_level][key][column] = literal_eval(item)
-                    except:
-                        self.images[tree_level][key][column] = item
+        # join on image ID (one lookup per image instead of a scan of the metadata per image)
+        metadata_df = metadata_df[
+            metadata_df[image_id_col].isin(self.images[tree_level].keys())
+        ].set_index(image_id_col, drop=False)
+        for column in metadata_df.columns:
+            if column != image_id_col and metadata_df[column].dtype == object:
+                metadata_df[column] = self._literal_eval_column(metadata_df[column])
+
+        for key, record in metadata_df.to_dict(orient="index").items():
+            self.images[tree_level][key].update(record)
+        if tree_level == "patch":
+            self._patch_index = None
+            self._patch_grid = None
 
         if tree_level == "parent":
             self.check_georeferencing()
 
+    @staticmethod
+    def _literal_eval_column(column: pd.Series) -> pd.Series:
+        """Evaluate each string in a metadata column as a Python literal, keeping the original value if it cannot be evaluated.
+
+        Parameters
+        ----------
+        column : pandas.Series
+            The column to evaluate.
+
+        Returns
+        -------
+        pandas.Series
+            The evaluated column.
+        """
+        # results for repeated strings, only kept if immutable (so values are never shared between images)
+        evaluated = {}
+
+        def _literal_eval(item):
+            if not isinstance(item, str):
+                return item
+            if item in evaluated:
+                return evaluated[item]
+            # strings starting with a name (e.g. file names, URLs, CRS strings) cannot be literals
+            if (
+                item[:1].isalpha()
+                and item not in ["True", "False", "None"]
+                and not re.match(r"[bBrRuU]{1,2}['\"]", item)
+            ):
+                result = item
+            else:
+                try:
+                    result = literal_eval(item)
+                except:
+                    result = item
+            try:
+                hash(result)
+                evaluated[item] = result
+            except TypeError:
+                pass
+            return result
+
+        return pd.Series(
+            [_literal_eval(item) for item in column],
+            index=column.index,
+            dtype=object,
+            name=column.name,
+        )
+
     def show_sample(
         self,
         num_samples: int,
@@ -537,7 +862,10 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
         for i, image_id in enumerate(sample_image_ids):
             plt.subplot(num_samples // 3 + 1, 3, i + 1)
-            img = Image.open(self.images[tree_level][image_id]["image_path"])
+            if tree_level == "patch":
+                img = self._load_patch_image(image_id)
+            else:
+                img = Image.open(self.images[tree_level][image_id]["image_path"])
             plt.title(image_id, size=8)
 
             # check if grayscale
@@ -559,6 +887,196 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         """Return list of all patches"""
         return list(self.patches.keys())
 
+    def query_patches(
+        self,
+        region: shapely.Geometry | tuple[float, ...],
+        predicate: str = "intersects",
+    ) -> list[str]:
+        """Find the patches whose coordinates match a region (e.g. all patches intersecting a bounding box).
+
+        Parameters
+        ----------
+        region : shapely.Geometry or tuple
+            The region to query. Either a shapely geometry, a bounding box as ``(min_x, min_y, max_x, max_y)`` or a point as ``(x, y)``, in the same CRS as the coordinates of the patches.
+        predicate : str, optional
+            The spatial predicate used to compare the region with each patch, evaluated as ``predicate(region, patch)``.
+            Options are ``"intersects"``, ``"within"``, ``"contains"``, ``"overlaps"``, ``"crosses"``, ``"touches"``, ``"covers"``, ``"covered_by"`` and ``"contains_properly"``.
+            By default ``"intersects"``.
+
+        Returns
+        -------
+        list of str
+            The IDs of the matching patches, in the order they were added.
+
+        Notes
+        -----
+        Patches are compared using the boxes given by their ``"coordinates"`` (see :meth:`~.load.images.MapImages.add_patch_coords`), patches without coordinates are never returned.
+        The first query builds a ``shapely.STRtree`` of these boxes, which is reused until patches are added or their coordinates are changed by MapImages.
+        If ``storage="sqlite"``, the R*Tree index of the database is used instead so the boxes are not held in memory.
+        """
+        if predicate not in shapely.strtree.BinaryPredicate.__members__:
+            raise ValueError(
+                f"[ERROR] ``predicate`` must be one of {list(shapely.strtree.BinaryPredicate.__members__)}, not: {predicate}."
+            )
+
+        if isinstance(region, shapely.Geometry):
+            geometry = region
+        elif isinstance(region, (tuple, list)) and len(region) == 4:
+            geometry = box(*region)
+        elif isinstance(region, (tuple, list)) and len(region) == 2:
+            geometry = shapely.Point(region)
+        else:
+            raise ValueError(
+                "[ERROR] ``region`` must be a shapely geometry, a bounding box ``(min_x, min_y, max_x, max_y)`` or a point ``(x, y)``."
+            )
+
+        if isinstance(self.patches, SQLiteImageStore):
+            patch_ids = self.patches.query_bounds(geometry.bounds)
+            if not patch_ids:
+                return []
+            boxes = shapely.box(
+                *np.array(
+                    [self.patches[patch_id]["coordinates"] for patch_id in patch_ids],
+                    dtype=float,
+                ).T
+            )
+            matches = getattr(shapely, predicate)(geometry, boxes)
+            return [patch_id for patch_id, match in zip(patch_ids, matches) if match]
+
+        tree, patch_ids = self._get_patch_index()
+        indices = np.sort(tree.query(geometry, predicate=predicate))
+        return patch_ids[indices].tolist()
+
+    def _get_patch_index(self) -> tuple[shapely.STRtree, np.ndarray]:
+        """Get the spatial index of patch coordinates used by :meth:`~.load.images.MapImages.query_patches`, building it if needed.
+
+        Returns
+        -------
+        tuple
+            The ``shapely.STRtree`` of patch boxes and an array of the IDs of the indexed patches.
+        """
+        if self._patch_index is not None:
+            tree, patch_ids, n_patches = self._patch_index
+            if n_patches == len(self.patches):
+                return tree, patch_ids
+
+        patch_ids = []
+        coords = []
+        for patch_id in self.patches.keys():
+            patch_coords = self.patches[patch_id].get("coordinates")
+            if patch_coords is not None:
+                patch_ids.append(patch_id)
+                coords.append(patch_coords)
+        coords = np.array(coords, dtype=float).reshape(-1, 4)
+
+        tree = shapely.STRtree(shapely.box(*coords.T))
+        patch_ids = np.array(patch_ids, dtype=object)
+        self._patch_index = (tree, patch_ids, len(self.patches))
+        return tree, patch_ids
+
+    def neighbors(self, patch_id: str, radius: int = 1) -> list[str]:
+        """Get the patches around a patch in the grid of patches of its parent (e.g. the 8 patches around it if ``radius=1``).
+
+        Parameters
+        ----------
+        patch_id : str
+            The ID of the patch.
+        radius : int, optional
+            How many rows and columns of patches around the patch to include, by default ``1``.
+
+        Returns
+        -------
+        list of str
+            The IDs of the surrounding patches which exist, from top-left to bottom-right (row by row).
+            The patch itself is not included.
+
+        Notes
+        -----
+        The row and column of each patch are found from its ``"pixel_bounds"``: the step between patches (i.e. the patch size minus the overlap) is the most common gap between the starts of neighbouring rows/columns of the same parent.
+        Patches whose start is not a whole number of steps from the previous row/column (e.g. the last patches created using ``method="square"``, which are moved back to fit in the parent image) are put in the next row/column.
+
+        The grid is built on the first call and reused until patches are added or changed by MapImages. It is saved and reloaded with :meth:`~.load.images.MapImages.save` and :meth:`~.load.images.MapImages.load`.
+        """
+        if patch_id not in self.patches.keys():
+            raise ValueError(f"[ERROR] {patch_id} not found in patches.")
+
+        cells, grid = self._get_patch_grid()
+        if patch_id not in cells:
+            raise ValueError(f"[ERROR] No pixel bounds found for {patch_id}.")
+
+        parent_id, row, col = cells[patch_id]
+        neighbor_ids = []
+        for row_offset in range(-radius, radius + 1):
+            for col_offset in range(-radius, radius + 1):
+                neighbor_id = grid.get((parent_id, row + row_offset, col + col_offset))
+                if neighbor_id is not None and neighbor_id != patch_id:
+                    neighbor_ids.append(neighbor_id)
+        return neighbor_ids
+
+    def _get_patch_grid(self) -> tuple[dict, dict]:
+        """Get the grid positions of patches used by :meth:`~.load.images.MapImages.neighbors`, building them if needed.
+
+        Returns
+        -------
+        tuple of two dicts
+            The ``(parent_id, row, col)`` of each patch (keyed by patch ID) and the patch ID at each ``(parent_id, row, col)``.
+        """
+        if self._patch_grid is not None:
+            cells, grid, n_patches = self._patch_grid
+            if n_patches == len(self.patches):
+                return cells, grid
+
+        parent_patches = {}
+        for patch_id in self.patches.keys():
+            pixel_bounds = self.patches[patch_id].get("pixel_bounds")
+            if pixel_bounds is not None:
+                parent_patches.setdefault(
+                    self.patches[patch_id].get("parent_id"), []
+                ).append((patch_id, pixel_bounds[0], pixel_bounds[1]))
+
+        cells = {}
+        for parent_id, parent_patch_starts in parent_patches.items():
+            patch_ids, min_x, min_y = zip(*parent_patch_starts)
+            rows = self._grid_positions(np.array(min_y))
+            cols = self._grid_positions(np.array(min_x))
+            for patch_id, row, col in zip(patch_ids, rows.tolist(), cols.tolist()):
+                cells[patch_id] = (parent_id, row, col)
+
+        self._set_patch_grid(cells)
+        return self._patch_grid[:2]
+
+    def _set_patch_grid(self, cells: dict) -> None:
+        """Set the grid positions of patches, given as the ``(parent_id, row, col)`` of each patch (keyed by patch ID)."""
+        grid = {cell: patch_id for patch_id, cell in cells.items()}
+        self._patch_grid = (cells, grid, len(self.patches))
+
+    @staticmethod
+    def _grid_positions(starts: np.ndarray) -> np.ndarray:
+        """Convert the starts (e.g. ``min_x``) of the patches of a parent into grid positions (e.g. columns).
+
+        Parameters
+        ----------
+        starts : numpy.ndarray
+            The start of each patch along one axis, in pixels.
+
+        Returns
+        -------
+        numpy.ndarray
+            The position of each patch along the axis, starting at ``0``.
+        """
+        unique_starts, inverse = np.unique(starts, return_inverse=True)
+        gaps = np.diff(unique_starts)
+        if not len(gaps):
+            return np.zeros(len(starts), dtype=int)
+
+        # most common gap (the smallest if there is a tie)
+        gap_values, gap_counts = np.unique(gaps, return_counts=True)
+        step = gap_values[np.argmax(gap_counts)]
+
+        steps = np.maximum(1, np.rint(gaps / step)).astype(int)
+        positions = np.concatenate([[0], np.cumsum(steps)])
+        return positions[inverse]
+
     def add_shape(self, tree_level: str | None = "parent") -> None:
         """
         Add a shape to each image in the specified level of the image
@@ -644,8 +1162,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         """
         patch_list = self.list_patches()
 
-        for patch_id in tqdm(patch_list):
-            self._add_patch_coords_id(patch_id, verbose)
+        self._add_patch_coords_ids(patch_list, verbose)
 
     def add_patch_polygons(self, verbose: bool = False) -> None:
         """Add polygon to all patches in patches dictionary.
@@ -658,8 +1175,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         """
         patch_list = self.list_patches()
 
-        for patch_id in tqdm(patch_list):
-            self._add_patch_polygons_id(patch_id, verbose)
+        self._add_patch_polygons_ids(patch_list, verbose)
 
     def add_center_coord(
         self, tree_level: str | None = "patch", verbose: bool | None = False
@@ -899,6 +1415,148 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
             self.patches[image_id]["coordinates"] = (min_x, min_y, max_x, max_y)
             self.patches[image_id]["crs"] = self.parents[parent_id]["crs"]
+            self._patch_index = None
+
+    def _add_patch_coords_ids(
+        self, image_ids: list[str], verbose: bool = False
+    ) -> None:
+        """Get coordinates of many patches at once.
+
+        Parameters
+        ----------
+        image_ids : list of str
+            The IDs of the patches
+        verbose : bool, optional
+            Whether to print verbose outputs.
+            By default, ``False``.
+
+        Return
+        -------
+        None
+
+        Notes
+        -----
+        This is a vectorized version of :meth:`~.load.images.MapImages._add_patch_coords_id`.
+        The pixel bounds of all patches are stacked into an array and converted to coordinates using the coordinates and coordinate increments (``dlon`` and ``dlat``) of their parents in a single pass.
+        """
+        # look up each parent once
+        parent_index = {}
+        parent_ids = []
+        valid_ids = []
+        for image_id in image_ids:
+            parent_id = self.patches[image_id]["parent_id"]
+            if parent_id not in parent_index:
+                if "coordinates" not in self.parents.get(parent_id, {}).keys():
+                    parent_index[parent_id] = None
+                else:
+                    if not all(
+                        [k in self.parents[parent_id].keys() for k in ["dlat", "dlon"]]
+                    ):
+                        self._add_coord_increments_id(parent_id)
+                    parent_index[parent_id] = len(parent_ids)
+                    parent_ids.append(parent_id)
+
+            if parent_index[parent_id] is None:
+                self._print_if_verbose(
+                    f"[WARNING] No coordinates found in  {parent_id} (parent of {image_id}). Suggestion: run add_metadata or add_geo_info.",
+                    verbose,
+                )
+            else:
+                valid_ids.append(image_id)
+
+        if len(valid_ids) == 0:
+            return
+
+        # parent_min_x, parent_max_y, dlon and dlat for each parent
+        parent_array = np.array(
+            [
+                (
+                    self.parents[parent_id]["coordinates"][0],
+                    self.parents[parent_id]["coordinates"][3],
+                    self.parents[parent_id]["dlon"],
+                    self.parents[parent_id]["dlat"],
+                )
+                for parent_id in parent_ids
+            ],
+            dtype=float,
+        )
+        parent_crs = [self.parents[parent_id]["crs"] for parent_id in parent_ids]
+
+        patch_parents = np.array(
+            [
+                parent_index[self.patches[image_id]["parent_id"]]
+                for image_id in valid_ids
+            ]
+        )
+        pixel_bounds = np.array(
+            [self.patches[image_id]["pixel_bounds"] for image_id in valid_ids],
+            dtype=float,
+        )
+        parent_min_x, parent_max_y, dlon, dlat = parent_array[patch_parents].T
+
+        # get patch coords
+        coords = np.stack(
+            [
+                (pixel_bounds[:, 0] * dlon) + parent_min_x,
+                parent_max_y - (pixel_bounds[:, 3] * dlat),
+                (pixel_bounds[:, 2] * dlon) + parent_min_x,
+                parent_max_y - (pixel_bounds[:, 1] * dlat),
+            ],
+            axis=1,
+        )
+
+        for image_id, patch_coords, i in zip(
+            valid_ids, zip(*coords.T.tolist()), patch_parents.tolist()
+        ):
+            self.patches[image_id]["coordinates"] = patch_coords
+            self.patches[image_id]["crs"] = parent_crs[i]
+        self._patch_index = None
+
+    def _add_patch_polygons_ids(
+        self, image_ids: list[str], verbose: bool = False
+    ) -> None:
+        """Create polygons for many patches at once and save to patch dictionary.
+
+        Parameters
+        ----------
+        image_ids : list of str
+            The IDs of the patches
+        verbose : bool, optional
+            Whether to print verbose outputs.
+            By default, ``False``.
+
+        Return
+        -------
+        None
+
+        Notes
+        -----
+        This is a vectorized version of :meth:`~.load.images.MapImages._add_patch_polygons_id`.
+        """
+        missing_coords = [
+            image_id
+            for image_id in image_ids
+            if "coordinates" not in self.patches[image_id].keys()
+        ]
+        if len(missing_coords):
+            self._add_patch_coords_ids(missing_coords, verbose)
+
+        image_ids = [
+            image_id
+            for image_id in image_ids
+            if "coordinates" in self.patches[image_id].keys()
+        ]
+        if len(image_ids) == 0:
+            return
+
+        coords = np.array(
+            [self.patches[image_id]["coordinates"] for image_id in image_ids],
+            dtype=float,
+        )
+        polygons = shapely.box(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+
+        for image_id, polygon in zip(image_ids, polygons):
+            self.patches[image_id]["geometry"] = polygon
 
     def _add_patch_polygons_id(self, image_id: str, verbose: bool = False) -> None:
         """Create polygon from a patch and save to patch dictionary.
@@ -1025,9 +1683,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         with either the :meth:`~.load.images.MapImages.add_metadata`
         or :meth:`~.load.images.MapImages.add_geo_info` methods.
 
-        The calculations are performed using the ``geopy.distance.geodesic``
-        and ``geopy.distance.great_circle`` methods. Thus, the method requires
-        the ``geopy`` package to be installed.
+        The calculations are performed using :func:`~.load.geo_utils.calc_edge_lengths`.
         """
 
         if "coordinates" not in self.parents[parent_id].keys():
@@ -1040,25 +1696,11 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             self._add_shape_id(parent_id)
 
         height, width, _ = self.parents[parent_id]["shape"]
-        xmin, ymin, xmax, ymax = self.parents[parent_id]["coordinates"]
 
         # Calculate the size of image in meters
-        if method in ["geodesic", "gd"]:
-            bottom = geodesic((ymin, xmin), (ymin, xmax)).meters
-            right = geodesic((ymin, xmax), (ymax, xmax)).meters
-            top = geodesic((ymax, xmax), (ymax, xmin)).meters
-            left = geodesic((ymax, xmin), (ymin, xmin)).meters
-
-        elif method in ["gc", "great-circle", "great_circle"]:
-            bottom = great_circle((ymin, xmin), (ymin, xmax)).meters
-            right = great_circle((ymin, xmax), (ymax, xmax)).meters
-            top = great_circle((ymax, xmax), (ymax, xmin)).meters
-            left = great_circle((ymax, xmin), (ymin, xmin)).meters
-
-        else:
-            raise NotImplementedError(
-                f'[ERROR] Method must be one of "great-circle", "great_circle", "gc", "geodesic" or "gd", not: {method}'
-            )
+        left, bottom, right, top = calc_edge_lengths(
+            [self.parents[parent_id]["coordinates"]], method
+        )[0].tolist()
 
         size_in_m = (left, bottom, right, top)  # anticlockwise order
 
@@ -1076,6 +1718,53 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
         return size_in_m, mean_pixel_height, mean_pixel_width
 
+    def _add_pixel_height_width_ids(
+        self, image_ids: list[str], tree_level: str = "parent"
+    ) -> None:
+        """Calculate the mean height and width (in meters) of the pixels of many images at once and add them to the ``images`` dictionary as ``pixel_height`` and ``pixel_width``.
+
+        Parameters
+        ----------
+        image_ids : list of str
+            The IDs of the images.
+            Images without coordinates are skipped.
+        tree_level : str, optional
+            The tree level of the images, by default ``"parent"``.
+
+        Notes
+        -----
+        This is a vectorized version of :meth:`~.load.images.MapImages._calc_pixel_height_width` (using the great-circle distance).
+        The lengths of the edges of all images are calculated in a single call to :func:`~.load.geo_utils.calc_edge_lengths`.
+        """
+        images = self.images[tree_level]
+        image_ids = [
+            image_id
+            for image_id in image_ids
+            if "coordinates" in images[image_id].keys()
+        ]
+        if len(image_ids) == 0:
+            return
+
+        for image_id in image_ids:
+            if "shape" not in images[image_id].keys():
+                self._add_shape_id(image_id)
+
+        coordinates = np.array(
+            [images[image_id]["coordinates"] for image_id in image_ids]
+        )
+        height, width = np.array(
+            [images[image_id]["shape"][:2] for image_id in image_ids]
+        ).T
+        left, bottom, right, top = calc_edge_lengths(coordinates).T
+
+        pixel_heights = (right / height + left / height) / 2
+        pixel_widths = (bottom / width + top / width) / 2
+        for image_id, pixel_height, pixel_width in zip(
+            image_ids, pixel_heights.tolist(), pixel_widths.tolist()
+        ):
+            images[image_id]["pixel_height"] = pixel_height
+            images[image_id]["pixel_width"] = pixel_width
+
     def patchify_all(
         self,
         method: str | None = "pixel",
@@ -1089,6 +1778,11 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         rewrite: bool | None = False,
         verbose: bool | None = False,
         overlap: int = 0,
+        num_workers: int = 1,
+        windowed: bool = False,
+        materialize: bool = True,
+        container: str = "files",
+        compute_stats: bool = False,
     ) -> None:
         """
         Patchify all images in the specified ``tree_level`` and (if ``add_to_parents=True``) add the patches to the MapImages instance's ``images`` dictionary.
@@ -1120,26 +1814,87 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             Format to use when writing image files, by default ``"png"``.
         rewrite : bool, optional
             If True, existing patches will be rewritten, by default ``False``.
+            If False, images which have already been patchified (with the same parameters) in ``path_save`` are skipped.
         verbose : bool, optional
             If True, progress updates will be printed throughout, by default
             ``False``.
         overlap : int, optional
             Fractional overlap between patches, by default ``0``.
+        num_workers : int, optional
+            Number of worker processes to use for patchifying.
+            If ``1`` (default), images are patchified one after another in the current process.
+            If greater than ``1``, images are patchified in parallel using a pool of ``num_workers`` processes.
+        windowed : bool, optional
+            If True, images are read in horizontal strips (one row of patches at a time) using rasterio windows instead of being loaded into memory in full.
+            This keeps memory use proportional to ``patch_size`` x image width and should be used for very large images (e.g. large GeoTIFFs).
+            Cannot be used with ``square_cuts=True``.
+            By default ``False``.
+        materialize : bool, optional
+            If True (default), patches are saved as image files in ``path_save``.
+            If False, no files are written and patches are only recorded by their parent and pixel bounds ("virtual patches").
+            The pixel values of virtual patches can be read using :meth:`~.load.images.MapImages.get_patch_array`.
+            Cannot be used with ``resize_factor``.
+        container : str, optional
+            How to store saved patches, either ``"files"`` (default) or ``"tar"``.
+            If ``"files"``, each patch is saved as its own image file.
+            If ``"tar"``, all patches of a parent are saved in a single tar file ("shard") named ``patches-#{parent_id}#.tar`` in ``path_save``, along with an index recording where each patch is stored.
+            Sharded patches have no ``image_path`` but are recorded with a ``shard_path`` and can be read using :meth:`~.load.images.MapImages.get_patch_array`, loaded using :meth:`~.load.images.MapImages.load_patches` or used in a :class:`~.classify.datasets.PatchDataset`.
+        compute_stats : bool, optional
+            If True, the mean and standard deviation of pixel values of each patch are calculated from the parent image while patchifying and stored in the same keys as :meth:`~.load.images.MapImages.calc_pixel_stats` (``mean_pixel_*`` and ``std_pixel_*``).
+            This avoids reading the patches again to calculate pixel stats.
+            By default ``False``.
 
         Returns
         -------
         None
+
+        Notes
+        -----
+        When ``num_workers > 1``, each worker process patchifies whole images and returns the patches it created.
+        These are then added to the ``images`` dictionary by the main process so the worker processes never modify the MapImages instance.
+
+        When patches are saved as files, a manifest recording the patches created from each image (and the parameters used) is saved in ``path_save/.manifests`` once all patches of that image have been saved.
+        If patchifying is interrupted and restarted, images with a manifest whose patch files all still exist (with the sizes recorded in the manifest) are skipped without decoding them and all patches of any other image are rewritten.
+        The manifest directory is hidden so it is not matched by ``load_patches(f"{path_save}/*")``.
         """
 
+        if windowed and square_cuts:
+            raise ValueError(
+                "[ERROR] ``windowed=True`` cannot be used with ``square_cuts=True``."
+            )
+        if container not in ["files", "tar"]:
+            raise ValueError(
+                f'[ERROR] ``container`` must be one of "files" or "tar", not: {container}.'
+            )
+        if resize_factor and not materialize:
+            raise ValueError(
+                "[ERROR] ``resize_factor`` cannot be used with ``materialize=False``."
+            )
+
         image_ids = self.images[tree_level].keys()
         original_patch_size = patch_size
 
         if path_save is None:
             path_save = f"patches_{patch_size}_{method}"
 
-        print(f'[INFO] Saving patches in directory named "{path_save}".')
+        if materialize:
+            print(f'[INFO] Saving patches in directory named "{path_save}".')
+
+            # make sure the dir exists
+            self._make_dir(path_save)
+
+        if square_cuts:
+            print(
+                "[WARNING] Square cuts is deprecated as of version 1.1.3 and will soon be removed."
+            )
+
+        if method in ["meters", "meter"]:
+            # calculate pixel sizes of all images at once
+            # (always recalculated as coordinates may have changed since they were last added)
+            self._add_pixel_height_width_ids(image_ids, tree_level)
 
-        for image_id in tqdm(image_ids):
+        tasks = []
+        for image_id in image_ids:
             image_path = self.images[tree_level][image_id]["image_path"]
 
             try:
@@ -1149,74 +1904,371 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
             self._print_if_verbose(f"[INFO] Patchifying {full_path}", verbose)
 
-            # make sure the dir exists
-            self._make_dir(path_save)
-
             if method in ["meters", "meter"]:
                 if "coordinates" not in self.images[tree_level][image_id].keys():
                     raise ValueError(
                         "[ERROR] Please add coordinate information first. Suggestion: Run add_metadata or add_geo_info."  # noqa
                     )
 
-                mean_pixel_height = self._calc_pixel_height_width(image_id)[1]
+                mean_pixel_height = self.images[tree_level][image_id]["pixel_height"]
                 patch_size = int(
                     original_patch_size / mean_pixel_height
                 )  ## check this is correct - should patch be different size in x and y?
 
-            if square_cuts:
-                print(
-                    "[WARNING] Square cuts is deprecated as of version 1.1.3 and will soon be removed."
-                )
+            task = {
+                "image_id": image_id,
+                "parent_path": image_path,
+                "patch_size": patch_size,
+                "path_save": path_save,
+                "resize_factor": resize_factor,
+                "output_format": output_format,
+                "rewrite": rewrite,
+                "verbose": verbose,
+                "square_cuts": square_cuts,
+                "materialize": materialize,
+                "container": container,
+                "compute_stats": compute_stats,
+                "parent_cache": self.parent_cache,
+            }
+            if not square_cuts:
+                task["overlap"] = overlap
+                task["windowed"] = windowed
+            tasks.append(task)
+
+        if num_workers > 1:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                for task, patch_records in zip(
+                    tasks,
+                    tqdm(executor.map(self._patchify_image, tasks), total=len(tasks)),
+                ):
+                    if add_to_parents:
+                        self._add_patch_records(patch_records, task["parent_path"])
+        else:
+            for task in tqdm(tasks):
+                patch_records = self._patchify_image(task)
+                if add_to_parents:
+                    self._add_patch_records(patch_records, task["parent_path"])
 
-                self._patchify_by_pixel_square(
-                    image_id=image_id,
-                    patch_size=patch_size,
-                    path_save=path_save,
-                    add_to_parents=add_to_parents,
-                    resize_factor=resize_factor,
-                    output_format=output_format,
-                    rewrite=rewrite,
-                    verbose=verbose,
-                )
+    @staticmethod
+    def _patchify_image(task: dict) -> dict:
+        """Patchify one image using the arguments in ``task``.
 
-            else:
-                self._patchify_by_pixel(
-                    image_id=image_id,
-                    patch_size=patch_size,
-                    path_save=path_save,
-                    add_to_parents=add_to_parents,
-                    resize_factor=resize_factor,
-                    output_format=output_format,
-                    rewrite=rewrite,
-                    verbose=verbose,
-                    overlap=overlap,
+        This is a static method so that it can be sent to worker processes
+        without pickling the MapImages instance.
+
+        Parameters
+        ----------
+        task : dict
+            Keyword arguments for
+            :meth:`~.load.images.MapImages._patchify_by_pixel`,
+            :meth:`~.load.images.MapImages._patchify_by_pixel_windowed` or
+            :meth:`~.load.images.MapImages._patchify_by_pixel_square`,
+            plus ``square_cuts`` and ``windowed`` to choose between them.
+
+        Returns
+        -------
+        dict
+            Dictionary of patch records keyed by patch ID.
+            If ``resize_factor`` is used, it is added to each patch record.
+        """
+        task = task.copy()
+        container = task.pop("container", "files")
+        if not task.get("materialize", True):
+            patch_records = MapImages._patchify_image_by_method(task)
+        elif container == "tar":
+            patch_records = MapImages._patchify_image_to_shard(task)
+        else:
+            patch_records = MapImages._patchify_image_to_files(task)
+
+        # patches of resized images cannot be cut from the parent image using their pixel bounds
+        if task.get("resize_factor"):
+            for patch_record in patch_records.values():
+                patch_record["resize_factor"] = task["resize_factor"]
+        return patch_records
+
+    @staticmethod
+    def _patchify_image_by_method(task: dict) -> dict:
+        """Patchify one image using the method chosen by ``square_cuts`` and ``windowed`` in ``task``."""
+        task = task.copy()
+        if task.pop("square_cuts"):
+            return MapImages._patchify_by_pixel_square(**task)
+        if task.pop("windowed", False):
+            # windowed patchifying never decodes the whole image
+            task.pop("parent_cache", None)
+            return MapImages._patchify_by_pixel_windowed(**task)
+        return MapImages._patchify_by_pixel(**task)
+
+    @staticmethod
+    def _open_parent_image(
+        parent_path: str, parent_cache: ParentPixelCache | None = None
+    ) -> Image.Image:
+        """Open a parent image, using its cached pixel values if ``parent_cache`` is given."""
+        if parent_cache is None:
+            return Image.open(parent_path)
+        return parent_cache.get_image(parent_path)
+
+    @staticmethod
+    def _patchify_image_to_files(task: dict) -> dict:
+        """Patchify one image using the arguments in ``task``, saving each patch as a file and recording the patches created in a manifest.
+
+        If a manifest for the image already exists (and was created using the same parameters and all of its patch files still exist with the recorded sizes), the patches are not created again and the patch records are read from the manifest instead.
+        Otherwise, all patches of the image are (re)written, so patches left incomplete by an interrupted run are never kept.
+
+        Parameters
+        ----------
+        task : dict
+            Keyword arguments for :meth:`~.load.images.MapImages._patchify_image`.
+
+        Returns
+        -------
+        dict
+            Dictionary of patch records (containing ``image_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        """
+        manifest_path = MapImages._get_manifest_path(
+            task["path_save"], task["image_id"]
+        )
+        parameters = {
+            key: task.get(key)
+            for key in [
+                "parent_path",
+                "patch_size",
+                "resize_factor",
+                "output_format",
+                "square_cuts",
+                "overlap",
+            ]
+        }
+
+        if not task["rewrite"]:
+            patch_records = MapImages._read_manifest(
+                manifest_path, parameters, task["path_save"]
+            )
+            if patch_records is not None:
+                MapImages._print_if_verbose(
+                    f"[INFO] Patches already exist for: {task['image_id']}.",
+                    task["verbose"],
+                )
+                if task.get("compute_stats") and not all(
+                    "mean_pixel" in patch_record
+                    for patch_record in patch_records.values()
+                ):
+                    img = MapImages._open_parent_image(
+                        task["parent_path"], task.get("parent_cache")
+                    )
+                    if task["resize_factor"]:
+                        img = img.resize(
+                            (
+                                int(img.width / task["resize_factor"]),
+                                int(img.height / task["resize_factor"]),
+                            )
+                        )
+                    MapImages._add_patch_stats(img, patch_records)
+                return patch_records
+
+        # remove any old manifest first so the image is not marked as done if interrupted
+        if os.path.isfile(manifest_path):
+            os.remove(manifest_path)
+
+        patch_records = MapImages._patchify_image_by_method({**task, "rewrite": True})
+        MapImages._write_manifest(manifest_path, parameters, patch_records)
+        return patch_records
+
+    @staticmethod
+    def _get_manifest_path(path_save: str, image_id: str) -> str:
+        """Get the path to the manifest of the patches created from an image."""
+        return os.path.join(path_save, ".manifests", f"#{image_id}#.json")
+
+    @staticmethod
+    def _read_manifest(
+        manifest_path: str, parameters: dict, path_save: str
+    ) -> dict | None:
+        """Read the patch records from a manifest, checking that the patch files it lists still exist with the recorded sizes.
+
+        Parameters
+        ----------
+        manifest_path : str
+            Path to the manifest.
+        parameters : dict
+            Parameters which must match those used to create the manifest.
+        path_save : str
+            Directory containing the patch files.
+
+        Returns
+        -------
+        dict or None
+            Dictionary of patch records (containing ``image_path``, ``shape``, ``pixel_bounds`` and any pixel stats) keyed by patch ID.
+            None if the manifest does not exist, was created using different parameters or if any of its patch files is missing or has changed size.
+        """
+        if not os.path.isfile(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["parameters"] != json.loads(json.dumps(parameters)):
+            return None
+
+        patch_records = {}
+        for patch_id, patch_record in manifest["patches"].items():
+            image_path = os.path.abspath(os.path.join(path_save, patch_id))
+            try:
+                file_size = os.stat(image_path).st_size
+            except FileNotFoundError:
+                return None
+            if file_size != manifest["file_sizes"].get(patch_id):
+                return None
+            patch_record["shape"] = tuple(patch_record["shape"])
+            patch_record["pixel_bounds"] = tuple(patch_record["pixel_bounds"])
+            patch_records[patch_id] = {"image_path": image_path, **patch_record}
+        return patch_records
+
+    @staticmethod
+    def _write_manifest(
+        manifest_path: str, parameters: dict, patch_records: dict
+    ) -> None:
+        """Write a manifest recording the patches created from an image.
+
+        The manifest is written to a temporary file first so an incomplete manifest is never read.
+
+        Parameters
+        ----------
+        manifest_path : str
+            Path to the manifest.
+        parameters : dict
+            Parameters used to create the patches.
+        patch_records : dict
+            Dictionary of patch records keyed by patch ID.
+        """
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        manifest = {
+            "parameters": parameters,
+            "patches": {
+                patch_id: {
+                    key: value
+                    for key, value in patch_record.items()
+                    if key != "image_path"
+                }
+                for patch_id, patch_record in patch_records.items()
+            },
+            "file_sizes": {
+                patch_id: os.stat(patch_record["image_path"]).st_size
+                for patch_id, patch_record in patch_records.items()
+            },
+        }
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    @staticmethod
+    def _patchify_image_to_shard(task: dict) -> dict:
+        """Patchify one image using the arguments in ``task``, saving its patches in a tar shard.
+
+        Parameters
+        ----------
+        task : dict
+            Keyword arguments for :meth:`~.load.images.MapImages._patchify_image`.
+
+        Returns
+        -------
+        dict
+            Dictionary of patch records (containing ``shard_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        """
+        shard_path = os.path.abspath(
+            os.path.join(task["path_save"], f"patches-#{task['image_id']}#.tar")
+        )
+
+        if is_complete_shard(shard_path) and not task["rewrite"]:
+            MapImages._print_if_verbose(
+                f"[INFO] File already exists: {shard_path}.", task["verbose"]
+            )
+            patch_records = {
+                patch_id: {
+                    "image_path": None,
+                    "shape": entry["shape"],
+                    "pixel_bounds": MapImages.detect_pixel_bounds_from_path(patch_id),
+                    "shard_path": shard_path,
+                }
+                for patch_id, entry in read_shard_index(shard_path).items()
+            }
+            if task.get("compute_stats"):
+                img = MapImages._open_parent_image(
+                    task["parent_path"], task.get("parent_cache")
                 )
+                if task["resize_factor"]:
+                    img = img.resize(
+                        (
+                            int(img.width / task["resize_factor"]),
+                            int(img.height / task["resize_factor"]),
+                        )
+                    )
+                MapImages._add_patch_stats(img, patch_records)
+            return patch_records
+
+        with PatchShardWriter(shard_path) as shard_writer:
+            patch_records = MapImages._patchify_image_by_method(
+                {**task, "shard_writer": shard_writer}
+            )
+
+        for patch_record in patch_records.values():
+            patch_record["image_path"] = None
+            patch_record["shard_path"] = shard_path
+        return patch_records
 
+    def _add_patch_records(self, patch_records: dict, parent_path: str) -> None:
+        """Add patches created by patchifying an image to the MapImages instance's ``images`` dictionary.
+
+        Parameters
+        ----------
+        patch_records : dict
+            Dictionary of patch records (containing ``image_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        parent_path : str
+            Path to the parent image.
+
+        Notes
+        -----
+        Patch records are created from the patches held in memory during patchifying so, unlike :meth:`~.load.images.MapImages._images_constructor`, this method does not open the patch files.
+        """
+        abs_parent_path, parent_id, _ = self._convert_image_path(parent_path)
+
+        if parent_id not in self.parents.keys():
+            self.parents[parent_id] = {
+                "parent_id": None,
+                "image_path": abs_parent_path,
+                "patches": [],
+            }
+
+        for patch_id, patch_record in patch_records.items():
+            self.patches[patch_id] = {"parent_id": parent_id, **patch_record}
+            self._add_patch_to_parent(patch_id)
+
+        self._add_patch_polygons_ids(list(patch_records.keys()))
+
+    @staticmethod
     def _patchify_by_pixel(
-        self,
         image_id: str,
+        parent_path: str,
         patch_size: int,
         path_save: str,
-        add_to_parents: bool | None = True,
         resize_factor: bool | None = False,
         output_format: str | None = "png",
         rewrite: bool | None = False,
         verbose: bool | None = False,
         overlap: int | None = 0,
-    ):
-        """Patchify one image and (if ``add_to_parents=True``) add the patch to the MapImages instance's ``images`` dictionary.
+        materialize: bool = True,
+        shard_writer: PatchShardWriter | None = None,
+        compute_stats: bool = False,
+        parent_cache: ParentPixelCache | None = None,
+    ) -> dict:
+        """Patchify one image and return the patches created.
 
         Parameters
         ----------
         image_id : str
             The ID of the image to patchify
+        parent_path : str
+            Path to the image to patchify.
         patch_size : int
             Number of pixels in both x and y to use for slicing
         path_save : str
             Directory to save the patches.
-        add_to_parents : bool, optional
-            If True, patches will be added to the MapImages instance's
-            ``images`` dictionary, by default ``True``.
         resize_factor : bool, optional
             If True, resize the images before patchifying, by default ``False``.
         output_format : str, optional
@@ -1228,11 +2280,21 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             ``False``.
         overlap : int, optional
             Fractional overlap between patches, by default ``0``.
-        """
-        tree_level = self._get_tree_level(image_id)
+        materialize : bool, optional
+            If False, patches are not saved (``image_path`` is set to None), by default ``True``.
+        shard_writer : PatchShardWriter or None, optional
+            If given, patches are added to this shard instead of being saved as files, by default None.
+        compute_stats : bool, optional
+            If True, pixel stats are calculated for each patch and added to its record, by default ``False``.
+        parent_cache : ParentPixelCache or None, optional
+            If given, the image is read from this cache of decoded images, by default None.
 
-        parent_path = self.images[tree_level][image_id]["image_path"]
-        img = Image.open(parent_path)
+        Returns
+        -------
+        dict
+            Dictionary of patch records (containing ``image_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        """
+        img = MapImages._open_parent_image(parent_path, parent_cache)
 
         if resize_factor:
             original_height, original_width = img.height, img.width
@@ -1244,7 +2306,10 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             )
 
         height, width = img.height, img.width
+        # shape of patches which already exist (all patches are padded to patch_size)
+        default_shape = (patch_size, patch_size, len(img.getbands()))
 
+        patch_records = {}
         x = 0
         while x < width:
             y = 0
@@ -1256,8 +2321,13 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                 patch_path = os.path.join(path_save, patch_id)
                 patch_path = os.path.abspath(patch_path)
 
-                if os.path.isfile(patch_path) and not rewrite:
-                    self._print_if_verbose(
+                patch_shape = default_shape
+                if not materialize:
+                    patch_path = None
+                elif (
+                    shard_writer is None and os.path.isfile(patch_path) and not rewrite
+                ):
+                    MapImages._print_if_verbose(
                         f"[INFO] File already exists: {patch_path}.", verbose
                     )
 
@@ -1278,47 +2348,459 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                             f"[ERROR] Patch size is {patch.height}x{patch.width} instead of {patch_size}x{patch_size}."
                         )
 
-                    patch.save(patch_path, output_format)
-
-                if add_to_parents:
-                    self._images_constructor(
-                        image_path=patch_path,
-                        parent_path=parent_path,
-                        tree_level="patch",
-                        pixel_bounds=(x, y, max_x, max_y),
+                    MapImages._save_patch(
+                        patch, patch_id, patch_path, output_format, shard_writer
                     )
-                    self._add_patch_coords_id(patch_id)
-                    self._add_patch_polygons_id(patch_id)
+                    patch_shape = (patch.height, patch.width, len(patch.getbands()))
+
+                patch_records[patch_id] = {
+                    "image_path": patch_path,
+                    "shape": patch_shape,
+                    "pixel_bounds": (x, y, max_x, max_y),
+                }
 
                 overlap_pixels = int(patch_size * overlap)
                 y = y + patch_size - overlap_pixels
             x = x + patch_size - overlap_pixels
 
+        if compute_stats:
+            MapImages._add_patch_stats(img, patch_records)
+
+        return patch_records
+
+    @staticmethod
+    def _patchify_by_pixel_windowed(
+        image_id: str,
+        parent_path: str,
+        patch_size: int,
+        path_save: str,
+        resize_factor: bool | None = False,
+        output_format: str | None = "png",
+        rewrite: bool | None = False,
+        verbose: bool | None = False,
+        overlap: int | None = 0,
+        materialize: bool = True,
+        shard_writer: PatchShardWriter | None = None,
+        compute_stats: bool = False,
+    ) -> dict:
+        """Patchify one image, reading it in horizontal strips, and return the patches created.
+
+        Each strip is ``patch_size`` pixels high and spans the full width of the image.
+        Rows are only ever read forwards (rows shared by overlapping strips are kept in memory) so that formats which must be decoded sequentially (e.g. PNG) are only decoded once.
+
+        Parameters
+        ----------
+        image_id : str
+            The ID of the image to patchify
+        parent_path : str
+            Path to the image to patchify.
+        patch_size : int
+            Number of pixels in both x and y to use for slicing
+        path_save : str
+            Directory to save the patches.
+        resize_factor : bool, optional
+            If True, resize the images before patchifying, by default ``False``.
+        output_format : str, optional
+            Format to use when writing image files, by default ``"png"``.
+        rewrite : bool, optional
+            If True, existing patches will be rewritten, by default ``False``.
+        verbose : bool, optional
+            If True, progress updates will be printed throughout, by default
+            ``False``.
+        overlap : int, optional
+            Fractional overlap between patches, by default ``0``.
+        materialize : bool, optional
+            If False, patches are not saved (``image_path`` is set to None), by default ``True``.
+        shard_writer : PatchShardWriter or None, optional
+            If given, patches are added to this shard instead of being saved as files, by default None.
+        compute_stats : bool, optional
+            If True, pixel stats are calculated for each patch and added to its record, by default ``False``.
+
+        Returns
+        -------
+        dict
+            Dictionary of patch records (containing ``image_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        """
+        # only reads the header
+        img = Image.open(parent_path)
+        mode, palette, bands = img.mode, img.getpalette(), img.getbands()
+
+        step = patch_size - int(patch_size * overlap)
+
+        patch_records = {}
+        with rasterio.open(parent_path) as src:
+            scale = resize_factor if resize_factor else 1
+            width = int(src.width / scale)
+            height = int(src.height / scale)
+
+            # rows [strip_start, strip_start + len(strip)) of the (resized) image
+            strip = np.zeros((0, width, src.count), dtype=src.dtypes[0])
+            strip_start = 0
+
+            for y in range(0, height, step):
+                max_y = min(y + patch_size, height)
+
+                to_write = []
+                row_patches = []
+                for x in range(0, width, step):
+                    max_x = min(x + patch_size, width)
+
+                    patch_id = (
+                        f"patch-{x}-{y}-{max_x}-{max_y}-#{image_id}#.{output_format}"
+                    )
+                    row_patches.append((patch_id, x, max_x))
+                    patch_path = os.path.join(path_save, patch_id)
+                    patch_path = os.path.abspath(patch_path)
+
+                    if not materialize:
+                        patch_path = None
+                    elif (
+                        shard_writer is None
+                        and os.path.isfile(patch_path)
+                        and not rewrite
+                    ):
+                        MapImages._print_if_verbose(
+                            f"[INFO] File already exists: {patch_path}.", verbose
+                        )
+                    else:
+                        to_write.append((patch_id, x, max_x, patch_path))
+
+                    patch_records[patch_id] = {
+                        "image_path": patch_path,
+                        "shape": (patch_size, patch_size, len(img.getbands())),
+                        "pixel_bounds": (x, y, max_x, max_y),
+                    }
+
+                if not to_write and not compute_stats:
+                    continue
+
+                strip = MapImages._advance_strip(
+                    src, strip, strip_start, y, max_y, width, scale
+                )
+                strip_start = y
+
+                if compute_stats:
+                    patch_ids, min_x, max_x = zip(*row_patches)
+                    mean, std = MapImages._calc_strip_stats(
+                        strip[: max_y - y], min_x, max_x, mode
+                    )
+                    MapImages._add_pixel_stats(
+                        patch_records, patch_ids, bands, mean, std
+                    )
+
+                for patch_id, x, max_x, patch_path in to_write:
+                    patch_array = np.zeros(
+                        (patch_size, patch_size, src.count), dtype=strip.dtype
+                    )
+                    patch_array[: max_y - y, : max_x - x] = strip[:, x:max_x]
+                    patch = MapImages._array_to_image(patch_array, mode, palette)
+                    MapImages._save_patch(
+                        patch, patch_id, patch_path, output_format, shard_writer
+                    )
+
+        # match the order of patches created by ``_patchify_by_pixel``
+        return dict(
+            sorted(patch_records.items(), key=lambda item: item[1]["pixel_bounds"])
+        )
+
+    @staticmethod
+    def _save_patch(
+        patch: Image.Image,
+        patch_id: str,
+        patch_path: str,
+        output_format: str,
+        shard_writer: PatchShardWriter | None = None,
+    ) -> None:
+        """Save a patch, either as a file at ``patch_path`` or in a shard."""
+        if shard_writer is not None:
+            shard_writer.add(patch_id, patch, output_format)
+        else:
+            patch.save(patch_path, output_format)
+
+    @staticmethod
+    def _advance_strip(
+        src: rasterio.io.DatasetReader,
+        strip: np.ndarray,
+        strip_start: int,
+        min_y: int,
+        max_y: int,
+        width: int,
+        scale: float = 1,
+    ) -> np.ndarray:
+        """Move a strip of rows down an image so that it holds rows ``min_y`` to ``max_y``.
+
+        Rows above ``min_y`` are dropped and only rows which are not already in ``strip`` are read, so each row is only read once.
+
+        Parameters
+        ----------
+        src : rasterio.io.DatasetReader
+            The open image.
+        strip : numpy.ndarray
+            The rows currently held, starting at row ``strip_start``.
+        strip_start : int
+            First row of ``strip`` (in resized pixels).
+        min_y : int
+            First row of the new strip (in resized pixels), must be ``>= strip_start``.
+        max_y : int
+            Row after the last row of the new strip (in resized pixels).
+        width : int
+            Width of the resized image.
+        scale : float, optional
+            Factor by which the image is downsized, by default ``1``.
+
+        Returns
+        -------
+        numpy.ndarray
+            The new strip, starting at row ``min_y``.
+        """
+        strip = strip[max(min_y - strip_start, 0) :]
+        if min_y + len(strip) < max_y:
+            new_rows = MapImages._read_rows(
+                src, min_y + len(strip), max_y, width, scale
+            )
+            strip = np.concatenate([strip, new_rows])
+        return strip
+
+    @staticmethod
+    def _read_rows(
+        src: rasterio.io.DatasetReader,
+        min_y: int,
+        max_y: int,
+        width: int,
+        scale: float = 1,
+    ) -> np.ndarray:
+        """Read rows ``min_y`` to ``max_y`` of an image (resized by ``1/scale``) using a rasterio window.
+
+        Parameters
+        ----------
+        src : rasterio.io.DatasetReader
+            The open image.
+        min_y : int
+            First row to read (in resized pixels).
+        max_y : int
+            Row after the last row to read (in resized pixels).
+        width : int
+            Width of the resized image.
+        scale : float, optional
+            Factor by which the image is downsized, by default ``1``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (``max_y - min_y``, ``width``, bands).
+        """
+        window = rasterio.windows.Window(
+            0,
+            round(min_y * scale),
+            src.width,
+            round(max_y * scale) - round(min_y * scale),
+        )
+        rows = src.read(
+            window=window,
+            out_shape=(src.count, max_y - min_y, width),
+            resampling=rasterio.enums.Resampling.cubic,
+        )
+        return np.moveaxis(rows, 0, -1)
+
+    @staticmethod
+    def _array_to_image(
+        array: np.ndarray, mode: str, palette: list | None = None
+    ) -> Image.Image:
+        """Convert an array of shape (height, width, bands) into a PIL image of the given mode.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            The pixel values, as read by rasterio.
+        mode : str
+            The PIL image mode of the image the array was read from.
+        palette : list or None, optional
+            The palette of the image the array was read from (only used if ``mode="P"``), by default None.
+
+        Returns
+        -------
+        PIL.Image.Image
+            The image.
+        """
+        if mode == "1":
+            return Image.fromarray(array[:, :, 0].astype(bool))
+        if array.shape[2] == 1:
+            img = Image.fromarray(array[:, :, 0])
+            if mode == "P":
+                img.putpalette(palette)
+            return img
+        return Image.fromarray(array)
+
+    @staticmethod
+    def _add_patch_stats(img: Image.Image, patch_records: dict) -> None:
+        """Calculate pixel stats for patches from their parent image and add them to the patch records.
+
+        Parameters
+        ----------
+        img : PIL.Image.Image
+            The (resized) parent image.
+        patch_records : dict
+            Dictionary of patch records (containing ``pixel_bounds``) keyed by patch ID, updated in place.
+        """
+        patch_ids, mean, std = MapImages._calc_patch_stats_from_parent(
+            img,
+            {
+                patch_id: patch_record["pixel_bounds"]
+                for patch_id, patch_record in patch_records.items()
+            },
+        )
+        MapImages._add_pixel_stats(patch_records, patch_ids, img.getbands(), mean, std)
+
+    @staticmethod
+    def _calc_patch_stats_from_parent(
+        img: Image.Image, pixel_bounds: dict
+    ) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """Calculate pixel stats for patches from their parent image.
+
+        Parameters
+        ----------
+        img : PIL.Image.Image
+            The (resized) parent image.
+        pixel_bounds : dict
+            Dictionary of pixel bounds keyed by patch ID.
+
+        Returns
+        -------
+        tuple of list, numpy.ndarray and numpy.ndarray
+            The patch IDs and the mean and standard deviation of each band for each patch (as arrays of shape (patches, bands)).
+        """
+        # group patches into strips of rows so each strip is only converted to an array once
+        strips = {}
+        for patch_id, (min_x, min_y, max_x, max_y) in pixel_bounds.items():
+            strips.setdefault((max(min_y, 0), max_y), []).append(
+                (patch_id, max(min_x, 0), max_x)
+            )
+
+        patch_ids, means, stds = [], [], []
+        for (min_y, max_y), strip_patches in strips.items():
+            strip_patch_ids, min_x, max_x = zip(*strip_patches)
+            strip = np.asarray(img.crop((0, min_y, img.width, max_y)))
+            mean, std = MapImages._calc_strip_stats(strip, min_x, max_x, img.mode)
+            patch_ids.extend(strip_patch_ids)
+            means.append(mean)
+            stds.append(std)
+
+        if not patch_ids:
+            n_bands = len(img.getbands())
+            return [], np.zeros((0, n_bands)), np.zeros((0, n_bands))
+        return patch_ids, np.concatenate(means), np.concatenate(stds)
+
+    @staticmethod
+    def _calc_strip_stats(
+        strip: np.ndarray,
+        min_x: tuple[int, ...] | list[int],
+        max_x: tuple[int, ...] | list[int],
+        mode: str,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate pixel stats for patches which span all rows of a strip of an image.
+
+        Sums of pixel values (and squared pixel values) are calculated for each column of the strip and accumulated along the strip so the sums for each patch can be read off without looping over its pixels.
+
+        Parameters
+        ----------
+        strip : numpy.ndarray
+            Array of shape (height, width) or (height, width, bands) containing the rows of the image covered by the patches.
+        min_x : tuple or list of int
+            The first column of each patch.
+        max_x : tuple or list of int
+            The column after the last column of each patch.
+        mode : str
+            The PIL image mode of the image.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The mean and standard deviation of each band for each patch (as arrays of shape (patches, bands)), scaled to 0-1.
+        """
+        if strip.ndim == 2:
+            strip = strip[:, :, np.newaxis]
+        if mode == "1":
+            strip = (strip != 0) * 255  # match values used by ``ImageStat``
+        strip = strip.astype(np.float64)
+
+        cumulative_sum = np.zeros((strip.shape[1] + 1, strip.shape[2]))
+        cumulative_sum[1:] = np.cumsum(strip.sum(axis=0), axis=0)
+        cumulative_sum_sq = np.zeros((strip.shape[1] + 1, strip.shape[2]))
+        cumulative_sum_sq[1:] = np.cumsum((strip**2).sum(axis=0), axis=0)
+
+        min_x, max_x = np.array(min_x), np.array(max_x)
+        n_pixels = ((max_x - min_x) * strip.shape[0])[:, np.newaxis]
+
+        mean = (cumulative_sum[max_x] - cumulative_sum[min_x]) / n_pixels
+        mean_sq = (cumulative_sum_sq[max_x] - cumulative_sum_sq[min_x]) / n_pixels
+        std = np.sqrt(np.clip(mean_sq - mean**2, 0, None))
+        return mean / 255, std / 255
+
+    @staticmethod
+    def _add_pixel_stats(
+        patch_records: dict,
+        patch_ids: list[str],
+        bands: tuple[str, ...],
+        mean: np.ndarray,
+        std: np.ndarray,
+    ) -> None:
+        """Add pixel stats (as calculated by :meth:`~.load.images.MapImages._calc_strip_stats`) to patch records."""
+        for patch_id, patch_mean, patch_std in zip(
+            patch_ids, mean.tolist(), std.tolist()
+        ):
+            patch_records[patch_id].update(
+                MapImages._pixel_stats_record(bands, patch_mean, patch_std)
+            )
+
+    @staticmethod
+    def _pixel_stats_record(
+        bands: tuple[str, ...],
+        mean: list[float] | None = None,
+        std: list[float] | None = None,
+    ) -> dict:
+        """Get the ``mean_pixel*`` and ``std_pixel*`` keys for a patch from the mean and standard deviation of each of its bands.
+
+        If ``mean`` or ``std`` is None, the corresponding keys are left out.
+        """
+        record = {}
+        if mean is not None:
+            record["mean_pixel"] = np.mean(mean)
+            for band, band_mean in zip(bands, mean):
+                record[f"mean_pixel_{band}"] = band_mean
+        if std is not None:
+            record["std_pixel"] = np.mean(std)
+            for band, band_std in zip(bands, std):
+                record[f"std_pixel_{band}"] = band_std
+        return record
+
+    @staticmethod
     def _patchify_by_pixel_square(
-        self,
         image_id: str,
+        parent_path: str,
         patch_size: int,
         path_save: str,
-        add_to_parents: bool | None = True,
         resize_factor: bool | None = False,
         output_format: str | None = "png",
         rewrite: bool | None = False,
         verbose: bool | None = False,
-    ):
-        """Patchify one image and (if ``add_to_parents=True``) add the patch to the MapImages instance's ``images`` dictionary.
+        materialize: bool = True,
+        shard_writer: PatchShardWriter | None = None,
+        compute_stats: bool = False,
+        parent_cache: ParentPixelCache | None = None,
+    ) -> dict:
+        """Patchify one image and return the patches created.
         Use square cuts for patches at edges.
 
         Parameters
         ----------
         image_id : str
             The ID of the image to patchify
+        parent_path : str
+            Path to the image to patchify.
         patch_size : int
             Number of pixels in both x and y to use for slicing
         path_save : str
             Directory to save the patches.
-        add_to_parents : bool, optional
-            If True, patches will be added to the MapImages instance's
-            ``images`` dictionary, by default ``True``.
         resize_factor : bool, optional
             If True, resize the images before patchifying, by default ``False``.
         output_format : str, optional
@@ -1328,11 +2810,21 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         verbose : bool, optional
             If True, progress updates will be printed throughout, by default
             ``False``.
-        """
-        tree_level = self._get_tree_level(image_id)
+        materialize : bool, optional
+            If False, patches are not saved (``image_path`` is set to None), by default ``True``.
+        shard_writer : PatchShardWriter or None, optional
+            If given, patches are added to this shard instead of being saved as files, by default None.
+        compute_stats : bool, optional
+            If True, pixel stats are calculated for each patch and added to its record, by default ``False``.
+        parent_cache : ParentPixelCache or None, optional
+            If given, the image is read from this cache of decoded images, by default None.
 
-        parent_path = self.images[tree_level][image_id]["image_path"]
-        img = Image.open(parent_path)
+        Returns
+        -------
+        dict
+            Dictionary of patch records (containing ``image_path``, ``shape`` and ``pixel_bounds``) keyed by patch ID.
+        """
+        img = MapImages._open_parent_image(parent_path, parent_cache)
 
         if resize_factor:
             original_height, original_width = img.height, img.width
@@ -1345,6 +2837,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
         height, width = img.height, img.width
 
+        patch_records = {}
         for x in range(0, width, patch_size):
             for y in range(0, height, patch_size):
                 max_x = min(x + patch_size, width)
@@ -1358,29 +2851,269 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                 patch_path = os.path.join(path_save, patch_id)
                 patch_path = os.path.abspath(patch_path)
 
-                if os.path.isfile(patch_path) and not rewrite:
-                    self._print_if_verbose(
+                if not materialize:
+                    patch_path = None
+                elif (
+                    shard_writer is None and os.path.isfile(patch_path) and not rewrite
+                ):
+                    MapImages._print_if_verbose(
                         f"[INFO] File already exists: {patch_path}.", verbose
                     )
 
                 else:
-                    self._print_if_verbose(
+                    MapImages._print_if_verbose(
                         f'[INFO] Creating "{patch_id}". Number of pixels in x,y: {max_x - min_x},{max_y - min_y}.',
                         verbose,
                     )
 
                     patch = img.crop((min_x, min_y, max_x, max_y))
-                    patch.save(patch_path, output_format)
+                    MapImages._save_patch(
+                        patch, patch_id, patch_path, output_format, shard_writer
+                    )
 
-                if add_to_parents:
-                    self._images_constructor(
-                        image_path=patch_path,
-                        parent_path=parent_path,
-                        tree_level="patch",
-                        pixel_bounds=(min_x, min_y, max_x, max_y),
+                patch_records[patch_id] = {
+                    "image_path": patch_path,
+                    "shape": (patch_size, patch_size, len(img.getbands())),
+                    "pixel_bounds": (min_x, min_y, max_x, max_y),
+                }
+
+        if compute_stats:
+            MapImages._add_patch_stats(img, patch_records)
+
+        return patch_records
+
+    def get_patch_array(self, patch_id: str) -> np.ndarray:
+        """
+        Get the pixel values of a patch as an array.
+
+        Parameters
+        ----------
+        patch_id : str
+            The ID of the patch.
+
+        Returns
+        -------
+        numpy.ndarray
+            The pixel values of the patch, in the same form as ``numpy.array(PIL.Image.open(patch_path))``.
+
+        Notes
+        -----
+        If the patch has been saved (i.e. it has an ``image_path`` or ``shard_path``), it is read from file.
+        Otherwise (e.g. if it was created using ``patchify_all(materialize=False)``), it is cropped from its parent image using its ``pixel_bounds``.
+        Decoded parent images are cached so that reading many patches of the same parent only decodes the parent once.
+        If the MapImages instance has a ``parent_cache``, parents are memory-mapped from the cache instead, so they are only decoded once across processes and runs.
+        """
+        return np.array(self._load_patch_image(patch_id))
+
+    def iter_patches(
+        self,
+        patch_size: int = 100,
+        overlap: float = 0,
+        parent_ids: str | list[str] | None = None,
+        output_format: str = "png",
+        windowed: bool = False,
+    ) -> Iterator[tuple[str, np.ndarray, tuple, tuple | None]]:
+        """
+        Patchify parent images, yielding each patch as an array instead of saving it or adding it to the ``images`` dictionary.
+
+        This can be used to stream patches directly into a model or feature extractor.
+
+        Parameters
+        ----------
+        patch_size : int, optional
+            Number of pixels in both x and y to use for slicing, by default ``100``.
+        overlap : float, optional
+            Fractional overlap between patches, by default ``0``.
+        parent_ids : str, list of str or None, optional
+            The ID(s) of the parent images to patchify.
+            If None (default), all parent images are patchified.
+        output_format : str, optional
+            File extension used in patch IDs, by default ``"png"``.
+            Patch IDs match those created by :meth:`~.load.images.MapImages.patchify_all` with the same ``patch_size``, ``overlap`` and ``output_format``.
+        windowed : bool, optional
+            If True, parent images are read in horizontal strips (one row of patches at a time) using rasterio windows so only ``patch_size`` x image width pixels are held in memory.
+            If False (default), each parent image is decoded in full.
+
+        Yields
+        ------
+        tuple
+            ``(patch_id, patch_array, pixel_bounds, coordinates)`` for each patch.
+            ``patch_array`` is in the same form as :meth:`~.load.images.MapImages.get_patch_array` (i.e. patches at the edges of the parent are padded with zeros to ``patch_size``).
+            ``coordinates`` is None if the parent image has no coordinates.
+
+        Notes
+        -----
+        Each parent image is decoded once and patches are yielded row by row (i.e. sorted by ``min_y`` and then ``min_x``).
+        Only one parent image is held in memory at a time.
+        """
+        if parent_ids is None:
+            parent_ids = self.list_parents()
+        elif isinstance(parent_ids, str):
+            parent_ids = [parent_ids]
+
+        step = patch_size - int(patch_size * overlap)
+        if step <= 0:
+            raise ValueError("[ERROR] ``overlap`` must be less than 1.")
+
+        for parent_id in parent_ids:
+            parent_path = self.parents[parent_id]["image_path"]
+            to_coords = self._get_patch_coords_function(parent_id)
+
+            for patch_id, patch_array, pixel_bounds in self._iter_parent_patches(
+                parent_id,
+                parent_path,
+                patch_size,
+                step,
+                output_format,
+                windowed,
+                self.parent_cache,
+            ):
+                yield patch_id, patch_array, pixel_bounds, to_coords(pixel_bounds)
+
+    def _get_patch_coords_function(self, parent_id: str):
+        """Get a function which converts the pixel bounds of a patch into coordinates using the coordinates of its parent.
+
+        If the parent has no coordinates, the function returns None.
+        """
+        if "coordinates" not in self.parents[parent_id].keys():
+            return lambda pixel_bounds: None
+
+        if not all([k in self.parents[parent_id].keys() for k in ["dlat", "dlon"]]):
+            self._add_coord_increments_id(parent_id)
+
+        parent_min_x, _, _, parent_max_y = self.parents[parent_id]["coordinates"]
+        dlon = self.parents[parent_id]["dlon"]
+        dlat = self.parents[parent_id]["dlat"]
+
+        def to_coords(pixel_bounds):
+            min_x, min_y, max_x, max_y = pixel_bounds
+            return (
+                (min_x * dlon) + parent_min_x,
+                parent_max_y - (max_y * dlat),
+                (max_x * dlon) + parent_min_x,
+                parent_max_y - (min_y * dlat),
+            )
+
+        return to_coords
+
+    @staticmethod
+    def _iter_parent_patches(
+        parent_id: str,
+        parent_path: str,
+        patch_size: int,
+        step: int,
+        output_format: str,
+        windowed: bool = False,
+        parent_cache: ParentPixelCache | None = None,
+    ) -> Iterator[tuple[str, np.ndarray, tuple]]:
+        """Yield ``(patch_id, patch_array, pixel_bounds)`` for each patch of one parent image, row by row.
+
+        If ``windowed=True``, the parent image is read in strips using rasterio windows.
+        Otherwise, it is memory-mapped from ``parent_cache`` (if given) or decoded in full.
+        """
+        img = Image.open(parent_path)
+        mode, palette = img.mode, img.getpalette()
+        width, height = img.width, img.height
+
+        if windowed:
+            src = rasterio.open(parent_path)
+            # rows [strip_start, strip_start + len(strip)) of the image
+            strip = np.zeros((0, width, src.count), dtype=src.dtypes[0])
+            strip_start = 0
+        elif parent_cache is not None:
+            parent_array = parent_cache.get(parent_path)
+        else:
+            parent_array = np.asarray(img)
+
+        with src if windowed else nullcontext():
+            for y in range(0, height, step):
+                max_y = min(y + patch_size, height)
+
+                if windowed:
+                    strip = MapImages._advance_strip(
+                        src, strip, strip_start, y, max_y, width
                     )
-                    self._add_patch_coords_id(patch_id)
-                    self._add_patch_polygons_id(patch_id)
+                    strip_start = y
+                    # convert to the form of ``numpy.array(PIL.Image.open(...))``
+                    rows = np.asarray(
+                        MapImages._array_to_image(strip[: max_y - y], mode, palette)
+                    )
+                else:
+                    rows = parent_array[y:max_y]
+
+                for x in range(0, width, step):
+                    max_x = min(x + patch_size, width)
+                    patch_id = (
+                        f"patch-{x}-{y}-{max_x}-{max_y}-#{parent_id}#.{output_format}"
+                    )
+
+                    patch_array = np.zeros(
+                        (patch_size, patch_size, *rows.shape[2:]), dtype=rows.dtype
+                    )
+                    patch_array[: max_y - y, : max_x - x] = rows[:, x:max_x]
+                    yield patch_id, patch_array, (x, y, max_x, max_y)
+
+    def _load_patch_image(self, patch_id: str) -> Image.Image:
+        """Load a patch as a PIL image, either from its file or, for virtual patches, from its parent image.
+
+        Parameters
+        ----------
+        patch_id : str
+            The ID of the patch.
+
+        Returns
+        -------
+        PIL.Image.Image
+            The patch image.
+        """
+        patch_path = self.patches[patch_id].get("image_path")
+        if isinstance(patch_path, str):
+            return Image.open(patch_path)
+
+        shard_path = self.patches[patch_id].get("shard_path")
+        if isinstance(shard_path, str):
+            return load_patch_from_shard(shard_path, patch_id)
+
+        parent_id = self.patches[patch_id]["parent_id"]
+        parent_img = self._load_parent_image(parent_id)
+
+        # cropping outside the parent pads with zeros, as when saving patches
+        min_x, min_y, _, _ = self.patches[patch_id]["pixel_bounds"]
+        height, width, _ = self.patches[patch_id]["shape"]
+        return parent_img.crop((min_x, min_y, min_x + width, min_y + height))
+
+    def _load_parent_image(self, parent_id: str) -> Image.Image:
+        """Load and decode a parent image, keeping the most recently used parents in memory.
+
+        Parameters
+        ----------
+        parent_id : str
+            The ID of the parent image.
+
+        Returns
+        -------
+        PIL.Image.Image
+            The decoded parent image.
+
+        Notes
+        -----
+        If the MapImages instance has a ``parent_cache``, the parent is read from the cache instead.
+        """
+        if self.parent_cache is not None:
+            return self.parent_cache.get_image(self.parents[parent_id]["image_path"])
+
+        if parent_id in self._parent_image_cache:
+            self._parent_image_cache.move_to_end(parent_id)
+            return self._parent_image_cache[parent_id]
+
+        parent_img = Image.open(self.parents[parent_id]["image_path"])
+        parent_img.load()
+
+        self._parent_image_cache[parent_id] = parent_img
+        while len(self._parent_image_cache) > self._parent_image_cache_size:
+            self._parent_image_cache.popitem(last=False)
+
+        return parent_img
 
     def _add_patch_to_parent(self, patch_id: str) -> None:
         """
@@ -1403,7 +3136,13 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         a list of patches and assigns it to the parent. If the parent image
         already has a list of patches, the method checks if the current patch
         is already in the list. If not, the patch is added to the list.
+
+        Membership is checked against a set of patch IDs kept alongside each
+        parent's list. The set is rebuilt if the list has been replaced or
+        changed elsewhere.
         """
+        self._patch_index = None
+        self._patch_grid = None
         patch_parent = self.patches[patch_id]["parent_id"]
 
         if patch_parent is None:
@@ -1413,10 +3152,22 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             self.load_parents(parent_ids=patch_parent)
 
         if "patches" not in self.parents[patch_parent].keys():
-            self.parents[patch_parent]["patches"] = [patch_id]
-        else:
-            if patch_id not in self.parents[patch_parent]["patches"]:
-                self.parents[patch_parent]["patches"].append(patch_id)
+            self.parents[patch_parent]["patches"] = []
+        patch_list = self.parents[patch_parent]["patches"]
+
+        indexed_list, patch_set, n_indexed = self._parent_patch_sets.get(
+            patch_parent, (None, None, None)
+        )
+        if indexed_list is not patch_list or n_indexed != len(patch_list):
+            patch_set = set(patch_list)
+
+        if patch_id not in patch_set:
+            patch_list.append(patch_id)
+            patch_set.add(patch_id)
+        if self.storage == "sqlite":
+            # only keep the set of the current parent so memory does not grow with the number of patches
+            self._parent_patch_sets = {}
+        self._parent_patch_sets[patch_parent] = (patch_list, patch_set, len(patch_list))
 
     def _make_dir(self, path_make: str, exists_ok: bool | None = True) -> None:
         """
@@ -1433,6 +3184,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         calc_mean: bool | None = True,
         calc_std: bool | None = True,
         verbose: bool | None = False,
+        num_workers: int = 1,
     ) -> None:
         """
         Calculate the mean and standard deviation of pixel values for all
@@ -1453,81 +3205,224 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             By default, ``True``.
         verbose : bool, optional
             Whether to print verbose outputs. By default, ``False``.
+        num_workers : int, optional
+            Number of worker processes to use for reading patches and calculating pixel stats.
+            If ``1`` (default), pixel stats are calculated in the current process.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Pixel stats are calculated for patches of the parent image
+          specified by ``parent_id``.
+        - If ``parent_id`` is ``None``, pixel stats are calculated for all
+          parent images in the object.
+        - If mean or standard deviation of pixel values has already been
+          calculated for a patch, the calculation is skipped for that patch.
+        - Pixel stats are stored in the ``images`` attribute of the
+          ``MapImages`` instance, under the ``patch`` key for each patch.
+        - If no patches are found for a parent image, a warning message is
+          displayed and the method moves on to the next parent image.
+        - Patches are split into chunks which are read and processed in
+          parallel if ``num_workers > 1``. Pixel stats for virtual patches are
+          calculated from their parent image.
+        """
+        # Get correct parent ID
+        if parent_id is None:
+            parent_ids = self.list_parents()
+        else:
+            parent_ids = [parent_id]
+
+        tasks = []
+        calc_stats = {}  # whether to add the mean/std for each patch
+        for parent_id in parent_ids:
+            self._print_if_verbose(
+                f"\n[INFO] Calculating pixel stats for patches of image: {parent_id}",
+                verbose,
+            )
+
+            if "patches" not in self.parents[parent_id]:
+                print(f"[WARNING] No patches found for: {parent_id}")
+                continue
+
+            patch_files = []
+            virtual_patches = []
+            for patch_id in self.parents[parent_id]["patches"]:
+                patch_keys = self.patches[patch_id].keys()
+                patch_calc_mean = calc_mean and "mean_pixel" not in patch_keys
+                patch_calc_std = calc_std and "std_pixel" not in patch_keys
+                if not (patch_calc_mean or patch_calc_std):
+                    continue
+                calc_stats[patch_id] = (patch_calc_mean, patch_calc_std)
+
+                patch_path = self.patches[patch_id].get("image_path")
+                shard_path = self.patches[patch_id].get("shard_path")
+                pixel_bounds = self.patches[patch_id].get("pixel_bounds")
+                if isinstance(patch_path, str) or isinstance(shard_path, str):
+                    patch_files.append(
+                        (
+                            patch_id,
+                            patch_path if isinstance(patch_path, str) else None,
+                            shard_path if isinstance(shard_path, str) else None,
+                            pixel_bounds,
+                        )
+                    )
+                else:
+                    virtual_patches.append((patch_id, None, None, pixel_bounds))
+
+            # virtual patches are calculated from their parent so are kept together
+            if virtual_patches:
+                tasks.append(
+                    {
+                        "parent_path": self.parents[parent_id]["image_path"],
+                        "patches": virtual_patches,
+                        "parent_cache": self.parent_cache,
+                    }
+                )
+            for i in range(0, len(patch_files), self._pixel_stats_chunk_size):
+                tasks.append(
+                    {
+                        "parent_path": None,
+                        "patches": patch_files[i : i + self._pixel_stats_chunk_size],
+                    }
+                )
+
+        if num_workers > 1:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                results = list(
+                    tqdm(
+                        executor.map(self._calc_pixel_stats_chunk, tasks),
+                        total=len(tasks),
+                    )
+                )
+        else:
+            results = [self._calc_pixel_stats_chunk(task) for task in tqdm(tasks)]
+
+        for chunk_results in results:
+            for patch_ids, bands, mean, std in chunk_results:
+                for patch_id, patch_mean, patch_std in zip(
+                    patch_ids, mean.tolist(), std.tolist()
+                ):
+                    patch_calc_mean, patch_calc_std = calc_stats[patch_id]
+                    self.patches[patch_id].update(
+                        self._pixel_stats_record(
+                            bands,
+                            patch_mean if patch_calc_mean else None,
+                            patch_std if patch_calc_std else None,
+                        )
+                    )
+
+    @staticmethod
+    def _calc_pixel_stats_chunk(task: dict) -> list[tuple]:
+        """Calculate pixel stats for a chunk of patches.
+
+        This is a static method so that it can be sent to worker processes
+        without pickling the MapImages instance.
+
+        Parameters
+        ----------
+        task : dict
+            Dictionary containing ``patches``, a list of the patch ID, image path, shard path and pixel bounds of each patch, and ``parent_path``, the path to the parent image (used for patches with no image path or shard path).
 
         Returns
         -------
-        None
-
-        Notes
-        -----
-        - Pixel stats are calculated for patches of the parent image
-          specified by ``parent_id``.
-        - If ``parent_id`` is ``None``, pixel stats are calculated for all
-          parent images in the object.
-        - If mean or standard deviation of pixel values has already been
-          calculated for a patch, the calculation is skipped.
-        - Pixel stats are stored in the ``images`` attribute of the
-          ``MapImages`` instance, under the ``patch`` key for each patch.
-        - If no patches are found for a parent image, a warning message is
-          displayed and the method moves on to the next parent image.
+        list of tuple
+            The patch IDs, band names and mean and standard deviation of each band (as arrays of shape (patches, bands)) for each group of patches with the same bands.
         """
-        # Get correct parent ID
-        if parent_id is None:
-            parent_ids = self.list_parents()
-        else:
-            parent_ids = [parent_id]
+        # patch IDs, mean and std for each set of bands
+        results = {}
 
-        for parent_id in tqdm(parent_ids):
-            self._print_if_verbose(
-                f"\n[INFO] Calculating pixel stats for patches of image: {parent_id}",
-                verbose,
+        virtual_patches = {
+            patch_id: pixel_bounds
+            for patch_id, patch_path, shard_path, pixel_bounds in task["patches"]
+            if patch_path is None and shard_path is None
+        }
+        if virtual_patches:
+            parent_img = MapImages._open_parent_image(
+                task["parent_path"], task.get("parent_cache")
             )
-
-            if "patches" not in self.parents[parent_id]:
-                print(f"[WARNING] No patches found for: {parent_id}")
+            patch_ids, mean, std = MapImages._calc_patch_stats_from_parent(
+                parent_img, virtual_patches
+            )
+            results[parent_img.getbands()] = (patch_ids, [mean], [std])
+
+        def add_stats(bands, mode, patch_ids, arrays):
+            mean, std = MapImages._calc_stacked_stats(np.stack(arrays), mode)
+            group_ids, means, stds = results.setdefault(bands, ([], [], []))
+            group_ids.extend(patch_ids)
+            means.append(mean)
+            stds.append(std)
+
+        # patch IDs and arrays for each set of bands, mode and patch shape
+        # (stats are calculated once the arrays of a group reach ``_PIXEL_STATS_BATCH_BYTES`` to limit memory use)
+        patch_arrays = {}
+        for patch_id, patch_path, shard_path, pixel_bounds in task["patches"]:
+            if patch_path is not None:
+                img = Image.open(patch_path)
+            elif shard_path is not None:
+                img = load_patch_from_shard(shard_path, patch_id)
+            else:
                 continue
 
-            list_patches = self.parents[parent_id]["patches"]
-
-            for patch in list_patches:
-                patch_data = self.patches[patch]
-                patch_keys = patch_data.keys()
-                img = Image.open(patch_data["image_path"])
-                height = img.height
-                width = img.width
-
-                # for edge patches, crop the patch image to the correct size first
-                min_x, min_y, max_x, max_y = self.patches[patch]["pixel_bounds"]
-                if width != max_x - min_x:
-                    width = max_x - min_x
-                if height != max_y - min_y:
-                    height = max_y - min_y
-                img = img.crop((0, 0, width, height))
-
-                bands = img.getbands()
-
-                if calc_mean:
-                    if "mean_pixel" in patch_keys:
-                        calc_mean = False
-                if calc_std:
-                    if "std_pixel" in patch_keys:
-                        calc_std = False
-
-                img_stat = ImageStat.Stat(img)
-
-                if calc_mean:
-                    img_mean = img_stat.mean
-                    self.patches[patch]["mean_pixel"] = np.mean(img_mean) / 255
-                    for i, band in enumerate(bands):
-                        # Calculate mean pixel values
-                        self.patches[patch][f"mean_pixel_{band}"] = img_mean[i] / 255
-
-                if calc_std:
-                    img_std = img_stat.stddev
-                    self.patches[patch]["std_pixel"] = np.mean(img_std) / 255
-                    for i, band in enumerate(bands):
-                        # Calculate std pixel values
-                        self.patches[patch][f"std_pixel_{band}"] = img_std[i] / 255
+            # for edge patches, crop the patch image to the correct size first
+            if pixel_bounds is not None:
+                min_x, min_y, max_x, max_y = pixel_bounds
+                img = img.crop((0, 0, max_x - min_x, max_y - min_y))
+
+            array = np.asarray(img)
+            key = (img.getbands(), img.mode, array.shape)
+            patch_ids, arrays = patch_arrays.setdefault(key, ([], []))
+            patch_ids.append(patch_id)
+            arrays.append(array)
+            if len(arrays) * array.size * 8 >= _PIXEL_STATS_BATCH_BYTES:
+                add_stats(img.getbands(), img.mode, patch_ids, arrays)
+                del patch_arrays[key]
+
+        for (bands, mode, _), (patch_ids, arrays) in patch_arrays.items():
+            add_stats(bands, mode, patch_ids, arrays)
+
+        return [
+            (patch_ids, bands, np.concatenate(means), np.concatenate(stds))
+            for bands, (patch_ids, means, stds) in results.items()
+        ]
+
+    @staticmethod
+    def _calc_stacked_stats(
+        arrays: np.ndarray, mode: str, batch_size: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate pixel stats for a stack of patches of the same shape.
+
+        Parameters
+        ----------
+        arrays : numpy.ndarray
+            Array of shape (patches, height, width) or (patches, height, width, bands).
+        mode : str
+            The PIL image mode of the patches.
+        batch_size : int or None, optional
+            Number of patches to convert to floats at once.
+            If None (default), as many patches as fit in ``_PIXEL_STATS_BATCH_BYTES``.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The mean and standard deviation of each band for each patch (as arrays of shape (patches, bands)), scaled to 0-1.
+        """
+        arrays = arrays.reshape(
+            len(arrays), -1, 1 if arrays.ndim == 3 else arrays.shape[-1]
+        )
+        if batch_size is None:
+            batch_size = max(1, _PIXEL_STATS_BATCH_BYTES // max(1, arrays[0].size * 8))
+        means, stds = [], []
+        for i in range(0, len(arrays), batch_size):
+            batch = arrays[i : i + batch_size]
+            if mode == "1":
+                batch = (batch != 0) * 255  # match values used by ``ImageStat``
+            batch = batch.astype(np.float64)
+            means.append(batch.mean(axis=1))
+            stds.append(batch.std(axis=1))
+        return np.concatenate(means) / 255, np.concatenate(stds) / 255
 
     def convert_images(
         self,
@@ -1546,7 +3441,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             Whether to save the dataframes as files. By default ``False``.
         save_format : str, optional
             If ``save = True``, the file format to use when saving the dataframes.
-            Options of csv ("csv"), excel ("excel" or "xlsx") or geojson ("geojson").
+            Options of csv ("csv"), excel ("excel" or "xlsx"), geojson ("geojson") or parquet ("parquet").
             By default, "csv".
         delimiter : str, optional
             The delimiter to use when saving the dataframe. By default ``","``.
@@ -1557,8 +3452,8 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             The method returns a tuple of two DataFrames/GeoDataFrames: One for the
             ``parent`` images and one for the ``patch`` images.
         """
-        parent_df = pd.DataFrame.from_dict(self.parents, orient="index")
-        patch_df = pd.DataFrame.from_dict(self.patches, orient="index")
+        parent_df = self._images_to_dataframe(self.parents)
+        patch_df = self._images_to_dataframe(self.patches)
 
         # set index name
         parent_df.index.set_names("image_id", inplace=True)
@@ -1586,6 +3481,14 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                     patch_df.to_excel("patch_df.xlsx")
                     print('[INFO] Saved patch dataframe as "patch_df.xslx"')
 
+            elif save_format == "parquet":
+                if len(parent_df):
+                    save_to_parquet(parent_df, "parent_df.parquet")
+                    print('[INFO] Saved parent dataframe as "parent_df.parquet"')
+                if len(patch_df):
+                    save_to_parquet(patch_df, "patch_df.parquet")
+                    print('[INFO] Saved patch dataframe as "patch_df.parquet"')
+
             # save as geojson (only if georeferenced)
             elif save_format == "geojson":
                 if not self.georeferenced:
@@ -1607,11 +3510,85 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
             else:
                 raise ValueError(
-                    f'[ERROR] ``save_format`` should be one of "csv", "excel" or "xlsx" or "geojson". Not {save_format}.'
+                    f'[ERROR] ``save_format`` should be one of "csv", "excel" or "xlsx", "geojson" or "parquet". Not {save_format}.'
                 )
 
         return parent_df, patch_df
 
+    def save(self, path: str | pathlib.Path) -> None:
+        """
+        Save the parents and patches of the :class:`~.load.images.MapImages` instance to (Geo)Parquet files so they can be reloaded using :meth:`~.load.images.MapImages.load`.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Directory to save the files in (created if it does not exist).
+            Parents are saved in ``parent_df.parquet``, patches in ``patch_df.parquet`` and the grid positions of patches (see :meth:`~.load.images.MapImages.neighbors`) in ``patch_grid.parquet``.
+
+        Notes
+        -----
+        Unlike saving as CSV files, the types of all columns (e.g. tuples, lists and geometries) are kept so reloading does not need to evaluate any strings.
+        See :func:`~.utils.load_frames.save_to_parquet` for details.
+        """
+        os.makedirs(path, exist_ok=True)
+        parent_df, patch_df = self.convert_images()
+        save_to_parquet(parent_df, os.path.join(path, "parent_df.parquet"))
+        save_to_parquet(patch_df, os.path.join(path, "patch_df.parquet"))
+
+        cells, _ = self._get_patch_grid()
+        grid_df = pd.DataFrame.from_dict(
+            cells, orient="index", columns=["parent_id", "row", "col"]
+        )
+        grid_df.index.set_names("image_id", inplace=True)
+        grid_df.to_parquet(os.path.join(path, "patch_grid.parquet"))
+
+    def load(self, path: str | pathlib.Path, clear_images: bool = True) -> None:
+        """
+        Load parents and patches saved using :meth:`~.load.images.MapImages.save`.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Directory containing the saved files.
+        clear_images : bool, optional
+            If ``True``, clear images before loading, by default ``True``.
+        """
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"[ERROR] Directory {path} not found.")
+
+        dfs = {}
+        for tree_level in ["parent", "patch"]:
+            fpath = os.path.join(path, f"{tree_level}_df.parquet")
+            dfs[tree_level] = (
+                load_from_parquet(fpath) if os.path.isfile(fpath) else None
+            )
+
+        self.load_df(
+            parent_df=dfs["parent"], patch_df=dfs["patch"], clear_images=clear_images
+        )
+
+        # reuse the saved grid positions of patches (if no other patches were already loaded)
+        grid_path = os.path.join(path, "patch_grid.parquet")
+        if (
+            os.path.isfile(grid_path)
+            and dfs["patch"] is not None
+            and len(self.patches) == len(dfs["patch"])
+        ):
+            grid_df = pd.read_parquet(grid_path)
+            cells = zip(
+                grid_df["parent_id"], grid_df["row"].tolist(), grid_df["col"].tolist()
+            )
+            self._set_patch_grid(dict(zip(grid_df.index, cells)))
+
+    @staticmethod
+    def _images_to_dataframe(
+        images: dict | ColumnarImageStore | SQLiteImageStore,
+    ) -> pd.DataFrame:
+        """Convert the parent or patch level of the ``images`` dictionary into a DataFrame."""
+        if isinstance(images, (ColumnarImageStore, SQLiteImageStore)):
+            return images.to_dataframe()
+        return pd.DataFrame.from_dict(images, orient="index")
+
     def show_parent(
         self,
         parent_id: str,
@@ -1975,6 +3952,8 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         parent_file_ext: str | bool | None = False,
         add_geo_info: bool | None = False,
         clear_images: bool | None = False,
+        num_workers: int = 1,
+        validate: bool = True,
     ) -> None:
         """
         Loads patch images from the given paths and adds them to the ``images``
@@ -1984,6 +3963,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         ----------
         patch_paths : str
             The file path of the patches to be loaded.
+            Can also be the path to patch shards (tar files created using ``patchify_all(container="tar")``).
 
             *Note: The ``patch_paths`` parameter accepts wildcards.*
         parent_paths : str or bool, optional
@@ -1993,6 +3973,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             *Note: The ``parent_paths`` parameter accepts wildcards.*
         patch_file_ext : str or bool, optional
             The file extension of the patches to be loaded, ignored if file extensions are specified in ``patch_paths`` (e.g. with ``"./path/to/dir/*png"``)
+            Use ``"tar"`` to load patch shards from a directory.
             By default ``False``.
         parent_file_ext : str or bool, optional
             The file extension of the parent images, ignored if file extensions are specified in ``parent_paths`` (e.g. with ``"./path/to/dir/*png"``)
@@ -2003,6 +3984,12 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         clear_images : bool, optional
             If ``True``, clears the images from the ``images`` dictionary
             before loading. Default is ``False``.
+        num_workers : int, optional
+            Number of threads to use to read patch headers when validating patches, by default ``1``.
+        validate : bool, optional
+            If ``True`` (default), the header of each patch file is read to check it is an image with an accepted mode.
+            If ``False``, patch files are not opened (so loading is much faster for large numbers of patches) and any invalid files will only raise an error when they are read.
+            Use :meth:`~.load.images.MapImages.check_image_files` to validate patches later.
 
         Returns
         -------
@@ -2010,12 +3997,14 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         """
         self.georeferenced = False  # reset georeferenced status
 
-        patch_files = self._resolve_file_path(patch_paths, patch_file_ext)
+        load_shards = patch_file_ext == "tar" or str(patch_paths).endswith(".tar")
+        if load_shards:
+            patch_files = self._resolve_shard_paths(patch_paths)
+        else:
+            patch_files = self._resolve_file_path(patch_paths, patch_file_ext)
 
         if clear_images:
-            self.images = {"parent": {}, "patch": {}}
-            self.parents = {}
-            self.patches = {}
+            self._clear_images()
 
         if parent_paths:
             # Add parents
@@ -2026,13 +4015,22 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
                 add_geo_info=add_geo_info,
             )
 
-        for patch_file in tqdm(patch_files):
-            if not os.path.isfile(patch_file):
-                print(f"[WARNING] File does not exist: {patch_file}")
-                continue
+        if load_shards:
+            for shard_path in tqdm(patch_files):
+                self._add_patches_from_shard(shard_path)
+            patch_files = []
 
-            self._check_image_mode(patch_file)
+        if validate:
+            existing_files = []
+            for patch_file in patch_files:
+                if os.path.isfile(patch_file):
+                    existing_files.append(patch_file)
+                else:
+                    print(f"[WARNING] File does not exist: {patch_file}")
+            patch_files = existing_files
+            self._read_image_headers(patch_files, num_workers)
 
+        for patch_file in tqdm(patch_files):
             # patch ID is set to the basename
             patch_id = os.path.basename(patch_file)
 
@@ -2056,6 +4054,82 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
 
         self.check_georeferencing()
 
+    def check_image_files(
+        self, tree_level: str = "patch", num_workers: int = 1
+    ) -> None:
+        """
+        Check that all images in ``tree_level`` which have an ``image_path`` are image files with an accepted mode.
+
+        This can be used to validate patches loaded using ``load_patches(validate=False)``.
+        Only image headers are read.
+
+        Parameters
+        ----------
+        tree_level : str, optional
+            The tree level to check, either ``"parent"`` or ``"patch"`` (default).
+        num_workers : int, optional
+            Number of threads to use to read image headers, by default ``1``.
+
+        Raises
+        ------
+        PIL.UnidentifiedImageError
+            If a file is not an image file.
+        NotImplementedError
+            If an image has a mode which is not accepted.
+        """
+        image_paths = [
+            image_path
+            for image_path in (
+                self.images[tree_level][image_id].get("image_path")
+                for image_id in self.images[tree_level]
+            )
+            if isinstance(image_path, str)
+        ]
+        self._read_image_headers(image_paths, num_workers)
+
+    @staticmethod
+    def _resolve_shard_paths(shard_paths: str) -> list[str]:
+        """Resolves path to list of patch shards.
+
+        Parameters
+        ----------
+        shard_paths : str
+            Path to a shard, a directory containing shards or a path containing wildcards.
+
+        Returns
+        -------
+        list
+            List of absolute paths to complete shards.
+        """
+        if pathlib.Path(shard_paths).is_dir():
+            files = [str(file) for file in pathlib.Path(shard_paths).glob("*.tar")]
+        else:
+            files = glob(str(shard_paths))
+
+        files = [os.path.abspath(file) for file in files if is_complete_shard(file)]
+        if len(files) == 0:
+            raise ValueError("[ERROR] No patch shards found!")
+
+        return files
+
+    def _add_patches_from_shard(self, shard_path: str) -> None:
+        """Add all patches stored in a shard using the shard's index (patch files are not opened).
+
+        Parameters
+        ----------
+        shard_path : str
+            Path to the shard.
+        """
+        for patch_id, entry in read_shard_index(shard_path).items():
+            self.patches[patch_id] = {
+                "parent_id": self.detect_parent_id_from_path(patch_id),
+                "image_path": None,
+                "shape": entry["shape"],
+                "pixel_bounds": self.detect_pixel_bounds_from_path(patch_id),
+                "shard_path": shard_path,
+            }
+            self._add_patch_to_parent(patch_id)
+
     @staticmethod
     def detect_parent_id_from_path(
         image_id: int | str, parent_delimiter: str | None = "#"
@@ -2151,15 +4225,17 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             files = self._resolve_file_path(parent_paths, parent_file_ext)
 
             if overwrite:
-                self.parents = {}
+                self.parents.clear()
 
-            for file in tqdm(files):
-                if not os.path.isfile(file):
+            existing_files = []
+            for file in files:
+                if os.path.isfile(file):
+                    existing_files.append(file)
+                else:
                     print(f"[WARNING] File does not exist: {file}")
-                    continue
-
-                self._check_image_mode(file)
+            self._read_image_headers(existing_files)
 
+            for file in tqdm(existing_files):
                 parent_id = os.path.basename(file)
 
                 if not self.parents.get(parent_id, False):
@@ -2216,27 +4292,41 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         """
 
         if clear_images:
-            self.images = {"parent": {}, "patch": {}}
-            self.parents = {}
-            self.patches = {}
+            self._clear_images()
 
         if isinstance(parent_df, pd.DataFrame):
             if "polygon" in parent_df.columns:
                 print("[INFO] Renaming 'polygon' to 'geometry' for parent_df.")
                 parent_df = parent_df.rename(columns={"polygon": "geometry"})
-            self.parents.update(parent_df.to_dict(orient="index"))
+            self.parents.update(self._dataframe_to_records(parent_df))
 
         if isinstance(patch_df, pd.DataFrame):
             if "polygon" in patch_df.columns:
                 print("[INFO] Renaming 'polygon' to 'geometry' for patch_df.")
                 patch_df = patch_df.rename(columns={"polygon": "geometry"})
-            self.patches.update(patch_df.to_dict(orient="index"))
+            self.patches.update(self._dataframe_to_records(patch_df))
 
         for patch_id in self.list_patches():
             self._add_patch_to_parent(patch_id)
 
         self.check_georeferencing()
 
+    @staticmethod
+    def _dataframe_to_records(df: pd.DataFrame) -> dict:
+        """Convert a DataFrame into a dictionary of records keyed by index, as ``df.to_dict(orient="index")``.
+
+        Each column is converted to a list once (instead of boxing each value separately), which is much faster for large DataFrames.
+        """
+        if not df.index.is_unique:
+            raise ValueError("[ERROR] DataFrame index must be unique.")
+        columns = list(df.columns)
+        values = [df[col].tolist() for col in columns]
+        rows = zip(*values) if columns else ((),) * len(df)
+        return {
+            image_id: dict(zip(columns, row))
+            for image_id, row in zip(df.index.tolist(), rows)
+        }
+
     def load_csv(
         self,
         parent_path: str | pathlib.Path | None = None,
@@ -2272,9 +4362,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         None
         """
         if clear_images:
-            self.images = {"parent": {}, "patch": {}}
-            self.parents = {}
-            self.patches = {}
+            self._clear_images()
 
         if isinstance(parent_path, (str, pathlib.Path)):
             parent_df = load_from_csv(
@@ -2296,6 +4384,7 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         self,
         target_crs: str | None = "EPSG:4326",
         verbose: bool | None = True,
+        num_workers: int = 1,
     ) -> None:
         """
         Add coordinates (reprojected to EPSG:4326) to all parents images using image metadata.
@@ -2306,6 +4395,8 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             Projection to convert coordinates into, by default ``"EPSG:4326"``.
         verbose : bool, optional
             Whether to print verbose output, by default ``True``
+        num_workers : int, optional
+            Number of threads to use to read the CRS and bounds of the images, by default ``1``.
 
         Returns
         -------
@@ -2314,17 +4405,23 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         Notes
         -----
         For each image in the parents dictionary, this method calls ``_add_geo_info_id`` and coordinates (if present) to the image in the ``parent`` dictionary.
+
+        The CRS and bounds of all images are read first (in parallel if ``num_workers > 1``).
+        If the MapImages instance has a ``header_cache``, the CRS and bounds of images which have not changed since they were cached are read from the cache instead of the image files.
         """
         image_ids = list(self.parents.keys())
+        image_paths = [self.parents[image_id]["image_path"] for image_id in image_ids]
+        geo_headers = self._read_geo_headers(image_paths, num_workers=num_workers)
 
-        for image_id in image_ids:
-            self._add_geo_info_id(image_id, target_crs)
+        for image_id, geo_header in zip(image_ids, geo_headers):
+            self._add_geo_info_id(image_id, target_crs, verbose, geo_header=geo_header)
 
     def _add_geo_info_id(
         self,
         image_id: str,
         target_crs: str | None = "EPSG:4326",
         verbose: bool | None = True,
+        geo_header: dict | None = None,
     ) -> None:
         """
         Add coordinates (reprojected to EPSG:4326) to an image.
@@ -2337,6 +4434,9 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             Projection to convert coordinates into, by default ``"EPSG:4326"``.
         verbose : bool, optional
             Whether to print verbose output, by default ``True``
+        geo_header : dict or None, optional
+            Header of the image containing its ``crs`` and ``bounds`` (see :meth:`~.load.images.MapImages._read_image_header`).
+            If None (default) or if it does not contain the CRS and bounds, they are read from the image file.
 
         Returns
         -------
@@ -2356,13 +4456,15 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         These are then added to the dictionary in the ``parent`` dictionary corresponding to each image.
         """
 
-        image_path = self.parents[image_id]["image_path"]
-
-        # Read the image using rasterio
-        tiff_src = rasterio.open(image_path)
+        if geo_header is None or "crs" not in geo_header:
+            # Read the CRS and bounds using rasterio
+            image_path = self.parents[image_id]["image_path"]
+            tiff_proj, tiff_bounds = self._read_geo_header(image_path)
+        else:
+            tiff_proj, tiff_bounds = geo_header["crs"], geo_header["bounds"]
 
         # Check whether coordinates are present
-        if isinstance(tiff_src.crs, type(None)):
+        if tiff_proj is None:
             self._print_if_verbose(
                 f"No coordinates found in {image_id}. Try `add_metadata` instead.",
                 verbose,
@@ -2370,15 +4472,22 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             return
 
         else:
-            # Get coordinates as string
-            tiff_proj = tiff_src.crs.to_string()
             # Coordinate transformation: proj1 ---> proj2
             # tiff is "lat, lon" instead of "x, y"
-            transformer = Transformer.from_crs(tiff_proj, target_crs, always_xy=True)
-            coords = transformer.transform_bounds(*tiff_src.bounds)
+            transformer = self._get_transformer(tiff_proj, target_crs)
+            coords = transformer.transform_bounds(*tiff_bounds)
             self.parents[image_id]["coordinates"] = coords
             self.parents[image_id]["crs"] = target_crs
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _get_transformer(src_crs: str, dst_crs: str) -> Transformer:
+        """Get a transformer from ``src_crs`` to ``dst_crs`` (with ``always_xy=True``).
+
+        Creating a transformer is slow and most images share the same CRSs, so transformers are reused for each pair of CRSs.
+        """
+        return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
     @staticmethod
     def _print_if_verbose(msg: str, verbose: bool) -> None:
         """
@@ -2408,6 +4517,9 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         rewrite: bool = False,
         verbose: bool = False,
         crs: str | None = None,
+        tiled: bool = False,
+        compress: str | None = None,
+        overviews: list[int] | None = None,
     ) -> None:
         """
         Save all parents in :class:`~.load.images.MapImages` instance as
@@ -2423,12 +4535,32 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             The CRS of the coordinates.
             If None, the method will first look for ``crs`` in the parents dictionary and use those. If ``crs`` cannot be found in the dictionary, the method will use "EPSG:4326".
             By default None.
+        tiled : bool, optional
+            Whether to write tiled geotiffs (with 256 x 256 pixel tiles), by default ``False``.
+        compress : str, optional
+            Compression to use when writing geotiffs (e.g. ``"deflate"`` or ``"lzw"``).
+            By default None (no compression).
+        overviews : list of int, optional
+            Decimation factors of internal overviews to add to each geotiff (e.g. ``[2, 4, 8, 16]``).
+            By default None (no overviews).
+
+        Notes
+        -----
+        Parent images are copied to the geotiffs in blocks of rows, so only a block of rows (about 64 MB of pixel values) and GDAL's block cache (limited to 128 MB) are held in memory at once, whatever the size of the image.
         """
 
         parents_list = self.list_parents()
 
         for parent_id in tqdm(parents_list):
-            self._save_parent_as_geotiff(parent_id, rewrite, verbose, crs)
+            self._save_parent_as_geotiff(
+                parent_id,
+                rewrite,
+                verbose,
+                crs,
+                tiled=tiled,
+                compress=compress,
+                overviews=overviews,
+            )
 
     def _save_parent_as_geotiff(
         self,
@@ -2436,8 +4568,11 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         rewrite: bool = False,
         verbose: bool = False,
         crs: str | None = None,
+        tiled: bool = False,
+        compress: str | None = None,
+        overviews: list[int] | None = None,
     ) -> None:
-        """Save a parent image as a geotiff.
+        """Save a parent image as a geotiff, copying it in blocks of rows.
 
         Parameters
         ----------
@@ -2451,6 +4586,12 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             The CRS of the coordinates.
             If None, the method will first look for ``crs`` in the parents dictionary and use those. If ``crs`` cannot be found in the dictionary, the method will use "EPSG:4326".
             By default None.
+        tiled : bool, optional
+            Whether to write a tiled geotiff, by default ``False``.
+        compress : str, optional
+            Compression to use, by default None.
+        overviews : list of int, optional
+            Decimation factors of internal overviews to add, by default None.
 
         Raises
         ------
@@ -2481,10 +4622,6 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             verbose,
         )
 
-        if "shape" not in self.parents[parent_id].keys():
-            self._add_shape_id(parent_id)
-        height, width, channels = self.parents[parent_id]["shape"]
-
         if "coordinates" not in self.parents[parent_id].keys():
             print(self.parents[parent_id].keys())
             raise ValueError(f"[ERROR] Cannot locate coordinates for {parent_id}")
@@ -2493,33 +4630,103 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
         if not crs:
             crs = self.parents[parent_id].get("crs", "EPSG:4326")
 
-        parent_affine = rasterio.transform.from_bounds(*coords, width, height)
-        parent = Image.open(parent_path)
+        self._copy_to_geotiff(
+            parent_path,
+            geotiff_path,
+            coords,
+            crs,
+            tiled=tiled,
+            compress=compress,
+            overviews=overviews,
+        )
 
-        with rasterio.open(
-            f"{geotiff_path}",
-            "w",
-            driver="GTiff",
-            height=parent.height,
-            width=parent.width,
-            count=channels,
-            transform=parent_affine,
-            dtype="uint8",
-            nodata=0,
-            crs=crs,
-        ) as dst:
-            if len(parent.getbands()) == 1:
-                parent_array = np.array(parent)
-                dst.write(parent_array, indexes=1)
-            else:
-                parent_array = reshape_as_raster(parent)
-                dst.write(parent_array)
+    @staticmethod
+    def _copy_to_geotiff(
+        image_path: str,
+        geotiff_path: str,
+        coords: tuple,
+        crs: str,
+        tiled: bool = False,
+        compress: str | None = None,
+        overviews: list[int] | None = None,
+    ) -> None:
+        """Copy an image to a geotiff in blocks of rows, reading each block using a rasterio window.
+
+        Parameters
+        ----------
+        image_path : str
+            Path of the image to copy.
+        geotiff_path : str
+            Path of the geotiff to write.
+        coords : tuple
+            Coordinates of the image (min_x, min_y, max_x, max_y).
+        crs : str
+            The CRS of the coordinates.
+        tiled : bool, optional
+            Whether to write a tiled geotiff, by default ``False``.
+        compress : str, optional
+            Compression to use, by default None.
+        overviews : list of int, optional
+            Decimation factors of internal overviews to add, by default None.
+        """
+        # limit GDAL's block cache so memory use does not grow with the image size
+        with rasterio.Env(GDAL_CACHEMAX=2 * _GEOTIFF_BLOCK_BYTES), rasterio.open(
+            image_path
+        ) as src:
+            height, width, count = src.height, src.width, src.count
+            transform = rasterio.transform.from_bounds(*coords, width, height)
+
+            # read whole rows of tiles at a time so each tile is only written once
+            block_rows = _GEOTIFF_BLOCK_BYTES // (width * count)
+            block_rows = max(
+                block_rows // _GEOTIFF_TILE_SIZE * _GEOTIFF_TILE_SIZE,
+                _GEOTIFF_TILE_SIZE,
+            )
+
+            # write to a temporary file first in case ``image_path`` is ``geotiff_path``
+            tmp_path = f"{geotiff_path}.tmp"
+            try:
+                with rasterio.open(
+                    tmp_path,
+                    "w",
+                    driver="GTiff",
+                    height=height,
+                    width=width,
+                    count=count,
+                    transform=transform,
+                    dtype="uint8",
+                    nodata=0,
+                    crs=crs,
+                    **MapImages._geotiff_options(height, width, tiled, compress),
+                ) as dst:
+                    for y in range(0, height, block_rows):
+                        window = rasterio.windows.Window(
+                            0, y, width, min(block_rows, height - y)
+                        )
+                        dst.write(src.read(window=window), window=window)
+
+                    if overviews:
+                        dst.build_overviews(
+                            overviews, rasterio.enums.Resampling.average
+                        )
+                        dst.update_tags(ns="rio_overview", resampling="average")
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        os.replace(tmp_path, geotiff_path)
 
     def save_patches_as_geotiffs(
         self,
         rewrite: bool | None = False,
         verbose: bool | None = False,
         crs: str | None = None,
+        num_workers: int = 1,
+        from_parent: bool = False,
+        tiled: bool = False,
+        compress: str | None = None,
+        path_save: str | None = None,
     ) -> None:
         """
         Save all patches in :class:`~.load.images.MapImages` instance as
@@ -2535,107 +4742,274 @@ See https://pillow.readthedocs.io/en/stable/handbook/concepts.html#modes for mor
             The CRS of the coordinates.
             If None, the method will first look for ``crs`` in the patches dictionary and use those. If ``crs`` cannot be found in the dictionary, the method will use "EPSG:4326".
             By default None.
-        """
+        num_workers : int, optional
+            Number of worker processes to use.
+            If greater than ``1``, the patches of each parent image are saved in parallel using a pool of ``num_workers`` processes.
+            By default ``1``.
+        from_parent : bool, optional
+            If True, each parent image is read once and every patch is cut directly from it, with the transform of each patch computed from the parent's coordinates.
+            This avoids reading each patch file and requires the parents to have coordinates.
+            Patches created with ``resize_factor`` are still read from their image files (or shards).
+            If False (default), each patch is read from its image file and its transform is computed from the patch's coordinates.
+        tiled : bool, optional
+            Whether to write tiled geotiffs, by default ``False``.
+        compress : str, optional
+            Compression to use when writing geotiffs (e.g. ``"deflate"`` or ``"lzw"``).
+            By default None (no compression).
+        path_save : str, optional
+            Directory in which to save the geotiffs.
+            If None (default), each geotiff is saved next to its patch's image file, next to its patch's shard for patches saved with ``container="tar"``, or next to its parent image for patches created with ``materialize=False``.
 
+        Notes
+        -----
+        Patches created with ``materialize=False`` are always cut from their parent images, as if ``from_parent`` were True.
+        """
         patches_list = self.list_patches()
 
-        for patch_id in tqdm(patches_list):
-            self._save_patch_as_geotiff(patch_id, rewrite, verbose, crs)
+        if path_save is not None:
+            self._make_dir(path_save)
 
-    def _save_patch_as_geotiff(
-        self,
-        patch_id: str,
-        rewrite: bool | None = False,
-        verbose: bool | None = False,
-        crs: str | None = None,
-    ) -> None:
-        """Save a patch as a geotiff.
+        tasks = {}
+        for patch_id in patches_list:
+            patch_path = self.patches[patch_id].get("image_path")
+            shard_path = self.patches[patch_id].get("shard_path")
+            parent_id = self.patches[patch_id]["parent_id"]
+            virtual = not isinstance(patch_path, str) and not isinstance(
+                shard_path, str
+            )
+
+            if path_save is not None:
+                patch_dir = path_save
+            elif isinstance(patch_path, str):
+                patch_dir = os.path.dirname(patch_path)
+            elif isinstance(shard_path, str):
+                patch_dir = os.path.dirname(shard_path)
+            else:
+                patch_dir = os.path.dirname(
+                    os.path.abspath(self.parents[parent_id]["image_path"])
+                )
+
+            if not os.path.exists(patch_dir):
+                raise ValueError(
+                    f'[ERROR] Patch directory "{patch_dir}" does not exist.'
+                )
+
+            patch_id_no_ext = os.path.splitext(patch_id)[0]
+            geotiff_path = f"{patch_dir}/{patch_id_no_ext}.tif"
+
+            self.patches[patch_id]["geotiff_path"] = geotiff_path
+
+            if os.path.isfile(f"{geotiff_path}"):
+                if not rewrite:
+                    self._print_if_verbose(
+                        f"[INFO] File already exists: {geotiff_path}.", verbose
+                    )
+                    continue
+
+            self._print_if_verbose(
+                f"[INFO] Creating: {geotiff_path}.",
+                verbose,
+            )
+
+            # patches of resized images are read from their files (or shards)
+            resize_factor = self.patches[patch_id].get("resize_factor")
+            resized = bool(pd.notna(resize_factor) and resize_factor)
+            if (from_parent and not resized) or virtual:
+                task = tasks.get((parent_id, True))
+                if task is None:
+                    task = tasks[(parent_id, True)] = self._get_parent_geotiff_task(
+                        parent_id
+                    )
+            else:
+                task = tasks.setdefault(
+                    (parent_id, False), {"parent_path": None, "patches": []}
+                )
+                if "coordinates" not in self.patches[patch_id].keys():
+                    self._add_patch_coords_id(patch_id)
+
+            task["patches"].append(
+                {
+                    "patch_id": patch_id,
+                    "patch_path": patch_path,
+                    "shard_path": shard_path,
+                    "geotiff_path": geotiff_path,
+                    "pixel_bounds": self.patches[patch_id]["pixel_bounds"],
+                    "coordinates": self.patches[patch_id].get("coordinates"),
+                    "crs": crs
+                    or self.patches[patch_id].get("crs", task.get("crs"))
+                    or "EPSG:4326",
+                }
+            )
+
+        tasks = list(tasks.values())
+        for task in tasks:
+            task["tiled"] = tiled
+            task["compress"] = compress
+
+        if num_workers > 1:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                for _ in tqdm(
+                    executor.map(self._save_patches_as_geotiffs_task, tasks),
+                    total=len(tasks),
+                ):
+                    pass
+        else:
+            for task in tqdm(tasks):
+                self._save_patches_as_geotiffs_task(task)
+
+    def _get_parent_geotiff_task(self, parent_id: str) -> dict:
+        """Get the task for saving the patches of a parent as geotiffs by cutting them from the parent image.
 
         Parameters
         ----------
-        patch_id : str
-            The ID of the patch to write.
-        rewrite : bool, optional
-            Whether to rewrite files if they already exist, by default False
-        verbose : bool, optional
-            Whether to print verbose outputs, by default False
-        crs : Optional[str], optional
-            The CRS of the coordinates.
-            If None, the method will first look for ``crs`` in the patches dictionary and use those. If ``crs`` cannot be found in the dictionary, the method will use "EPSG:4326".
-            By default None.
+        parent_id : str
+            The ID of the parent image.
+
+        Returns
+        -------
+        dict
+            Task containing the path, coordinates and CRS of the parent and an (empty) list of patches.
 
         Raises
         ------
         ValueError
-            If patch directory does not exist.
+            If the parent is not loaded or has no coordinates.
         """
+        if parent_id not in self.parents.keys():
+            raise ValueError(
+                f"[ERROR] Parent image {parent_id} is not loaded. Cannot cut patches from it."
+            )
+        if "coordinates" not in self.parents[parent_id].keys():
+            raise ValueError(f"[ERROR] Cannot locate coordinates for {parent_id}")
 
-        patch_path = self.patches[patch_id]["image_path"]
-        patch_dir = os.path.dirname(patch_path)
-        patch = Image.open(patch_path)
+        return {
+            "parent_path": self.parents[parent_id]["image_path"],
+            "coordinates": self.parents[parent_id]["coordinates"],
+            "crs": self.parents[parent_id].get("crs"),
+            "patches": [],
+        }
 
-        if not os.path.exists(patch_dir):
-            raise ValueError(f'[ERROR] Patch directory "{patch_dir}" does not exist.')
+    @staticmethod
+    def _save_patches_as_geotiffs_task(task: dict) -> None:
+        """Save the patches of one parent image as geotiffs.
 
-        patch_id_no_ext = os.path.splitext(patch_id)[0]
-        geotiff_path = f"{patch_dir}/{patch_id_no_ext}.tif"
+        This is a static method so that it can be sent to worker processes
+        without pickling the MapImages instance.
 
-        self.patches[patch_id]["geotiff_path"] = geotiff_path
+        Parameters
+        ----------
+        task : dict
+            Task containing ``patches`` (a list of dictionaries with the ``patch_id``, ``patch_path``, ``shard_path``, ``geotiff_path``, ``pixel_bounds``, ``coordinates`` and ``crs`` of each patch), ``tiled`` and ``compress``.
+            If ``parent_path`` is not None, patches are cut from the parent image and their transforms are computed from the parent's ``coordinates``.
+            Otherwise, each patch is read from its ``patch_path`` (or from its ``shard_path`` if ``patch_path`` is None).
+        """
+        if task["parent_path"] is not None:
+            parent_array = np.asarray(Image.open(task["parent_path"]))
+            parent_height, parent_width = parent_array.shape[:2]
+            parent_affine = rasterio.transform.from_bounds(
+                *task["coordinates"], parent_width, parent_height
+            )
 
-        if os.path.isfile(f"{geotiff_path}"):
-            if not rewrite:
-                self._print_if_verbose(
-                    f"[INFO] File already exists: {geotiff_path}.", verbose
+        for patch in task["patches"]:
+            min_x, min_y, max_x, max_y = patch["pixel_bounds"]
+
+            if task["parent_path"] is not None:
+                patch_array = parent_array[max(min_y, 0) : max_y, max(min_x, 0) : max_x]
+                if min_x < 0 or min_y < 0:
+                    # square cut patches larger than their parent are padded with zeros (as by ``Image.crop``)
+                    padding = [(-min(min_y, 0), 0), (-min(min_x, 0), 0)]
+                    padding += [(0, 0)] * (patch_array.ndim - 2)
+                    patch_array = np.pad(patch_array, padding)
+                window = rasterio.windows.Window(
+                    min_x, min_y, patch_array.shape[1], patch_array.shape[0]
+                )
+                patch_affine = rasterio.windows.transform(window, parent_affine)
+            else:
+                # for edge patches, crop the patch to the correct size first
+                if patch["patch_path"] is not None:
+                    patch_img = Image.open(patch["patch_path"])
+                else:
+                    patch_img = load_patch_from_shard(
+                        patch["shard_path"], patch["patch_id"]
+                    )
+                patch_array = np.asarray(
+                    patch_img.crop((0, 0, max_x - min_x, max_y - min_y))
+                )
+                patch_affine = rasterio.transform.from_bounds(
+                    *patch["coordinates"], max_x - min_x, max_y - min_y
                 )
-                return
-
-        self._print_if_verbose(
-            f"[INFO] Creating: {geotiff_path}.",
-            verbose,
-        )
-
-        # get shape
-        if "shape" not in self.patches[patch_id].keys():
-            self._add_shape_id(patch_id)
-        height, width, channels = self.patches[patch_id]["shape"]
-
-        # get coords
-        if "coordinates" not in self.patches[patch_id].keys():
-            self._add_patch_coords_id(patch_id)
-        coords = self.patches[patch_id]["coordinates"]
 
-        if not crs:
-            crs = self.patches[patch_id].get("crs", "EPSG:4326")
+            MapImages._write_geotiff(
+                patch["geotiff_path"],
+                patch_array,
+                patch_affine,
+                patch["crs"],
+                tiled=task["tiled"],
+                compress=task["compress"],
+            )
 
-        # for edge patches, crop the patch to the correct size first
-        min_x, min_y, max_x, max_y = self.patches[patch_id]["pixel_bounds"]
-        if width != max_x - min_x:
-            width = max_x - min_x
-            patch = patch.crop((0, 0, width, height))
-        if height != max_y - min_y:
-            height = max_y - min_y
-            patch = patch.crop((0, 0, width, height))
+    @staticmethod
+    def _write_geotiff(
+        geotiff_path: str,
+        array: np.ndarray,
+        transform: rasterio.Affine,
+        crs: str,
+        tiled: bool = False,
+        compress: str | None = None,
+    ) -> None:
+        """Write an image array (as returned by ``numpy.array(PIL.Image.open(...))``) to a geotiff.
 
-        patch_affine = rasterio.transform.from_bounds(*coords, width, height)
+        Parameters
+        ----------
+        geotiff_path : str
+            Path of the geotiff to write.
+        array : numpy.ndarray
+            Array of shape (height, width) or (height, width, channels).
+        transform : rasterio.Affine
+            Affine transform of the image.
+        crs : str
+            The CRS of the image.
+        tiled : bool, optional
+            Whether to write a tiled geotiff, by default ``False``.
+        compress : str, optional
+            Compression to use, by default None.
+        """
+        if array.ndim == 2:
+            array = array[np.newaxis]
+        else:
+            array = np.moveaxis(array, -1, 0)
+        count, height, width = array.shape
 
         with rasterio.open(
             f"{geotiff_path}",
             "w",
             driver="GTiff",
-            height=patch.height,
-            width=patch.width,
-            count=channels,
-            transform=patch_affine,
+            height=height,
+            width=width,
+            count=count,
+            transform=transform,
             dtype="uint8",
             nodata=0,
             crs=crs,
+            **MapImages._geotiff_options(height, width, tiled, compress),
         ) as dst:
-            if len(patch.getbands()) == 1:
-                patch_array = np.array(patch)
-                dst.write(patch_array, indexes=1)
-            else:
-                patch_array = reshape_as_raster(patch)
-                dst.write(patch_array)
+            dst.write(array)
+
+    @staticmethod
+    def _geotiff_options(
+        height: int, width: int, tiled: bool = False, compress: str | None = None
+    ) -> dict:
+        """Get the rasterio creation options for a tiled and/or compressed geotiff.
+
+        Tiles are 256 x 256 pixels, or smaller (but a multiple of 16) for smaller images.
+        """
+        options = {}
+        if tiled:
+            tile_size = min(_GEOTIFF_TILE_SIZE, -(-max(height, width) // 16) * 16)
+            options.update(tiled=True, blockxsize=tile_size, blockysize=tile_size)
+        if compress:
+            options["compress"] = compress
+        return options
 
     def save_patches_to_geojson(
         self,
@@ -55,6 +55,9 @@ def load_patches(
     parent_file_ext: str | bool | None = False,
     add_geo_info: bool | None = False,
     clear_images: bool | None = False,
+    num_workers: int = 1,
+    validate: bool = True,
+    header_cache: str | None = None,
 ) -> MapImages:
     """
     Creates a :class:`~.load.images.MapImages` class to manage a collection of
@@ -87,6 +90,16 @@ def load_patches(
     clear_images : bool, optional
         If ``True``, clears the images from the ``images`` dictionary
         before loading. Default is ``False``.
+    num_workers : int, optional
+        Number of threads to use to read patch headers when validating
+        patches, by default ``1``.
+    validate : bool, optional
+        If ``True`` (default), the header of each patch file is read to check
+        it is an image with an accepted mode. If ``False``, patch files are
+        not opened.
+    header_cache : str or None, optional
+        Path to a SQLite database used to cache image headers (see
+        :class:`~.load.images.MapImages`), by default ``None``.
 
     Returns
     -------
@@ -103,7 +116,7 @@ def load_patches(
     :meth:`~.load.images.MapImages.load_patches` method. Please see
     the documentation for that method for more information as well.
     """
-    img = MapImages()
+    img = MapImages(header_cache=header_cache)
     img.load_patches(
         patch_paths=patch_paths,
         patch_file_ext=patch_file_ext,
@@ -111,6 +124,8 @@ def load_patches(
         parent_file_ext=parent_file_ext,
         add_geo_info=add_geo_info,
         clear_images=clear_images,
+        num_workers=num_workers,
+        validate=validate,
     )
     return img
 
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+# number of paths to look up per SQL query (below SQLite's limit on query parameters)
+_QUERY_SIZE = 500
+
+
+class ImageHeaderCache:
+    """Cache of image headers (e.g. mode, shape, CRS and bounds), stored in a SQLite database.
+
+    Headers are keyed by the absolute path of the image and are only returned if the size and modification time of the file have not changed since the header was cached.
+    This means repeatedly loading the same images only needs to ``stat`` each file instead of opening it.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the SQLite database file. It is created if it does not exist.
+
+    Notes
+    -----
+    A new connection to the database is opened for each read or write so the cache can be safely pickled and shared between processes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = os.path.abspath(db_path)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS headers ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, header TEXT)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=60)
+
+    @staticmethod
+    def _stat(image_path: str) -> tuple[int, int] | None:
+        """Get the size and modification time (in nanoseconds) of a file, or None if it does not exist."""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def read(self, image_paths: list[str]) -> dict[str, dict]:
+        """Get the cached headers of images which have not changed since they were cached.
+
+        Parameters
+        ----------
+        image_paths : list of str
+            Paths to the images.
+
+        Returns
+        -------
+        dict
+            Headers keyed by image path (as given in ``image_paths``).
+            Images which are not in the cache or have changed are not included.
+        """
+        abs_paths = {
+            os.path.abspath(image_path): image_path for image_path in image_paths
+        }
+        abs_path_list = list(abs_paths)
+
+        headers = {}
+        with closing(self._connect()) as connection:
+            for i in range(0, len(abs_path_list), _QUERY_SIZE):
+                query_paths = abs_path_list[i : i + _QUERY_SIZE]
+                rows = connection.execute(
+                    "SELECT path, size, mtime_ns, header FROM headers "
+                    f"WHERE path IN ({', '.join('?' * len(query_paths))})",
+                    query_paths,
+                )
+                for abs_path, size, mtime_ns, header in rows:
+                    if self._stat(abs_path) == (size, mtime_ns):
+                        headers[abs_paths[abs_path]] = self._decode(header)
+        return headers
+
+    def write(self, headers: dict[str, dict]) -> None:
+        """Add headers to the cache, replacing any cached headers of the same images.
+
+        Parameters
+        ----------
+        headers : dict
+            Headers keyed by image path.
+            The size and modification time of each file are recorded when it is added.
+        """
+        rows = []
+        for image_path, header in headers.items():
+            stat = self._stat(image_path)
+            if stat is None:
+                continue
+            rows.append((os.path.abspath(image_path), *stat, json.dumps(header)))
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO headers (path, size, mtime_ns, header) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    @staticmethod
+    def _decode(header: str) -> dict:
+        """Decode a header, converting lists (e.g. ``shape`` and ``bounds``) back to tuples."""
+        return {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in json.loads(header).items()
+        }
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# kinds of column
+_TUPLE = "tuple"  # fixed-length tuples of ints or floats, stored as a 2D array
+_SCALAR = "scalar"  # ints or floats, stored as a 1D array
+_CATEGORY = (
+    "category"  # strings (or None), stored as integer codes (see ``_Column._encode``)
+)
+_OBJECT = "object"  # anything else, stored as Python objects
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(
+        value, (bool, np.bool_)
+    )
+
+
+def _is_float(value: Any) -> bool:
+    return isinstance(value, (float, np.floating))
+
+
+class _Column:
+    """A single column of a :class:`ColumnarImageStore`.
+
+    The kind of column is inferred from the first value set. If a later value does not fit, the column falls back to storing Python objects so values are always returned as they were set.
+    """
+
+    def __init__(self, row_ids: list[str]):
+        self.row_ids = row_ids
+        self.kind = None
+        self.dtype = None
+        self.width = None
+        self.values = None
+        self.present = np.zeros(0, dtype=bool)
+        self.categories = []
+        self.category_codes = {}
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def has(self, row: int) -> bool:
+        return row < len(self.present) and bool(self.present[row])
+
+    def get(self, row: int) -> Any:
+        value = self.values[row]
+        if self.kind == _TUPLE:
+            return tuple(value.tolist())
+        if self.kind == _SCALAR:
+            return value.item()
+        if self.kind == _CATEGORY:
+            if value >= 0:
+                return self.categories[value]
+            if value == -1:
+                return None
+            return self.categories[-value - 2] + self.row_ids[row]
+        return value
+
+    def set(self, row: int, value: Any) -> None:
+        if self.kind is None:
+            self._infer_kind(value)
+        elif not self._fits(value):
+            self._to_object()
+
+        self._grow(row + 1)
+        if self.kind == _CATEGORY:
+            value = self._encode(value, row)
+        self.values[row] = value
+        self.present[row] = True
+
+    def delete(self, row: int) -> None:
+        if row < len(self.present):
+            self.present[row] = False
+
+    def _infer_kind(self, value: Any) -> None:
+        if isinstance(value, tuple) and len(value):
+            if all(_is_int(v) for v in value):
+                self.kind, self.dtype, self.width = _TUPLE, np.int64, len(value)
+            elif all(_is_float(v) for v in value):
+                self.kind, self.dtype, self.width = _TUPLE, np.float64, len(value)
+            else:
+                self.kind, self.dtype = _OBJECT, object
+        elif _is_int(value):
+            self.kind, self.dtype = _SCALAR, np.int64
+        elif _is_float(value):
+            self.kind, self.dtype = _SCALAR, np.float64
+        elif isinstance(value, str) or value is None:
+            self.kind, self.dtype = _CATEGORY, np.int32
+        else:
+            self.kind, self.dtype = _OBJECT, object
+
+        shape = (0, self.width) if self.kind == _TUPLE else (0,)
+        self.values = np.zeros(shape, dtype=self.dtype)
+
+    def _fits(self, value: Any) -> bool:
+        if self.kind == _TUPLE:
+            check = _is_int if self.dtype == np.int64 else _is_float
+            return (
+                isinstance(value, tuple)
+                and len(value) == self.width
+                and all(check(v) for v in value)
+            )
+        if self.kind == _SCALAR:
+            return _is_int(value) if self.dtype == np.int64 else _is_float(value)
+        if self.kind == _CATEGORY:
+            return isinstance(value, str) or value is None
+        return True
+
+    def _encode(self, value: str | None, row: int) -> int:
+        """Encode a string as an integer code.
+
+        Codes ``>= 0`` are indices into ``categories``, ``-1`` is ``None`` and codes ``<= -2`` are a prefix (e.g. a directory) followed by the image ID of the row.
+        This means paths such as ``"./patches/<patch_id>"`` only need to be stored once per directory.
+        """
+        if value is None:
+            return -1
+        row_id = self.row_ids[row]
+        if len(value) > len(row_id) and value.endswith(row_id):
+            return -self._category_code(value[: -len(row_id)]) - 2
+        return self._category_code(value)
+
+    def _category_code(self, value: str) -> int:
+        code = self.category_codes.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.category_codes[value] = code
+        return code
+
+    def _grow(self, length: int) -> None:
+        """Make sure the column has space for at least ``length`` rows."""
+        if length <= len(self.present):
+            return
+        if length > len(self.values):
+            capacity = max(length, 2 * len(self.values), 16)
+            shape = (capacity, self.width) if self.kind == _TUPLE else (capacity,)
+            values = np.zeros(shape, dtype=self.dtype)
+            values[: len(self.values)] = self.values
+            self.values = values
+        present = np.zeros(length, dtype=bool)
+        present[: len(self.present)] = self.present
+        self.present = present
+
+    def _to_object(self) -> None:
+        """Convert the column to store Python objects."""
+        values = np.empty(len(self.values), dtype=object)
+        for row in np.flatnonzero(self.present):
+            values[row] = self.get(row)
+        self.kind, self.dtype, self.width = _OBJECT, object, None
+        self.values = values
+        self.categories, self.category_codes = [], {}
+
+    def to_array(self, rows: np.ndarray) -> np.ndarray:
+        """Get the values of ``rows`` as a 1D array, with ``NaN`` for missing values."""
+        rows_in_column = rows < len(self.present)
+        present = np.zeros(len(rows), dtype=bool)
+        present[rows_in_column] = self.present[rows[rows_in_column]]
+        rows = np.where(present, rows, 0)
+
+        if self.kind == _SCALAR:
+            values = self.values[rows]
+            if present.all():
+                return values
+            values = values.astype(np.float64)
+            values[~present] = np.nan
+            return values
+
+        if self.kind == _TUPLE:
+            values = np.empty(len(rows), dtype=object)
+            values[:] = list(zip(*self.values[rows].T.tolist()))
+        elif self.kind == _CATEGORY:
+            codes = self.values[rows]
+            categories = np.empty(len(self.categories) + 1, dtype=object)
+            categories[:-1] = self.categories
+            categories[-1] = None  # code -1
+            values = categories[np.where(codes < -1, -1, codes)]
+            for i in np.flatnonzero((codes < -1) & present):
+                values[i] = self.categories[-codes[i] - 2] + self.row_ids[rows[i]]
+        else:
+            values = self.values[rows].copy()
+        values[~present] = np.nan
+        return values
+
+
+class _RowView(MutableMapping):
+    """Dictionary-like view of a single row of a :class:`ColumnarImageStore`."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: ColumnarImageStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._store._columns.get(key)
+        if column is None or not column.has(self._row):
+            raise KeyError(key)
+        return column.get(self._row)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        column = self._store._columns.get(key)
+        if column is None:
+            column = self._store._columns[key] = _Column(self._store._row_ids)
+        column.set(self._row, value)
+
+    def __delitem__(self, key: str) -> None:
+        column = self._store._columns.get(key)
+        if column is None or not column.has(self._row):
+            raise KeyError(key)
+        column.delete(self._row)
+
+    def __iter__(self) -> Iterator[str]:
+        for key, column in self._store._columns.items():
+            if column.has(self._row):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> dict:
+        return dict(self)
+
+
+class ColumnarImageStore(MutableMapping):
+    """Dictionary-like store of image records, kept as typed columns.
+
+    Each record (e.g. a patch) is accessed by its image ID and behaves like a dictionary, but values are stored per key in typed arrays instead of one dictionary per image.
+    This uses much less memory for large numbers of images and means the store can be converted to a DataFrame without building a dictionary for every row.
+
+    Notes
+    -----
+    Tuples of ints or floats (e.g. ``"shape"``, ``"pixel_bounds"`` and ``"coordinates"``) are stored as 2D numpy arrays, ints and floats as 1D numpy arrays and strings as integer codes.
+    Any other values (e.g. geometries and lists) are stored as Python objects.
+    If a value does not match the type of its column, the whole column falls back to storing Python objects.
+    """
+
+    def __init__(self, records: Mapping | None = None):
+        self._index = {}
+        self._row_ids = []
+        self._columns = {}
+        if records:
+            self.update(records)
+
+    def __getitem__(self, image_id: str) -> _RowView:
+        return _RowView(self, self._index[image_id])
+
+    def __setitem__(self, image_id: str, record: Mapping) -> None:
+        row = self._index.get(image_id)
+        if row is None:
+            row = self._index[image_id] = len(self._row_ids)
+            self._row_ids.append(image_id)
+        else:
+            # copy first in case ``record`` is a view of this row
+            record = dict(record)
+            for column in self._columns.values():
+                column.delete(row)
+
+        row_view = _RowView(self, row)
+        for key, value in record.items():
+            row_view[key] = value
+
+    def __delitem__(self, image_id: str) -> None:
+        row = self._index.pop(image_id)
+        for column in self._columns.values():
+            column.delete(row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, image_id: object) -> bool:
+        return image_id in self._index
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} records)"
+
+    def clear(self) -> None:
+        self._index = {}
+        self._row_ids = []
+        self._columns = {}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the store to a pandas DataFrame, with one column per key.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by image ID. Missing values are filled with ``NaN``.
+        """
+        rows = np.fromiter(self._index.values(), dtype=np.int64, count=len(self))
+        data = {}
+        for key, column in self._columns.items():
+            if (
+                column.kind is None
+                or not column.present[rows[rows < len(column)]].any()
+            ):
+                continue
+            data[key] = column.to_array(rows)
+        return pd.DataFrame(data, index=pd.Index(list(self._index), dtype=object))
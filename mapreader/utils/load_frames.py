@@ -1,35 +1,139 @@
 from __future__ import annotations
 
+import json
 import pathlib
 import re
 from ast import literal_eval
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from geopandas.array import GeometryDtype
 from shapely import Geometry, from_wkt
 
+# key of the Parquet file metadata listing columns saved as strings of Python literals
+_PARQUET_METADATA_KEY = b"mapreader"
+# columns which are known to contain tuples of numbers (e.g. from ``MapImages.convert_images``)
+_TUPLE_COLUMNS = ["shape", "pixel_bounds", "coordinates"]
+# columns which are known to contain strings and so are never evaluated
+_STRING_COLUMNS = [
+    "image_id",
+    "parent_id",
+    "image_path",
+    "crs",
+    "url",
+    "grid_bb",
+    "geometry",
+    "polygon",
+]
 
-def eval_dataframe(df: pd.DataFrame | gpd.GeoDataFrame):
+# numbers which ``ast.literal_eval`` evaluates as ints (that fit in int64) or floats
+_INT = r"-?(?:0|[1-9]\d{0,17})"
+_FLOAT = r"-?(?:\d+\.\d*(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+)"
+
+
+def eval_dataframe(df: pd.DataFrame | gpd.GeoDataFrame, sample_size: int = 100):
     """Evaluates the columns of a DataFrame/GeoDataFrame and converts them to their respective types.
 
     Parameters
     ----------
     df : pd.DataFrame | gpd.GeoDataFrame
         The DataFrame/GeoDataFrame to evaluate.
+    sample_size : int, optional
+        Number of values of each unknown column to evaluate before evaluating the whole column, by default ``100``.
 
     Returns
     -------
     pd.DataFrame | gpd.GeoDataFrame
         The evaluated DataFrame/GeoDataFrame.
+
+    Notes
+    -----
+    Columns are only evaluated if all of their values can be evaluated (using ``ast.literal_eval``), otherwise they are left unchanged.
+
+    To avoid evaluating every value of every column:
+
+    - Columns which are not strings (e.g. numbers) and columns known to contain strings (e.g. ``"image_id"`` and ``"image_path"``) are skipped.
+    - Columns of tuples of numbers (e.g. ``"shape"``, ``"pixel_bounds"`` and ``"coordinates"``) are parsed in a single vectorized pass.
+    - For any other column, a sample of values is evaluated first and the column is skipped if any of them cannot be evaluated.
     """
     for col in df.columns:
+        if col in _STRING_COLUMNS or df[col].dtype != object:
+            continue
+
+        values = df[col]
+        if values.isna().any():  # missing values cannot be evaluated
+            continue
+
+        if col not in _TUPLE_COLUMNS:
+            # evenly spaced sample, including the first and last values
+            sample_index = np.linspace(
+                0, len(values) - 1, min(sample_size, len(values))
+            )
+            sample_values = values.iloc[np.unique(sample_index.astype(int))]
+            try:
+                sample = [literal_eval(value) for value in sample_values]
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                continue
+            if len(sample) == len(values):  # whole column has been evaluated
+                df[col] = pd.Series(sample, index=df.index)
+                continue
+
+        parsed = _parse_number_tuples(values)
+        if parsed is not None:
+            df[col] = pd.Series(parsed, index=df.index, dtype=object)
+            continue
+
         try:
-            df[col] = df[col].apply(literal_eval)
-        except (ValueError, TypeError, SyntaxError):
+            df[col] = values.apply(literal_eval)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
             pass
     return df
 
 
+def _parse_number_tuples(values: pd.Series) -> list[tuple] | None:
+    """Parse a column of strings of tuples of numbers (e.g. ``"(0, 0, 100, 100)"``) in a single vectorized pass.
+
+    Returns the same tuples as ``ast.literal_eval``, or None if the column is not made up of tuples of the same length which are either all ints or all floats.
+    """
+    strings = values.tolist()
+    if len(strings) == 0 or not all(isinstance(string, str) for string in strings):
+        return None
+
+    width = strings[0].count(",") + 1
+    if width < 2:
+        return None
+
+    # check all strings at once, with one string per line
+    text = "\n".join(strings)
+
+    def matches(number: str) -> bool:
+        tuple_pattern = (
+            rf"\([ \t]*{number}(?:[ \t]*,[ \t]*{number}){{{width - 1}}}[ \t]*\)"
+        )
+        return re.fullmatch(rf"{tuple_pattern}(?:\n{tuple_pattern})*", text) is not None
+
+    dtype = next(
+        (
+            dtype
+            for number, dtype in [(_INT, np.int64), (_FLOAT, np.float64)]
+            if matches(number)
+        ),
+        None,
+    )
+    if dtype is None:
+        return None
+
+    numbers = np.fromstring(
+        text.translate(str.maketrans("()\n", "  ,")), dtype=dtype, sep=","
+    )
+    if len(numbers) != width * len(strings):
+        return None
+    return list(zip(*numbers.reshape(len(strings), width).T.tolist()))
+
+
 def load_from_csv(
     fpath: str,
     index_col: int | str | None = 0,
@@ -76,6 +180,164 @@ def load_from_excel(
     return df
 
 
+def load_from_parquet(
+    fpath: str,
+    **kwargs,
+):
+    """Load a DataFrame/GeoDataFrame from a Parquet/GeoParquet file.
+
+    Files are read using ``geopandas.read_parquet`` (if they contain geometries) or ``pandas.read_parquet``.
+    Columns of lists are then converted back to tuples (for ``"shape"``, ``"pixel_bounds"`` and ``"coordinates"``) or lists.
+    Only columns which :func:`save_to_parquet` saved as strings of Python literals (as listed in the file's metadata) are evaluated from strings.
+
+    Parameters
+    ----------
+    fpath : str
+        Path to the Parquet file.
+    **kwargs
+        Keyword arguments to pass to ``geopandas.read_parquet`` or ``pandas.read_parquet``.
+
+    Returns
+    -------
+    pd.DataFrame | gpd.GeoDataFrame
+        The loaded DataFrame, or GeoDataFrame if the file contains GeoParquet metadata.
+    """
+    check_exists(fpath)
+    metadata = pq.read_schema(fpath).metadata or {}
+    if b"geo" in metadata:
+        df = gpd.read_parquet(fpath, **kwargs)
+    else:
+        df = pd.read_parquet(fpath, **kwargs)
+
+    literal_columns = []
+    if _PARQUET_METADATA_KEY in metadata:
+        literal_columns = json.loads(metadata[_PARQUET_METADATA_KEY])["literal_columns"]
+
+    for col in df.columns:
+        if str(col) in literal_columns:
+            df[col] = [
+                literal_eval(value) if isinstance(value, str) else value
+                for value in df[col]
+            ]
+            continue
+        if df[col].dtype != object:
+            continue
+        values = df[col].to_numpy()
+        present = np.array([isinstance(value, np.ndarray) for value in values])
+        if present.any():
+            df[col] = _arrays_to_python(values, present, col in _TUPLE_COLUMNS)
+    return df
+
+
+def save_to_parquet(
+    df: pd.DataFrame | gpd.GeoDataFrame,
+    fpath: str,
+    **kwargs,
+):
+    """Save a DataFrame/GeoDataFrame to a Parquet file (or GeoParquet file if it contains geometries).
+
+    Unlike CSV files, the types of columns are kept so the file can be loaded using :func:`load_from_parquet` without evaluating values from strings:
+
+    - Columns of tuples or lists (e.g. ``"shape"``, ``"pixel_bounds"`` and ``"coordinates"``) are saved as Parquet list columns.
+    - Columns of shapely geometries are saved using ``GeoDataFrame.to_parquet``.
+    - Columns of values which cannot be stored in Parquet (e.g. mixed types) are saved as strings of Python literals and listed in the file's metadata, so they are evaluated (using ``ast.literal_eval``) when loaded.
+
+    Parameters
+    ----------
+    df : pd.DataFrame | gpd.GeoDataFrame
+        The DataFrame/GeoDataFrame to save.
+    fpath : str
+        Path to save the Parquet file.
+    **kwargs
+        Keyword arguments to pass to ``GeoDataFrame.to_parquet`` or ``DataFrame.to_parquet``.
+
+    Raises
+    ------
+    ValueError
+        If a column cannot be stored in Parquet and its values cannot be saved as Python literals.
+    """
+    df = df.copy()
+    geometry_columns = []
+    literal_columns = []
+    for col in df.columns:
+        if isinstance(df[col].dtype, GeometryDtype):
+            geometry_columns.append(col)
+            continue
+        if df[col].dtype != object:
+            continue
+
+        present = df[col].notna()
+        if present.any() and all(
+            isinstance(value, Geometry) for value in df[col][present]
+        ):
+            df[col] = gpd.GeoSeries(df[col].where(present, None), index=df.index)
+            geometry_columns.append(col)
+            continue
+
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError):
+            df[col] = _to_literal_strings(df[col], present)
+            literal_columns.append(col)
+
+    if geometry_columns and (
+        not isinstance(df, gpd.GeoDataFrame) or df.geometry.name not in df.columns
+    ):
+        df = gpd.GeoDataFrame(df, geometry=geometry_columns[0])
+    df.to_parquet(fpath, **kwargs)
+
+    if literal_columns:
+        # neither writer can add file metadata, so add it to the written table
+        table = pq.read_table(fpath)
+        table = table.replace_schema_metadata(
+            {
+                **table.schema.metadata,
+                _PARQUET_METADATA_KEY: json.dumps(
+                    {"literal_columns": [str(col) for col in literal_columns]}
+                ),
+            }
+        )
+        pq.write_table(table, fpath, compression=kwargs.get("compression", "snappy"))
+
+
+def _to_literal_strings(values: pd.Series, present: pd.Series) -> pd.Series:
+    """Convert the values of a column to strings of Python literals (with None for missing values), checking they can be evaluated back to the same values."""
+    strings = []
+    for value, is_present in zip(values, present):
+        if not is_present:
+            strings.append(None)
+            continue
+        if isinstance(value, np.generic):
+            value = value.item()
+        string = repr(value)
+        try:
+            valid = literal_eval(string) == value
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            valid = False
+        if not valid:
+            raise ValueError(
+                f"[ERROR] Cannot save column '{values.name}' to Parquet: {string} cannot be stored in Parquet or saved as a Python literal."
+            )
+        strings.append(string)
+    return pd.Series(strings, index=values.index, dtype=object)
+
+
+def _arrays_to_python(
+    values: np.ndarray, present: np.ndarray, as_tuples: bool
+) -> list | np.ndarray:
+    """Convert the arrays of a Parquet list column (as read by pandas) into tuples or lists, with ``NaN`` for missing values."""
+    arrays = values[present]
+    if as_tuples and present.all() and len({len(array) for array in arrays}) == 1:
+        # convert fixed-length tuples in a single pass
+        return list(zip(*np.stack(arrays).T.tolist()))
+
+    convert = tuple if as_tuples else list
+    converted = np.full(len(values), np.nan, dtype=object)
+    for i, array in zip(np.flatnonzero(present), arrays):
+        converted[i] = convert(array.tolist())
+    return converted
+
+
 def get_load_function(
     fpath: str | pathlib.Path,
     **kwargs,
@@ -95,6 +357,8 @@ def get_load_function(
         func = load_from_csv
     elif re.search(r"\..*?json$", str(fpath)):  # json, geojson
         func = load_from_geojson
+    elif re.search(r"\.parquet$", str(fpath)):  # parquet, geoparquet
+        func = load_from_parquet
     else:
         raise ValueError(
             "[ERROR] File format not supported. Please load your file manually."
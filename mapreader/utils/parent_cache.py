@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+import numpy as np
+from PIL import Image
+
+# image modes whose pixel values can be converted back into an image using ``PIL.Image.fromarray``
+# (with the palette added back for "P" images)
+_CACHED_MODES = ["1", "L", "P", "LA", "RGB", "RGBA", "I", "I;16", "F"]
+
+
+class ParentPixelCache:
+    """Cache of decoded parent images, stored as ``.npy`` files and read as read-only memory maps.
+
+    Each image is decoded once and saved in ``cache_dir``.
+    Later reads (from any process) memory-map the saved pixel values instead of decoding the image again, so patches can be sliced from a parent image without copying it and the pages of a parent are shared between processes reading it at the same time.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory in which to save decoded images. It is created if it does not exist.
+    max_bytes : int or None, optional
+        Maximum total size (in bytes) of the decoded images to keep.
+        When a new image is added and the total size is larger than this, the least recently used images are removed.
+        If None (default), images are never removed.
+
+    Notes
+    -----
+    Decoded images are keyed by the absolute path, size and modification time of the image file, so a changed image is decoded again.
+    Files are written to a temporary file and renamed so processes never read an incomplete file and the cache can be safely pickled and shared between processes.
+    Removing an image which is memory-mapped by another process does not affect that process.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int | None = None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.cache_dir!r}, max_bytes={self.max_bytes})"
+        )
+
+    def _cache_path(self, image_path: str) -> str:
+        """Get the path of the ``.npy`` file used to cache an image."""
+        image_path = os.path.abspath(image_path)
+        stat = os.stat(image_path)
+        key = f"{image_path}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return os.path.join(
+            self.cache_dir, f"{hashlib.sha1(key.encode()).hexdigest()}.npy"
+        )
+
+    def get(self, image_path: str) -> np.ndarray:
+        """Get the pixel values of an image, decoding and caching it if it is not already cached.
+
+        Parameters
+        ----------
+        image_path : str
+            Path to the image.
+
+        Returns
+        -------
+        numpy.ndarray
+            Read-only memory map of the pixel values, in the same form as ``numpy.array(PIL.Image.open(image_path))``.
+        """
+        cache_path = self._cache_path(image_path)
+        try:
+            array = np.load(cache_path, mmap_mode="r")
+            os.utime(cache_path)  # mark as recently used
+            return array
+        except FileNotFoundError:
+            pass
+
+        array = np.asarray(Image.open(image_path))
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, cache_path)
+
+        self._evict(keep=cache_path)
+        return np.load(cache_path, mmap_mode="r")
+
+    def get_image(self, image_path: str) -> Image.Image:
+        """Get an image, using its cached pixel values if possible.
+
+        Parameters
+        ----------
+        image_path : str
+            Path to the image.
+
+        Returns
+        -------
+        PIL.Image.Image
+            The image.
+            If its mode cannot be recreated from an array (e.g. ``"CMYK"``), the image is opened from file instead.
+        """
+        img = Image.open(image_path)
+        if img.mode not in _CACHED_MODES:
+            return img
+
+        cached_img = Image.fromarray(self.get(image_path))
+        if img.mode == "P":
+            cached_img.putpalette(img.getpalette())
+        return cached_img
+
+    def _evict(self, keep: str | None = None) -> None:
+        """Remove the least recently used images until the total size is at most ``max_bytes``.
+
+        Parameters
+        ----------
+        keep : str or None, optional
+            Path of a cached image which should not be removed, by default None.
+        """
+        if self.max_bytes is None:
+            return
+
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".npy"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # removed by another process
+                    continue
+                entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+                total_bytes += stat.st_size
+
+        for _, path, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def clear(self) -> None:
+        """Remove all cached images."""
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
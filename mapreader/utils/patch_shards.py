@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import tarfile
+from functools import lru_cache
+
+from PIL import Image
+
+
+class PatchShardWriter:
+    """Write patches into a single tar file ("shard") with a JSON index.
+
+    The shard and its index are written to temporary files and only moved into place when the writer is closed (any old index is removed first), so an incomplete shard is never mistaken for a complete one.
+
+    Parameters
+    ----------
+    shard_path : str
+        Path to the shard file to create (e.g. ``"./patches/patches-#map.png#.tar"``).
+
+    Notes
+    -----
+    The index is saved alongside the shard (as ``shard_path + ".index.json"``) and maps each patch ID to the offset and size of its data in the shard and its shape.
+    Patches are stored in the order they are added so reading a shard in index order gives sequential I/O.
+    """
+
+    def __init__(self, shard_path: str):
+        self.shard_path = shard_path
+        self._tmp_path = f"{shard_path}.tmp"
+        self._tar = tarfile.open(self._tmp_path, "w")
+        self._shapes = {}
+
+    def add(self, patch_id: str, patch: Image.Image, output_format: str) -> None:
+        """Add a patch to the shard.
+
+        Parameters
+        ----------
+        patch_id : str
+            The ID of the patch, used as its name in the shard.
+        patch : PIL.Image.Image
+            The patch image.
+        output_format : str
+            Format to use when encoding the patch (e.g. ``"png"``).
+        """
+        buffer = io.BytesIO()
+        patch.save(buffer, output_format)
+
+        tarinfo = tarfile.TarInfo(name=patch_id)
+        tarinfo.size = buffer.tell()
+        buffer.seek(0)
+        self._tar.addfile(tarinfo, buffer)
+
+        self._shapes[patch_id] = (patch.height, patch.width, len(patch.getbands()))
+
+    def close(self) -> None:
+        """Finish writing the shard and its index."""
+        self._tar.close()
+
+        # read back the header of each member to find where its data starts
+        index = {}
+        with tarfile.open(self._tmp_path, "r") as tar:
+            for member in tar.getmembers():
+                index[member.name] = {
+                    "offset": member.offset_data,
+                    "size": member.size,
+                    "shape": self._shapes[member.name],
+                }
+
+        # remove the old index first so an interrupted rewrite never pairs the new shard with the old index
+        index_path = get_index_path(self.shard_path)
+        try:
+            os.remove(index_path)
+        except FileNotFoundError:
+            pass
+        os.replace(self._tmp_path, self.shard_path)
+
+        tmp_index_path = f"{index_path}.tmp"
+        with open(tmp_index_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_index_path, index_path)
+
+    def __enter__(self) -> PatchShardWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._tar.close()
+            os.remove(self._tmp_path)
+
+
+def get_index_path(shard_path: str) -> str:
+    """Get the path to the index of a shard."""
+    return f"{shard_path}.index.json"
+
+
+def is_complete_shard(shard_path: str) -> bool:
+    """Check whether a shard and its index have been fully written."""
+    return os.path.isfile(shard_path) and os.path.isfile(get_index_path(shard_path))
+
+
+def read_shard_index(shard_path: str) -> dict:
+    """Read the index of a shard.
+
+    Parameters
+    ----------
+    shard_path : str
+        Path to the shard.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping patch IDs to the ``offset``, ``size`` and ``shape`` of each patch, in the order the patches are stored.
+
+    Notes
+    -----
+    Indexes are cached by path, inode, size and modification time, so an index rewritten by any process (e.g. a worker rewriting the shard) is read again.
+    """
+    index_path = get_index_path(shard_path)
+    stat = os.stat(index_path)
+    return _read_index(index_path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _read_index(index_path: str, ino: int, size: int, mtime_ns: int) -> dict:
+    """Read an index file, cached by the (unused) stat values passed with its path."""
+    with open(index_path) as f:
+        index = json.load(f)
+    for entry in index.values():
+        entry["shape"] = tuple(entry["shape"])
+    return index
+
+
+def load_patch_from_shard(shard_path: str, patch_id: str) -> Image.Image:
+    """Load a single patch from a shard.
+
+    Parameters
+    ----------
+    shard_path : str
+        Path to the shard.
+    patch_id : str
+        The ID of the patch.
+
+    Returns
+    -------
+    PIL.Image.Image
+        The patch image.
+    """
+    entry = read_shard_index(shard_path)[patch_id]
+    with open(shard_path, "rb") as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["size"])
+    return Image.open(io.BytesIO(data))
+
+
+def iter_shard(shard_path: str):
+    """Iterate over all patches in a shard, reading the shard from start to end.
+
+    Parameters
+    ----------
+    shard_path : str
+        Path to the shard.
+
+    Yields
+    ------
+    tuple of str and PIL.Image.Image
+        The patch ID and patch image.
+    """
+    index = read_shard_index(shard_path)
+    with open(shard_path, "rb") as f:
+        for patch_id, entry in index.items():
+            f.seek(entry["offset"])
+            data = f.read(entry["size"])
+            yield patch_id, Image.open(io.BytesIO(data))
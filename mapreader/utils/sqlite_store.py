@@ -0,0 +1,521 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import weakref
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# keys which are indexed so records can be looked up by value (see ``SQLiteImageStore.find``)
+_INDEXED_KEYS = ["parent_id", "label"]
+# number of image IDs to read per query when iterating over the store
+_PAGE_SIZE = 10000
+# number of writes after which the current transaction is committed
+_COMMIT_SIZE = 10000
+# number of mutable values (e.g. lists of patches) to keep in memory before writing them back
+_LIVE_SIZE = 256
+# prefixes of values encoded as JSON or (for geometries) as WKB
+_JSON = b"J"
+_WKB = b"G"
+# marks a key to remove from a record
+_MISSING = object()
+
+
+def _quote(name: str) -> str:
+    """Quote a key so it can be used as a column name."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a value to something JSON can encode, tagging tuples, dicts, sets, geometries and arrays so they can be restored by ``_from_json``."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.bool_, np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, tuple):
+        return {"tuple": [_to_json(v) for v in value]}
+    if isinstance(value, dict):
+        return {"dict": [[_to_json(k), _to_json(v)] for k, v in value.items()]}
+    if isinstance(value, (set, frozenset)):
+        return {"set": [_to_json(v) for v in value]}
+    if isinstance(value, shapely.Geometry):
+        return {"wkb": shapely.to_wkb(value, hex=True)}
+    if isinstance(value, np.ndarray):
+        return {"array": [value.dtype.str, _to_json(value.tolist())]}
+    raise TypeError(
+        f"[ERROR] Values of type {type(value).__name__} cannot be saved in a SQLiteImageStore."
+    )
+
+
+def _from_json(obj: dict) -> Any:
+    """Restore a value tagged by ``_to_json`` (used as the ``object_hook`` of ``json.loads``)."""
+    ((tag, value),) = obj.items()
+    if tag == "tuple":
+        return tuple(value)
+    if tag == "dict":
+        return {k: v for k, v in value}
+    if tag == "set":
+        return set(value)
+    if tag == "wkb":
+        return shapely.from_wkb(value)
+    if tag == "array":
+        dtype, data = value
+        return np.array(data, dtype=dtype)
+    raise ValueError(f"[ERROR] Unknown value tag: {tag}.")
+
+
+def _encode(value: Any) -> int | float | str | bytes:
+    """Encode a value for SQLite.
+
+    Ints, floats and strings are stored as they are, geometries as WKB and anything else (including ``None``) as JSON, with tuples, dicts, sets and arrays tagged so they keep their types.
+    """
+    if isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    if isinstance(value, str):
+        return value
+    if isinstance(value, shapely.Geometry):
+        return _WKB + shapely.to_wkb(value)
+    return _JSON + json.dumps(_to_json(value), separators=(",", ":")).encode()
+
+
+def _decode(value: int | float | str | bytes) -> Any:
+    if not isinstance(value, bytes):
+        return value
+    if value.startswith(_WKB):
+        return shapely.from_wkb(value[len(_WKB) :])
+    if value.startswith(_JSON):
+        return json.loads(value[len(_JSON) :], object_hook=_from_json)
+    raise ValueError(
+        "[ERROR] Cannot decode value, it was not saved by SQLiteImageStore."
+    )
+
+
+def _bounds(value: Any) -> tuple | None:
+    """Get ``(min_x, max_x, min_y, max_y)`` from a ``coordinates`` value, or None if it is not a 4-tuple of numbers."""
+    try:
+        min_x, min_y, max_x, max_y = (float(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    return min_x, max_x, min_y, max_y
+
+
+def _write_back(connection: sqlite3.Connection, table: str, live: dict) -> None:
+    """Write the mutable values kept in memory back to the database and commit."""
+    for (image_id, key), value in live.items():
+        connection.execute(
+            f"UPDATE {_quote(table)} SET {_quote(key)} = ? WHERE _image_id = ?",
+            (_encode(value), image_id),
+        )
+    connection.commit()
+
+
+def _close(
+    connection: sqlite3.Connection, table: str, live: dict, remove_path: str | None
+) -> None:
+    """Save all changes and close the database, removing it if it is temporary."""
+    _write_back(connection, table, live)
+    live.clear()
+    connection.close()
+    if remove_path is not None:
+        for suffix in ["", "-wal", "-shm"]:
+            try:
+                os.remove(remove_path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+class _RowView(MutableMapping):
+    """Dictionary-like view of a single record of a :class:`SQLiteImageStore`."""
+
+    __slots__ = ("_store", "_image_id")
+
+    def __init__(self, store: SQLiteImageStore, image_id: str):
+        self._store = store
+        self._image_id = image_id
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store._get_value(self._image_id, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store._set_values(self._image_id, {key: value})
+
+    def __delitem__(self, key: str) -> None:
+        self._store._get_value(self._image_id, key)  # raises KeyError if missing
+        self._store._set_values(self._image_id, {key: _MISSING})
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._get_record(self._image_id))
+
+    def __len__(self) -> int:
+        return len(self._store._get_record(self._image_id))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> dict:
+        return self._store._get_record(self._image_id)
+
+    def update(self, other: Mapping = (), **kwargs: Any) -> None:
+        self._store._set_values(self._image_id, {**dict(other), **kwargs})
+
+
+class SQLiteImageStore(MutableMapping):
+    """Dictionary-like store of image records, kept in a table of a SQLite database.
+
+    Each record (e.g. a patch) is accessed by its image ID and behaves like a dictionary, but values are read from and written to the database when they are accessed.
+    This means memory use does not grow with the number of images and the records are kept on disk, so they can be reopened later.
+
+    Parameters
+    ----------
+    db_path : str or None, optional
+        Path to the SQLite database file. It is created if it does not exist and any records already in ``table`` are kept.
+        If None (default), a temporary file is used and removed when the store is closed.
+    table : str, optional
+        Name of the table used to store the records, by default ``"images"``.
+
+    Notes
+    -----
+    Each key is stored in its own column, which is added when the key is first set.
+    Ints, floats and strings are stored as SQLite values, geometries as WKB and anything else (e.g. ``None``, tuples, lists and dictionaries) as JSON.
+    Values are never pickled, so opening a database from elsewhere cannot run arbitrary code.
+    The ``parent_id`` and ``label`` keys are indexed (see :meth:`find`) and the ``coordinates`` of each record are kept in an R*Tree index (see :meth:`query_bounds`).
+
+    Lists and other mutable values read from the store are kept in memory and written back when the store is flushed and when it is closed, so changing them in place (e.g. appending a patch to a parent's ``"patches"``) works as it does for a dictionary.
+    Once a few hundred are kept in memory, they are all written back and those which are no longer referenced elsewhere are removed from memory.
+    Writes are committed in batches; call :meth:`flush` to make sure all changes are saved to the database.
+    """
+
+    def __init__(self, db_path: str | None = None, table: str = "images"):
+        if db_path is None:
+            fd, db_path = tempfile.mkstemp(suffix=".db", prefix="mapreader_")
+            os.close(fd)
+            self._temporary = True
+        else:
+            self._temporary = False
+        self.db_path = os.path.abspath(db_path)
+        self.table = table
+        self._bounds_table = f"{table}_bounds"
+
+        self._connection = sqlite3.connect(self.db_path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+            "_row INTEGER PRIMARY KEY, _image_id TEXT UNIQUE NOT NULL)"
+        )
+        self._connection.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {_quote(self._bounds_table)} "
+            "USING rtree(_row, min_x, max_x, min_y, max_y)"
+        )
+        self._connection.commit()
+        self._columns = [
+            row[1]
+            for row in self._connection.execute(
+                f"PRAGMA table_info({_quote(table)})"
+            ).fetchall()
+            if row[1] not in ["_row", "_image_id"]
+        ]
+        self._n_writes = 0
+        self._live = {}
+        self._live_limit = _LIVE_SIZE
+        self._finalizer = weakref.finalize(
+            self,
+            _close,
+            self._connection,
+            self.table,
+            self._live,
+            self.db_path if self._temporary else None,
+        )
+
+    def __getitem__(self, image_id: str) -> _RowView:
+        if image_id not in self:
+            raise KeyError(image_id)
+        return _RowView(self, image_id)
+
+    def __setitem__(self, image_id: str, record: Mapping) -> None:
+        # copy first in case ``record`` is a view of this row
+        record = dict(record)
+        if image_id in self:
+            values = dict.fromkeys(self._columns, _MISSING)
+            values.update(record)
+            self._set_values(image_id, values)
+            return
+
+        self._add_columns(record)
+        keys = list(record)
+        self._execute(
+            f"INSERT INTO {_quote(self.table)} "
+            f"(_image_id{''.join(', ' + _quote(key) for key in keys)}) "
+            f"VALUES (?{', ?' * len(keys)})",
+            [image_id, *(_encode(record[key]) for key in keys)],
+        )
+        if "coordinates" in record:
+            self._set_bounds(image_id, record["coordinates"])
+
+    def __delitem__(self, image_id: str) -> None:
+        row = self._row(image_id)
+        if row is None:
+            raise KeyError(image_id)
+        self._drop_live(image_id)
+        self._execute(f"DELETE FROM {_quote(self.table)} WHERE _row = ?", [row])
+        self._execute(f"DELETE FROM {_quote(self._bounds_table)} WHERE _row = ?", [row])
+
+    def __iter__(self) -> Iterator[str]:
+        # read IDs a page at a time so records can be changed while iterating
+        last_row = -1
+        while True:
+            rows = self._connection.execute(
+                f"SELECT _row, _image_id FROM {_quote(self.table)} "
+                "WHERE _row > ? ORDER BY _row LIMIT ?",
+                [last_row, _PAGE_SIZE],
+            ).fetchall()
+            if not rows:
+                return
+            for _, image_id in rows:
+                yield image_id
+            last_row = rows[-1][0]
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            f"SELECT COUNT(*) FROM {_quote(self.table)}"
+        ).fetchone()[0]
+
+    def __contains__(self, image_id: object) -> bool:
+        return isinstance(image_id, str) and self._row(image_id) is not None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.db_path!r}, table={self.table!r}, {len(self)} records)"
+
+    def clear(self) -> None:
+        self._live.clear()
+        self._execute(f"DELETE FROM {_quote(self.table)}")
+        self._execute(f"DELETE FROM {_quote(self._bounds_table)}")
+        self.flush()
+
+    def find(self, key: str, value: Any) -> list[str]:
+        """Get the IDs of the records whose ``key`` is equal to ``value``.
+
+        Parameters
+        ----------
+        key : str
+            The key to look up (e.g. ``"parent_id"`` or ``"label"``, which are indexed).
+        value : Any
+            The value to look for.
+
+        Returns
+        -------
+        list of str
+            IDs of the matching records, in the order they were added.
+        """
+        if key not in self._columns:
+            return []
+        self._write_back()
+        encoded = _encode(value)
+        return [
+            image_id
+            for (image_id,) in self._connection.execute(
+                f"SELECT _image_id FROM {_quote(self.table)} "
+                f"WHERE {_quote(key)} = ? ORDER BY _row",
+                [encoded],
+            )
+        ]
+
+    def query_bounds(self, bounds: tuple[float, float, float, float]) -> list[str]:
+        """Get the IDs of the records whose ``coordinates`` intersect a bounding box.
+
+        Parameters
+        ----------
+        bounds : tuple
+            Bounding box to query, as ``(min_x, min_y, max_x, max_y)`` in the same CRS as the ``coordinates`` of the records.
+
+        Returns
+        -------
+        list of str
+            IDs of the matching records, in the order they were added.
+        """
+        min_x, min_y, max_x, max_y = bounds
+        # the R*Tree stores bounds as 32-bit floats (rounded outwards) so candidates are checked against the exact coordinates
+        rows = self._connection.execute(
+            f"SELECT t._image_id, t.coordinates FROM {_quote(self._bounds_table)} b "
+            f"JOIN {_quote(self.table)} t ON t._row = b._row "
+            "WHERE b.max_x >= ? AND b.min_x <= ? AND b.max_y >= ? AND b.min_y <= ? "
+            "ORDER BY t._row",
+            [min_x, max_x, min_y, max_y],
+        )
+        image_ids = []
+        for image_id, coordinates in rows:
+            c_min_x, c_max_x, c_min_y, c_max_y = _bounds(_decode(coordinates))
+            if (
+                c_max_x >= min_x
+                and c_min_x <= max_x
+                and c_max_y >= min_y
+                and c_min_y <= max_y
+            ):
+                image_ids.append(image_id)
+        return image_ids
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the store to a pandas DataFrame, with one column per key.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by image ID. Missing values are filled with ``NaN``.
+        """
+        self.flush()
+        rows = self._connection.execute(
+            f"SELECT _image_id{''.join(', ' + _quote(key) for key in self._columns)} "
+            f"FROM {_quote(self.table)} ORDER BY _row"
+        ).fetchall()
+        index = pd.Index([row[0] for row in rows], dtype=object)
+
+        data = {}
+        for i, key in enumerate(self._columns, start=1):
+            values = np.empty(len(rows), dtype=object)
+            values[:] = [row[i] for row in rows]
+            present = values != None  # noqa: E711
+            if not present.any():
+                continue
+            is_blob = np.array([isinstance(value, bytes) for value in values])
+            for j in np.flatnonzero(is_blob):
+                values[j] = _decode(values[j])
+            values[~present] = np.nan
+            if not is_blob.any():
+                values = pd.Series(values).infer_objects().to_numpy()
+            data[key] = values
+        return pd.DataFrame(data, index=index)
+
+    def flush(self) -> None:
+        """Write any mutable values kept in memory back to the database and commit all changes."""
+        self._write_back()
+        self._connection.commit()
+        self._n_writes = 0
+
+    def close(self) -> None:
+        """Save all changes and close the database (removing it if it is a temporary file)."""
+        self._finalizer()
+
+    def _execute(self, sql: str, parameters: list | tuple = ()) -> sqlite3.Cursor:
+        cursor = self._connection.execute(sql, parameters)
+        self._n_writes += 1
+        if self._n_writes >= _COMMIT_SIZE:
+            self._connection.commit()
+            self._n_writes = 0
+        return cursor
+
+    def _row(self, image_id: str) -> int | None:
+        row = self._connection.execute(
+            f"SELECT _row FROM {_quote(self.table)} WHERE _image_id = ?", [image_id]
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _add_columns(self, record: Mapping) -> None:
+        for key in record:
+            if key in self._columns:
+                continue
+            if key in ["_row", "_image_id"]:
+                raise ValueError(f"[ERROR] ``{key}`` cannot be used as a key.")
+            self._connection.execute(
+                f"ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(key)}"
+            )
+            if key in _INDEXED_KEYS:
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'{self.table}_{key}')} "
+                    f"ON {_quote(self.table)} ({_quote(key)})"
+                )
+            self._columns.append(key)
+
+    def _get_value(self, image_id: str, key: str) -> Any:
+        live_value = self._live.get((image_id, key), _MISSING)
+        if live_value is not _MISSING:
+            return live_value
+        if key not in self._columns:
+            raise KeyError(key)
+        row = self._connection.execute(
+            f"SELECT {_quote(key)} FROM {_quote(self.table)} WHERE _image_id = ?",
+            [image_id],
+        ).fetchone()
+        if row is None or row[0] is None:
+            raise KeyError(key)
+        value = _decode(row[0])
+        if isinstance(value, (list, dict, set)):
+            if len(self._live) >= self._live_limit:
+                self._evict_live()
+            self._live[(image_id, key)] = value
+        return value
+
+    def _get_record(self, image_id: str) -> dict:
+        row = self._connection.execute(
+            f"SELECT * FROM {_quote(self.table)} WHERE _image_id = ?", [image_id]
+        ).fetchone()
+        if row is None:
+            raise KeyError(image_id)
+        record = {
+            key: _decode(value)
+            for key, value in zip(self._columns, row[2:])
+            if value is not None
+        }
+        for key in record:
+            if (image_id, key) in self._live:
+                record[key] = self._live[(image_id, key)]
+        return record
+
+    def _set_values(self, image_id: str, values: Mapping) -> None:
+        """Set values of a record, removing any keys whose value is ``_MISSING``."""
+        if not values:
+            return
+        self._add_columns(values)
+        encoded = []
+        for key, value in values.items():
+            self._live.pop((image_id, key), None)
+            encoded.append(None if value is _MISSING else _encode(value))
+        self._execute(
+            f"UPDATE {_quote(self.table)} SET "
+            f"{', '.join(_quote(key) + ' = ?' for key in values)} WHERE _image_id = ?",
+            [*encoded, image_id],
+        )
+        if "coordinates" in values:
+            self._set_bounds(image_id, values["coordinates"])
+
+    def _set_bounds(self, image_id: str, coordinates: Any) -> None:
+        row = self._row(image_id)
+        self._execute(f"DELETE FROM {_quote(self._bounds_table)} WHERE _row = ?", [row])
+        bounds = _bounds(coordinates)
+        if bounds is not None:
+            self._execute(
+                f"INSERT INTO {_quote(self._bounds_table)} VALUES (?, ?, ?, ?, ?)",
+                [row, *bounds],
+            )
+
+    def _drop_live(self, image_id: str) -> None:
+        for live_key in [k for k in self._live if k[0] == image_id]:
+            del self._live[live_key]
+
+    def _evict_live(self) -> None:
+        """Write back the mutable values kept in memory and remove those which are not referenced outside the store.
+
+        Values which are still referenced (e.g. a list of patches held by the caller) are kept so changes made to them later are not lost.
+        """
+        self._write_back()
+        for live_key in list(self._live):
+            # only referenced by ``self._live`` and the argument of ``getrefcount``
+            if sys.getrefcount(self._live[live_key]) <= 2:
+                del self._live[live_key]
+        # avoid writing back on every read if many values are still referenced
+        self._live_limit = max(_LIVE_SIZE, 2 * len(self._live))
+
+    def _write_back(self) -> None:
+        if self._live:
+            _write_back(self._connection, self.table, self._live)
+            self._n_writes = 0
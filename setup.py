@@ -57,6 +57,7 @@ setuptools.setup(
         "openpyxl>=3.1.2,<4.0.0",
         "geopandas<1.0.0",
         "pyogrio>=0.7.2",
+        "pyarrow>=14.0.0",
         "cartopy>=0.22.0",
         "joblib>=1.4.0",
         "opencv-python<5.0.0.0",
@@ -135,6 +135,23 @@ def test_patch_dataset_init_annots(annots):
     assert patch_dataset.unique_labels == ["no", "railspace"]
 
 
+def test_patch_dataset_shards(sample_dir, tmp_path):
+    my_maps = loader(f"{sample_dir}/cropped_74488689.png")
+    my_maps.patchify_all(patch_size=3, path_save=f"{tmp_path}/files/")
+    my_shard_maps = loader(f"{sample_dir}/cropped_74488689.png")
+    my_shard_maps.patchify_all(
+        patch_size=3, path_save=f"{tmp_path}/shards/", container="tar"
+    )
+    _, patch_df = my_maps.convert_images()
+    _, shard_patch_df = my_shard_maps.convert_images()
+    patch_dataset = PatchDataset(patch_df=patch_df, transform="test")
+    shard_patch_dataset = PatchDataset(patch_df=shard_patch_df, transform="test")
+    assert len(shard_patch_dataset) == 9
+    for idx in range(len(patch_dataset)):
+        assert (shard_patch_dataset[idx][0][0] == patch_dataset[idx][0][0]).all()
+    assert isinstance(shard_patch_dataset.return_orig_image(0), Image.Image)
+
+
 def test_create_dataloaders(load_patch_df):
     patch_df, tmp_path = load_patch_df
     patch_dataset = PatchDataset(
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
+from geopy.distance import geodesic, great_circle
 from pytest import approx
 
 from mapreader.load import geo_utils, loader
@@ -58,3 +59,25 @@ def test_versus_loader(sample_dir):
         method="great-circle",
     )
     assert loader_size_in_m == approx(size_in_m)
+
+
+@pytest.mark.parametrize(
+    "method,distance",
+    [("great-circle", great_circle), ("gc", great_circle), ("geodesic", geodesic)],
+)
+def test_calc_edge_lengths(method, distance):
+    coordinates = [(-0.1, 51.5, 0.2, 51.7), (-3.2, 55.9, -3.1, 56.0)]
+    lengths = geo_utils.calc_edge_lengths(coordinates, method)
+    assert lengths.shape == (2, 4)
+    for (xmin, ymin, xmax, ymax), (left, bottom, right, top) in zip(
+        coordinates, lengths
+    ):
+        assert left == approx(distance((ymax, xmin), (ymin, xmin)).meters)
+        assert bottom == approx(distance((ymin, xmin), (ymin, xmax)).meters)
+        assert right == approx(distance((ymin, xmax), (ymax, xmax)).meters)
+        assert top == approx(distance((ymax, xmax), (ymax, xmin)).meters)
+
+
+def test_calc_edge_lengths_errors():
+    with pytest.raises(NotImplementedError, match="Method must be one of"):
+        geo_utils.calc_edge_lengths([(0, 0, 1, 1)], method="fake")
@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import os
 import pathlib
+import shutil
+from collections.abc import Iterator
 from random import randint
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
+import rasterio
 from PIL import Image
 from pytest import approx
-from shapely.geometry import Polygon
+from rasterio.plot import reshape_as_raster
+from shapely.geometry import Polygon, box
 
 from mapreader.load.images import MapImages
+from mapreader.utils.image_store import ColumnarImageStore
 from mapreader.utils.load_frames import load_from_csv, load_from_geojson
+from mapreader.utils.sqlite_store import SQLiteImageStore
 
 
 @pytest.fixture
@@ -205,6 +212,82 @@ def test_init_non_image_error(sample_dir):
         MapImages(f"{sample_dir}/{file_name}")
 
 
+def test_init_columnar(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    columnar_maps = MapImages(f"{sample_dir}/{image_id}", storage="columnar")
+    columnar_maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    columnar_maps.patchify_all(patch_size=3, path_save=tmp_path)
+    assert isinstance(columnar_maps.patches, ColumnarImageStore)
+    assert columnar_maps.images["patch"] is columnar_maps.patches
+    assert columnar_maps.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        assert columnar_maps.patches[patch_id] == maps.patches[patch_id]
+    parent_df, patch_df = maps.convert_images()
+    columnar_parent_df, columnar_patch_df = columnar_maps.convert_images()
+    assert columnar_parent_df.equals(parent_df)
+    assert columnar_patch_df.equals(patch_df)
+
+
+def test_init_sqlite(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    catalog = f"{tmp_path}/catalog"
+    sqlite_maps = MapImages(
+        f"{sample_dir}/{image_id}", storage="sqlite", catalog=catalog
+    )
+    sqlite_maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    sqlite_maps.patchify_all(patch_size=3, path_save=tmp_path)
+    assert isinstance(sqlite_maps.patches, SQLiteImageStore)
+    assert sqlite_maps.images["patch"] is sqlite_maps.patches
+    assert sqlite_maps.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        assert sqlite_maps.patches[patch_id] == maps.patches[patch_id]
+    assert sqlite_maps.parents[image_id] == maps.parents[image_id]
+    parent_df, patch_df = maps.convert_images()
+    sqlite_parent_df, sqlite_patch_df = sqlite_maps.convert_images()
+    assert sqlite_parent_df.equals(parent_df)
+    assert sqlite_patch_df.equals(patch_df)
+
+    # reopen the catalog
+    reopened_maps = MapImages(storage="sqlite", catalog=catalog)
+    assert reopened_maps.list_patches() == maps.list_patches()
+    assert reopened_maps.parents[image_id] == maps.parents[image_id]
+
+
+def test_init_storage_error(sample_dir, image_id):
+    with pytest.raises(ValueError, match="``storage`` must be one of"):
+        MapImages(f"{sample_dir}/{image_id}", storage="fake")
+
+
+def test_init_header_cache(sample_dir, tmp_path, monkeypatch):
+    image_id = "cropped_geo.tif"
+    shutil.copy(f"{sample_dir}/{image_id}", tmp_path)
+    header_cache = f"{tmp_path}/headers.sqlite"
+    maps = MapImages(f"{tmp_path}/{image_id}", header_cache=header_cache)
+    assert os.path.isfile(header_cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Image file was opened.")
+
+    with monkeypatch.context() as m:
+        m.setattr(MapImages, "_read_image_header", staticmethod(fail))
+        m.setattr(MapImages, "_read_geo_header", staticmethod(fail))
+        cached_maps = MapImages(f"{tmp_path}/{image_id}", header_cache=header_cache)
+        cached_maps.add_geo_info()
+    assert cached_maps.parents == maps.parents
+    assert cached_maps.georeferenced
+
+    # changed files are read again
+    Image.open(f"{sample_dir}/{image_id}").crop((0, 0, 5, 5)).save(
+        f"{tmp_path}/{image_id}"
+    )
+    maps = MapImages(f"{tmp_path}/{image_id}", header_cache=header_cache)
+    assert maps.parents[image_id]["shape"] == (5, 5, 3)
+
+
 def test_init_fake_tree_level_error(sample_dir, image_id):
     with pytest.raises(ValueError, match="parent or patch"):
         MapImages(f"{sample_dir}/{image_id}", tree_level="fake")
@@ -427,6 +510,33 @@ def test_add_metadata_patch(sample_dir, image_id, init_dataframes, tmp_path):
     assert maps.georeferenced
 
 
+def test_add_metadata_patch_literals(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    patch_list = maps.list_patches()
+    metadata_df = pd.DataFrame(
+        {
+            "image_id": patch_list[::-1],  # different order to images
+            "label": ["railspace"] * 9,
+            "conf": [0.5] * 9,
+            "bounds": ["(1, 2, 3, 4)"] * 9,
+            "labels": ["['a', 'b']"] * 9,
+            "crs": ["EPSG:4326"] * 9,
+        }
+    )
+    maps.add_metadata(metadata_df, tree_level="patch")
+    for patch_id in patch_list:
+        assert maps.patches[patch_id]["image_id"] == patch_id
+        assert maps.patches[patch_id]["label"] == "railspace"
+        assert maps.patches[patch_id]["conf"] == 0.5
+        assert maps.patches[patch_id]["bounds"] == (1, 2, 3, 4)
+        assert maps.patches[patch_id]["labels"] == ["a", "b"]
+        assert maps.patches[patch_id]["crs"] == "EPSG:4326"
+    # lists should not be shared between patches
+    maps.patches[patch_list[0]]["labels"].append("c")
+    assert maps.patches[patch_list[1]]["labels"] == ["a", "b"]
+
+
 def test_add_metadata_polygons(sample_dir, image_id, ts_metadata_keys):
     maps = MapImages(f"{sample_dir}/{image_id}")
     gdf = load_from_geojson(f"{sample_dir}/ts_downloaded_maps.geojson")
@@ -501,6 +611,50 @@ def test_loader_add_geo_info(sample_dir):
     assert not tiff.georeferenced
 
 
+def test_add_geo_info_num_workers(sample_dir, tmp_path):
+    for i in range(3):
+        shutil.copy(f"{sample_dir}/cropped_geo.tif", f"{tmp_path}/geo_{i}.tif")
+    shutil.copy(f"{sample_dir}/cropped_non_geo.tif", tmp_path)
+    maps = MapImages(f"{tmp_path}/*.tif")
+    expected = {
+        parent_id: maps.parents[parent_id].get("coordinates")
+        for parent_id in maps.list_parents()
+    }
+    for parent_id in maps.list_parents():
+        maps.parents[parent_id].pop("coordinates", None)
+
+    MapImages._get_transformer.cache_clear()
+    maps.add_geo_info(target_crs="EPSG:3857", num_workers=2)
+    maps.add_geo_info(num_workers=2)
+    for parent_id, coordinates in expected.items():
+        assert maps.parents[parent_id].get("coordinates") == coordinates
+    # one transformer per pair of CRSs
+    assert MapImages._get_transformer.cache_info().misses == 2
+
+
+def test_add_geo_info_float32(sample_dir, image_id, tmp_path):
+    # single-band float32 geotiffs (e.g. DEMs) cannot be opened as PIL images
+    dem_path = f"{tmp_path}/dem.tif"
+    with rasterio.open(
+        dem_path,
+        "w",
+        driver="GTiff",
+        height=10,
+        width=10,
+        count=1,
+        dtype="float32",
+        crs="EPSG:4326",
+        transform=rasterio.transform.from_bounds(0, 0, 10, 10, 10, 10),
+    ) as dst:
+        dst.write(np.random.rand(1, 10, 10).astype("float32"))
+
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.parents[image_id]["image_path"] = dem_path
+    maps.add_geo_info(num_workers=2)
+    assert maps.parents[image_id]["coordinates"] == approx((0.0, 0.0, 10.0, 10.0))
+    assert maps.parents[image_id]["crs"] == "EPSG:4326"
+
+
 # --- test patchify ---
 
 
@@ -532,6 +686,28 @@ def test_patchify_meters(sample_dir, image_id, tmp_path):
     maps.patchify_all(patch_size=10000, method="meters", path_save=f"{tmp_path}_meters")
     assert os.path.isfile(f"{tmp_path}_meters/patch-0-0-2-2-#{image_id}#.png")
     assert len(maps.list_patches()) == 25
+    # pixel sizes are stored in the parents
+    _, pixel_height, pixel_width = maps._calc_pixel_height_width(image_id)
+    assert maps.parents[image_id]["pixel_height"] == approx(pixel_height)
+    assert maps.parents[image_id]["pixel_width"] == approx(pixel_width)
+
+    # pixel sizes are recalculated if the coordinates change
+    min_x, min_y, max_x, max_y = maps.parents[image_id]["coordinates"]
+    maps.parents[image_id]["coordinates"] = (
+        min_x,
+        min_y,
+        (min_x + max_x) / 2,
+        (min_y + max_y) / 2,
+    )
+    maps.patchify_all(
+        patch_size=10000,
+        method="meters",
+        path_save=tmp_path / "smaller",
+        add_to_parents=False,
+    )
+    _, pixel_height, _ = maps._calc_pixel_height_width(image_id)
+    assert maps.parents[image_id]["pixel_height"] == approx(pixel_height)
+    assert os.path.isfile(f"{tmp_path}/smaller/patch-0-0-5-5-#{image_id}#.png")
 
 
 def test_patchify_grayscale(sample_dir, tmp_path):
@@ -565,6 +741,252 @@ def test_patchify_pixels_overlap(sample_dir, image_id, tmp_path):
     assert os.path.isfile(f"{tmp_path}/patch-8-8-9-9-#{image_id}#.png")
 
 
+def test_patchify_does_not_reopen_patches(sample_dir, image_id, tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Patch file was reopened.")
+
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    monkeypatch.setattr(MapImages, "_check_image_mode", staticmethod(fail))
+    monkeypatch.setattr(MapImages, "_add_shape_id", fail)
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    maps.patchify_all(patch_size=3, path_save=tmp_path)  # patches already exist
+    assert len(maps.list_patches()) == 9
+    for patch_id in maps.list_patches():
+        assert maps.patches[patch_id]["shape"] == (3, 3, 4)
+        assert maps.patches[patch_id]["parent_id"] == image_id
+
+
+def test_patchify_manifest(sample_dir, image_id, tmp_path, monkeypatch):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    manifest_path = f"{tmp_path}/.manifests/#{image_id}#.json"
+    assert os.path.isfile(manifest_path)
+    # the manifest directory is not loaded as a patch
+    maps_loaded = MapImages()
+    maps_loaded.load_patches(f"{tmp_path}/*")
+    assert sorted(maps_loaded.list_patches()) == sorted(maps.list_patches())
+    patches = {patch_id: dict(maps.patches[patch_id]) for patch_id in maps.patches}
+
+    # patches of parents with a manifest are not created again
+    def fail(*args, **kwargs):
+        raise AssertionError("Patches were created again.")
+
+    with monkeypatch.context() as m:
+        m.setattr(MapImages, "_patchify_image_by_method", staticmethod(fail))
+        maps_resumed = MapImages(f"{sample_dir}/{image_id}")
+        maps_resumed.patchify_all(patch_size=3, path_save=tmp_path)
+    assert {
+        patch_id: dict(maps_resumed.patches[patch_id])
+        for patch_id in maps_resumed.patches
+    } == patches
+
+    # deleted and changed patch files are created again
+    patch_paths = [maps.patches[patch_id]["image_path"] for patch_id in patches]
+    file_size = os.path.getsize(patch_paths[1])
+    os.remove(patch_paths[0])
+    with open(patch_paths[1], "ab") as f:
+        f.write(b"0")
+    maps_resumed = MapImages(f"{sample_dir}/{image_id}")
+    maps_resumed.patchify_all(patch_size=3, path_save=tmp_path)
+    assert Image.open(patch_paths[0]).size == (3, 3)
+    assert os.path.getsize(patch_paths[1]) == file_size
+
+    # simulate an interrupted run (no manifest, incomplete patch file)
+    os.remove(manifest_path)
+    patch_path = maps.patches[maps.list_patches()[0]]["image_path"]
+    with open(patch_path, "wb") as f:
+        f.write(b"")
+    maps_rerun = MapImages(f"{sample_dir}/{image_id}")
+    maps_rerun.patchify_all(patch_size=3, path_save=tmp_path)
+    assert os.path.isfile(manifest_path)
+    assert Image.open(patch_path).size == (3, 3)
+
+    # different parameters
+    maps_rerun.patchify_all(patch_size=5, path_save=tmp_path, add_to_parents=False)
+    assert os.path.isfile(f"{tmp_path}/patch-0-0-5-5-#{image_id}#.png")
+
+
+def test_patchify_windowed(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=tmp_path / "full", overlap=0.5)
+    maps_windowed = MapImages(f"{sample_dir}/{image_id}")
+    maps_windowed.patchify_all(
+        patch_size=4, path_save=tmp_path, overlap=0.5, windowed=True
+    )
+    assert maps_windowed.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        patch = Image.open(maps.patches[patch_id]["image_path"])
+        patch_windowed = Image.open(maps_windowed.patches[patch_id]["image_path"])
+        assert patch_windowed.mode == patch.mode
+        assert list(patch_windowed.getdata()) == list(patch.getdata())
+
+
+def test_patchify_windowed_square_cuts_error(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    with pytest.raises(ValueError, match="cannot be used with"):
+        maps.patchify_all(
+            patch_size=3, path_save=tmp_path, square_cuts=True, windowed=True
+        )
+
+
+def test_patchify_virtual(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=tmp_path / "files")
+    maps_virtual = MapImages(f"{sample_dir}/{image_id}")
+    virtual_dir = tmp_path / "virtual"
+    maps_virtual.patchify_all(patch_size=4, path_save=virtual_dir, materialize=False)
+    assert not os.path.exists(virtual_dir) or not os.listdir(virtual_dir)
+    assert maps_virtual.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        assert not os.path.exists(virtual_dir / patch_id)
+        assert maps_virtual.patches[patch_id]["image_path"] is None
+        assert maps_virtual.patches[patch_id]["shape"] == (4, 4, 4)
+        assert (
+            maps_virtual.get_patch_array(patch_id) == maps.get_patch_array(patch_id)
+        ).all()
+
+    maps.calc_pixel_stats()
+    maps_virtual.calc_pixel_stats()
+    patch_id = maps.list_patches()[-1]  # edge patch
+    assert maps_virtual.patches[patch_id]["mean_pixel_R"] == approx(
+        maps.patches[patch_id]["mean_pixel_R"]
+    )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_patchify_parent_cache(sample_dir, image_id, tmp_path, num_workers):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=f"{tmp_path}/files", compute_stats=True)
+    parent_cache = f"{tmp_path}/cache"
+    cached_maps = MapImages(f"{sample_dir}/{image_id}", parent_cache=parent_cache)
+    cached_maps.patchify_all(
+        patch_size=4,
+        path_save=f"{tmp_path}/cached_files",
+        compute_stats=True,
+        num_workers=num_workers,
+    )
+    assert len(os.listdir(parent_cache)) == 1
+    for patch_id in maps.list_patches():
+        assert (
+            cached_maps.get_patch_array(patch_id) == maps.get_patch_array(patch_id)
+        ).all()
+        assert cached_maps.patches[patch_id]["mean_pixel_R"] == approx(
+            maps.patches[patch_id]["mean_pixel_R"]
+        )
+
+    # virtual patches and iter_patches are read from the cache
+    cached_maps = MapImages(f"{sample_dir}/{image_id}", parent_cache=parent_cache)
+    cached_maps.patchify_all(patch_size=4, materialize=False)
+    for patch_id in maps.list_patches():
+        assert (
+            cached_maps.get_patch_array(patch_id) == maps.get_patch_array(patch_id)
+        ).all()
+    for patch_id, patch_array, _, _ in cached_maps.iter_patches(patch_size=4):
+        assert (patch_array == maps.get_patch_array(patch_id)).all()
+    assert len(os.listdir(parent_cache)) == 1
+
+
+@pytest.mark.parametrize("windowed", [False, True])
+def test_iter_patches(sample_dir, image_id, tmp_path, windowed):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=tmp_path, overlap=0.5)
+    patches = list(maps.iter_patches(patch_size=4, overlap=0.5, windowed=windowed))
+    assert sorted(patch[0] for patch in patches) == sorted(maps.list_patches())
+    for patch_id, patch_array, pixel_bounds, coordinates in patches:
+        assert pixel_bounds == maps.patches[patch_id]["pixel_bounds"]
+        assert (patch_array == maps.get_patch_array(patch_id)).all()
+        assert coordinates is None
+
+
+def test_iter_patches_coords(sample_dir):
+    maps = MapImages(f"{sample_dir}/cropped_geo.tif")
+    maps.add_geo_info()
+    maps.patchify_all(patch_size=3, materialize=False)
+    maps.add_patch_coords()
+    patches = maps.iter_patches(patch_size=3)
+    assert isinstance(patches, Iterator)
+    for patch_id, _, _, coordinates in patches:
+        assert coordinates == approx(maps.patches[patch_id]["coordinates"])
+
+
+def test_patchify_virtual_resize_error(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    with pytest.raises(ValueError, match="cannot be used with"):
+        maps.patchify_all(
+            patch_size=3, path_save=tmp_path, resize_factor=2, materialize=False
+        )
+
+
+def test_patchify_tar(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=tmp_path / "files")
+    tar_dir = tmp_path / "tar"
+    maps_tar = MapImages(f"{sample_dir}/{image_id}")
+    maps_tar.patchify_all(patch_size=4, path_save=tar_dir, container="tar")
+    shard_path = f"{tar_dir}/patches-#{image_id}#.tar"
+    assert sorted(os.listdir(tar_dir)) == [
+        f"patches-#{image_id}#.tar",
+        f"patches-#{image_id}#.tar.index.json",
+    ]
+    assert maps_tar.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        assert maps_tar.patches[patch_id]["shard_path"] == shard_path
+        assert maps_tar.patches[patch_id]["shape"] == (4, 4, 4)
+        assert (
+            maps_tar.get_patch_array(patch_id) == maps.get_patch_array(patch_id)
+        ).all()
+
+    # shard already exists
+    maps_tar.patchify_all(patch_size=4, path_save=tar_dir, container="tar")
+    assert len(maps_tar.list_patches()) == 9
+
+    maps_loaded = MapImages()
+    maps_loaded.load_patches(tar_dir, patch_file_ext="tar")
+    assert maps_loaded.list_patches() == maps.list_patches()
+    assert maps_loaded.list_parents() == [image_id]
+    assert maps_loaded.patches == maps_tar.patches
+
+
+def test_patchify_tar_errors(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    with pytest.raises(ValueError, match="``container`` must be one of"):
+        maps.patchify_all(patch_size=3, path_save=tmp_path, container="zip")
+    with pytest.raises(ValueError, match="No patch shards found"):
+        maps.load_patches(tmp_path, patch_file_ext="tar")
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"overlap": 0.3}, {"windowed": True}, {"square_cuts": True}]
+)
+def test_patchify_compute_stats(sample_dir, image_id, tmp_path, kwargs):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=4, path_save=tmp_path / "calc", **kwargs)
+    maps.calc_pixel_stats()
+    maps_stats = MapImages(f"{sample_dir}/{image_id}")
+    maps_stats.patchify_all(
+        patch_size=4, path_save=tmp_path, compute_stats=True, **kwargs
+    )
+    for patch_id in maps.list_patches():
+        for band in ["", "_R", "_G", "_B", "_A"]:
+            for stat in ["mean_pixel", "std_pixel"]:
+                assert maps_stats.patches[patch_id][f"{stat}{band}"] == approx(
+                    maps.patches[patch_id][f"{stat}{band}"]
+                )
+
+
+def test_patchify_num_workers(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=3, path_save=tmp_path / "serial")
+    maps_parallel = MapImages(f"{sample_dir}/{image_id}")
+    maps_parallel.patchify_all(patch_size=3, path_save=tmp_path, num_workers=2)
+    assert len(maps_parallel.list_patches()) == 9
+    assert maps_parallel.list_patches() == maps.list_patches()
+    assert (
+        maps_parallel.parents[image_id]["patches"] == maps.parents[image_id]["patches"]
+    )
+    assert os.path.isfile(f"{tmp_path}/patch-0-0-3-3-#{image_id}#.png")
+
+
 # --- test other functions ---
 
 
@@ -592,6 +1014,25 @@ def test_load_patches(init_maps, sample_dir, tmp_path):
     assert not maps.georeferenced
 
 
+def test_add_patch_to_parent(init_maps, image_id):
+    maps, _, patch_list = init_maps
+    assert maps.parents[image_id]["patches"] == patch_list
+    for patch_id in patch_list:
+        maps._add_patch_to_parent(patch_id)  # already added, should not duplicate
+    assert maps.parents[image_id]["patches"] == patch_list
+
+    # replace list (e.g. as in ``load_df``)
+    maps.parents[image_id]["patches"] = patch_list[:3]
+    maps._add_patch_to_parent(patch_list[1])
+    maps._add_patch_to_parent(patch_list[5])
+    assert maps.parents[image_id]["patches"] == patch_list[:3] + [patch_list[5]]
+
+    # change list in place
+    maps.parents[image_id]["patches"].remove(patch_list[5])
+    maps._add_patch_to_parent(patch_list[5])
+    assert maps.parents[image_id]["patches"] == patch_list[:3] + [patch_list[5]]
+
+
 def test_load_parents(init_maps, image_id, sample_dir):
     maps, _, _ = init_maps
 
@@ -703,6 +1144,116 @@ def test_add_patch_polygons(init_maps):
     assert isinstance(maps.patches[patch_list[0]]["geometry"], Polygon)
 
 
+def test_add_patch_coords_and_polygons_vectorized(init_maps):
+    maps, _, patch_list = init_maps
+    expected = {
+        patch_id: (
+            maps.patches[patch_id]["coordinates"],
+            maps.patches[patch_id]["geometry"],
+        )
+        for patch_id in patch_list
+    }
+    for patch_id in patch_list:
+        maps.patches[patch_id].pop("coordinates")
+        maps.patches[patch_id].pop("geometry")
+        maps._add_patch_coords_id(patch_id)
+        maps._add_patch_polygons_id(patch_id)
+        assert maps.patches[patch_id]["coordinates"] == expected[patch_id][0]
+        assert maps.patches[patch_id]["geometry"].equals(expected[patch_id][1])
+
+
+@pytest.mark.parametrize("storage", ["dict", "sqlite"])
+def test_query_patches(sample_dir, image_id, tmp_path, storage):
+    maps = MapImages(f"{sample_dir}/{image_id}", storage=storage)
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    patch_list = maps.list_patches()
+    geometries = gpd.GeoSeries(
+        [box(*maps.patches[patch_id]["coordinates"]) for patch_id in patch_list]
+    )
+
+    min_x, min_y, max_x, max_y = maps.patches[patch_list[4]]["coordinates"]
+    region = box(min_x + 1e-6, min_y + 1e-6, max_x - 1e-6, max_y - 1e-6)
+    assert maps.query_patches(region) == [patch_list[4]]
+    assert maps.query_patches(region.bounds) == [patch_list[4]]
+    assert maps.query_patches(((min_x + max_x) / 2, (min_y + max_y) / 2)) == [
+        patch_list[4]
+    ]
+    expected = [
+        patch_id
+        for patch_id, geometry in zip(patch_list, geometries)
+        if geometry.intersects(box(min_x, min_y, max_x, max_y))
+    ]
+    assert maps.query_patches((min_x, min_y, max_x, max_y)) == expected
+    assert len(expected) == 9  # touching patches are included
+    parent_region = box(*geometries.total_bounds).buffer(1e-6)
+    assert maps.query_patches(parent_region, predicate="contains") == patch_list
+    assert maps.query_patches((0, 0, 1, 1)) == []
+
+    # the index is rebuilt when coordinates are changed
+    maps.add_metadata(
+        pd.DataFrame(
+            {"image_id": [patch_list[0]], "coordinates": [(0.0, 0.0, 1.0, 1.0)]}
+        ),
+        tree_level="patch",
+        ignore_mismatch=True,
+    )
+    assert maps.query_patches((0, 0, 1, 1)) == [patch_list[0]]
+
+
+def test_query_patches_errors(init_maps):
+    maps, _, _ = init_maps
+    with pytest.raises(ValueError, match="``predicate`` must be one of"):
+        maps.query_patches((0, 0, 1, 1), predicate="fake")
+    with pytest.raises(ValueError, match="``region`` must be"):
+        maps.query_patches((0, 0, 1))
+
+
+def test_neighbors(init_maps):
+    maps, _, patch_list = init_maps
+    cells = {
+        patch_id: (
+            maps.patches[patch_id]["pixel_bounds"][1] // 3,
+            maps.patches[patch_id]["pixel_bounds"][0] // 3,
+        )
+        for patch_id in patch_list
+    }
+    patch_ids = {cell: patch_id for patch_id, cell in cells.items()}
+    center_id = patch_ids[(1, 1)]
+    assert maps.neighbors(center_id) == [
+        patch_ids[(row, col)]
+        for row in range(3)
+        for col in range(3)
+        if (row, col) != (1, 1)
+    ]
+    assert sorted(maps.neighbors(patch_ids[(0, 0)])) == sorted(
+        [patch_ids[(0, 1)], patch_ids[(1, 0)], center_id]
+    )
+    assert len(maps.neighbors(patch_ids[(0, 0)], radius=2)) == 8
+    assert maps.neighbors(center_id, radius=0) == []
+
+
+def test_neighbors_errors(init_maps):
+    maps, _, patch_list = init_maps
+    with pytest.raises(ValueError, match="not found in patches"):
+        maps.neighbors("fake_patch")
+    maps.patches[patch_list[0]].pop("pixel_bounds")
+    with pytest.raises(ValueError, match="No pixel bounds found"):
+        maps.neighbors(patch_list[0])
+
+
+def test_grid_positions():
+    assert MapImages._grid_positions(np.array([6, 0, 3, 3])).tolist() == [2, 0, 1, 1]
+    assert MapImages._grid_positions(np.array([0, 3, 6, 7])).tolist() == [0, 1, 2, 3]
+    assert MapImages._grid_positions(np.array([0, 3, 9, 12])).tolist() == [
+        0,
+        1,
+        3,
+        4,
+    ]
+    assert MapImages._grid_positions(np.array([5, 5])).tolist() == [0, 0]
+
+
 def test_add_parent_polygons(init_maps):
     maps, parent_list, _ = init_maps
     for parent in parent_list:
@@ -760,6 +1311,96 @@ def test_save_patches_as_geotiffs_grayscale(sample_dir, tmp_path):
     assert os.path.isfile(maps.patches[patch_id]["geotiff_path"])
 
 
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_save_patches_as_geotiffs_from_parent(init_maps, num_workers):
+    maps, _, _ = init_maps
+    maps.save_patches_as_geotiffs()
+    expected = {}
+    for patch_id in maps.list_patches():
+        with rasterio.open(maps.patches[patch_id]["geotiff_path"]) as src:
+            expected[patch_id] = (src.read(), src.transform)
+
+    maps.save_patches_as_geotiffs(
+        rewrite=True,
+        num_workers=num_workers,
+        from_parent=True,
+        tiled=True,
+        compress="deflate",
+    )
+    for patch_id, (array, transform) in expected.items():
+        with rasterio.open(maps.patches[patch_id]["geotiff_path"]) as src:
+            assert (src.read() == array).all()
+            assert tuple(src.transform) == approx(tuple(transform))
+            assert src.profile["tiled"]
+            assert src.profile["compress"] == "deflate"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"patch_size": 3, "resize_factor": 2},
+        {"patch_size": 10, "square_cuts": True},  # negative pixel bounds
+    ],
+    ids=["resized", "square_cuts"],
+)
+def test_save_patches_as_geotiffs_from_parent_resized_padded(
+    sample_dir, image_id, tmp_path, kwargs
+):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.patchify_all(path_save=tmp_path, **kwargs)
+    maps.save_patches_as_geotiffs()
+    expected = {}
+    for patch_id in maps.list_patches():
+        with rasterio.open(maps.patches[patch_id]["geotiff_path"]) as src:
+            expected[patch_id] = (src.read(), src.transform)
+
+    maps.save_patches_as_geotiffs(rewrite=True, from_parent=True)
+    for patch_id, (array, transform) in expected.items():
+        with rasterio.open(maps.patches[patch_id]["geotiff_path"]) as src:
+            assert (src.read() == array).all()
+            assert tuple(src.transform) == approx(tuple(transform))
+
+
+def test_save_patches_as_geotiffs_from_parent_error(init_maps):
+    maps, _, _ = init_maps
+    parent_id = maps.list_parents()[0]
+    maps.parents[parent_id].pop("coordinates", None)
+    with pytest.raises(ValueError, match="Cannot locate coordinates"):
+        maps.save_patches_as_geotiffs(from_parent=True)
+
+
+@pytest.mark.parametrize("from_parent", [False, True])
+@pytest.mark.parametrize(
+    "kwargs", [{"materialize": False}, {"container": "tar"}], ids=["virtual", "tar"]
+)
+def test_save_patches_as_geotiffs_no_image_path(
+    init_maps, sample_dir, image_id, tmp_path, kwargs, from_parent
+):
+    maps, _, _ = init_maps
+    maps.save_patches_as_geotiffs()
+
+    maps_no_files = MapImages(f"{sample_dir}/{image_id}")
+    maps_no_files.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps_no_files.patchify_all(patch_size=3, path_save=tmp_path / "tar", **kwargs)
+    # virtual patches would otherwise be saved next to their parent
+    path_save = tmp_path / "geotiffs" if "materialize" in kwargs else None
+    maps_no_files.save_patches_as_geotiffs(from_parent=from_parent, path_save=path_save)
+
+    out_dir = path_save or tmp_path / "tar"
+    geotiffs = [fname for fname in os.listdir(out_dir) if fname.endswith(".tif")]
+    assert sorted(geotiffs) == sorted(
+        f"{os.path.splitext(patch_id)[0]}.tif" for patch_id in maps.list_patches()
+    )
+    for patch_id in maps.list_patches():
+        geotiff_path = maps_no_files.patches[patch_id]["geotiff_path"]
+        assert os.path.dirname(geotiff_path) == str(out_dir)
+        with rasterio.open(maps.patches[patch_id]["geotiff_path"]) as expected:
+            with rasterio.open(geotiff_path) as src:
+                assert (src.read() == expected.read()).all()
+                assert tuple(src.transform) == approx(tuple(expected.transform))
+
+
 def test_save_to_geojson(init_maps, tmp_path, capfd):
     maps, _, _ = init_maps
     maps.save_patches_to_geojson(geojson_fname=f"{tmp_path}/patches.geojson")
@@ -856,6 +1497,55 @@ def test_calc_pixel_stats(init_maps, sample_dir, tmp_path):
     assert all([col in geotiffs.patches[patch_list[0]].keys() for col in expected_cols])
 
 
+def test_calc_pixel_stats_existing(init_maps):
+    maps, _, patch_list = init_maps
+    # first patch already has a mean, others should still be calculated
+    maps.patches[patch_list[0]]["mean_pixel"] = 0.5
+    maps.calc_pixel_stats()
+    assert maps.patches[patch_list[0]]["mean_pixel"] == 0.5
+    assert "mean_pixel_R" not in maps.patches[patch_list[0]].keys()
+    assert "std_pixel_R" in maps.patches[patch_list[0]].keys()
+    for patch_id in patch_list[1:]:
+        assert "mean_pixel_R" in maps.patches[patch_id].keys()
+        assert "std_pixel_R" in maps.patches[patch_id].keys()
+
+
+def test_calc_pixel_stats_num_workers(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    maps.calc_pixel_stats()
+    maps_parallel = MapImages()
+    maps_parallel.load_patches(tmp_path, parent_paths=f"{sample_dir}/{image_id}")
+    maps_parallel.calc_pixel_stats(num_workers=2)
+    maps_virtual = MapImages(f"{sample_dir}/{image_id}")
+    maps_virtual.patchify_all(patch_size=3, materialize=False)
+    maps_virtual.calc_pixel_stats()
+    for patch_id in maps.list_patches():
+        for key in ["mean_pixel", "mean_pixel_R", "std_pixel", "std_pixel_A"]:
+            assert maps_parallel.patches[patch_id][key] == approx(
+                maps.patches[patch_id][key]
+            )
+            assert maps_virtual.patches[patch_id][key] == approx(
+                maps.patches[patch_id][key]
+            )
+
+
+def test_calc_pixel_stats_batches(sample_dir, image_id, tmp_path, monkeypatch):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.patchify_all(patch_size=3, path_save=tmp_path)
+    maps.calc_pixel_stats()
+    # calculate stats for a few patches at a time
+    monkeypatch.setattr("mapreader.load.images._PIXEL_STATS_BATCH_BYTES", 600)
+    maps_batched = MapImages()
+    maps_batched.load_patches(tmp_path, parent_paths=f"{sample_dir}/{image_id}")
+    maps_batched.calc_pixel_stats()
+    for patch_id in maps.list_patches():
+        for key in ["mean_pixel", "mean_pixel_R", "std_pixel", "std_pixel_A"]:
+            assert maps_batched.patches[patch_id][key] == approx(
+                maps.patches[patch_id][key]
+            )
+
+
 def test_loader_convert_images(init_maps):
     maps, _, _ = init_maps
     parent_df, patch_df = maps.convert_images()
@@ -911,6 +1601,29 @@ def test_save_parents_as_geotiffs_grayscale(sample_dir, tmp_path):
     assert os.path.isfile(maps.parents[image_id]["geotiff_path"])
 
 
+def test_save_parents_as_geotiffs_options(sample_dir, image_id, tmp_path):
+    shutil.copy(f"{sample_dir}/{image_id}", tmp_path)
+    maps = MapImages(f"{tmp_path}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.save_parents_as_geotiffs(tiled=True, compress="deflate", overviews=[2])
+    geotiff_path = maps.parents[image_id]["geotiff_path"]
+    expected = reshape_as_raster(Image.open(f"{sample_dir}/{image_id}"))
+    with rasterio.open(geotiff_path) as src:
+        assert (src.read() == expected).all()
+        assert src.profile["tiled"]
+        assert src.profile["compress"] == "deflate"
+        assert src.overviews(1) == [2]
+
+    # rewrite a geotiff from itself
+    geotiffs = MapImages(geotiff_path)
+    geotiff_id = os.path.basename(geotiff_path)
+    geotiffs.parents[geotiff_id]["coordinates"] = maps.parents[image_id]["coordinates"]
+    geotiffs.save_parents_as_geotiffs(rewrite=True)
+    with rasterio.open(geotiff_path) as src:
+        assert (src.read() == expected).all()
+        assert not src.profile["tiled"]
+
+
 def test_save_parents_as_geotiffs_error(sample_dir, image_id):
     maps = MapImages(f"{sample_dir}/{image_id}")
     assert "coordinates" not in maps.parents[image_id].keys()
@@ -918,6 +1631,16 @@ def test_save_parents_as_geotiffs_error(sample_dir, image_id):
         maps.save_parents_as_geotiffs(rewrite=True)
 
 
+def test_save_parents_as_geotiffs_write_error(sample_dir, image_id, tmp_path):
+    shutil.copy(f"{sample_dir}/{image_id}", tmp_path)
+    maps = MapImages(f"{tmp_path}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    with pytest.raises(ZeroDivisionError):
+        maps.save_parents_as_geotiffs(overviews=[0])
+    # the temporary file is removed
+    assert os.listdir(tmp_path) == [image_id]
+
+
 def test_show_sample_png(init_maps, monkeypatch):
     maps, parent_list, patch_list = init_maps
     monkeypatch.setattr("matplotlib.pyplot.show", lambda: None)
@@ -969,6 +1692,42 @@ def test_load_df(init_dataframes, image_id):
     maps.load_df(parent_df=parent_df, clear_images=True)
     assert len(maps.list_parents()) == 1
     assert len(maps.list_patches()) == 0
+    assert maps.images["parent"] is maps.parents
+    assert maps.images["patch"] is maps.patches
+
+
+def test_save_load(sample_dir, image_id, tmp_path):
+    maps = MapImages(f"{sample_dir}/{image_id}")
+    maps.add_metadata(f"{sample_dir}/ts_downloaded_maps.csv")
+    maps.patchify_all(patch_size=3, path_save=f"{tmp_path}/patches")
+    maps.save(f"{tmp_path}/saved")
+    assert os.path.isfile(f"{tmp_path}/saved/parent_df.parquet")
+    assert os.path.isfile(f"{tmp_path}/saved/patch_df.parquet")
+
+    loaded_maps = MapImages()
+    loaded_maps.load(f"{tmp_path}/saved")
+    assert loaded_maps.georeferenced
+    assert loaded_maps.list_parents() == maps.list_parents()
+    assert loaded_maps.list_patches() == maps.list_patches()
+    for patch_id in maps.list_patches():
+        patch = loaded_maps.patches[patch_id]
+        assert patch.keys() == maps.patches[patch_id].keys()
+        assert patch["pixel_bounds"] == maps.patches[patch_id]["pixel_bounds"]
+        assert patch["geometry"].equals(maps.patches[patch_id]["geometry"])
+    assert loaded_maps.parents[image_id]["patches"] == maps.parents[image_id]["patches"]
+
+    # grid positions of patches are reloaded
+    assert os.path.isfile(f"{tmp_path}/saved/patch_grid.parquet")
+    assert loaded_maps._patch_grid is not None
+    assert loaded_maps._get_patch_grid() == maps._get_patch_grid()
+    for patch_id in maps.list_patches():
+        assert loaded_maps.neighbors(patch_id) == maps.neighbors(patch_id)
+
+
+def test_load_error(tmp_path):
+    maps = MapImages()
+    with pytest.raises(FileNotFoundError, match="not found"):
+        maps.load(f"{tmp_path}/fake_dir")
 
 
 def test_load_csv(init_dataframes, image_id):
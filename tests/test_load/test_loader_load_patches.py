@@ -4,10 +4,12 @@ import os
 import pathlib
 from random import randint
 
+import PIL
 import pytest
 from PIL import Image
 
 from mapreader import load_patches
+from mapreader.load.images import MapImages
 
 
 @pytest.fixture
@@ -79,6 +81,32 @@ def test_w_parent_file_paths(dirs):
     assert len(my_files) == 6
 
 
+def test_num_workers(dirs):
+    _, patch_path = dirs
+    maps = load_patches(patch_path)
+    maps_threaded = load_patches(patch_path, num_workers=2)
+    assert maps_threaded.patches == maps.patches
+
+
+def test_no_validate(dirs, monkeypatch):
+    _, patch_path = dirs
+    maps = load_patches(patch_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Patch file was opened.")
+
+    monkeypatch.setattr(MapImages, "_read_image_header", staticmethod(fail))
+    maps_not_validated = load_patches(patch_path, validate=False)
+    assert maps_not_validated.patches == maps.patches
+
+
+def test_ignore_dirs(dirs):
+    _, patch_path = dirs
+    os.mkdir(f"{patch_path}/sub_dir.png")
+    maps = load_patches(patch_path)
+    assert len(maps.list_patches()) == 3
+
+
 # other test cases
 
 # errors
@@ -119,3 +147,15 @@ def test_empty_dir_errors(empty_dir):
         load_patches(empty_dir, patch_file_ext="png")
     with pytest.raises(ValueError, match="No files found"):
         load_patches(f"{empty_dir}/*")
+
+
+def test_not_image_file_errors(dirs):
+    _, patch_path = dirs
+    with open(f"{patch_path}/patch3-0-1-2-3-#file2.png#.png", "w") as f:
+        f.write("not an image")
+    with pytest.raises(PIL.UnidentifiedImageError, match="not an image file"):
+        load_patches(patch_path)
+    maps = load_patches(patch_path, validate=False)
+    assert len(maps.list_patches()) == 4
+    with pytest.raises(PIL.UnidentifiedImageError, match="not an image file"):
+        maps.check_image_files(num_workers=2)
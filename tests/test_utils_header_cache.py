@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import pickle
+
+from mapreader.utils.header_cache import ImageHeaderCache
+
+
+def test_header_cache(tmp_path):
+    image_path = f"{tmp_path}/image.png"
+    with open(image_path, "wb") as f:
+        f.write(b"image")
+    cache = ImageHeaderCache(f"{tmp_path}/headers.sqlite")
+    assert cache.read([image_path]) == {}
+
+    header = {"mode": "RGB", "shape": (5, 5, 3), "crs": None, "bounds": None}
+    cache.write({image_path: header})
+    assert cache.read([image_path, f"{tmp_path}/missing.png"]) == {image_path: header}
+
+    # relative paths are keyed by absolute path
+    rel_path = os.path.relpath(image_path)
+    assert cache.read([rel_path]) == {rel_path: header}
+
+    # cache persists and can be pickled
+    cache = pickle.loads(pickle.dumps(ImageHeaderCache(cache.db_path)))
+    assert cache.read([image_path]) == {image_path: header}
+
+
+def test_header_cache_changed_file(tmp_path):
+    image_path = f"{tmp_path}/image.png"
+    with open(image_path, "wb") as f:
+        f.write(b"image")
+    cache = ImageHeaderCache(f"{tmp_path}/headers.sqlite")
+    cache.write({image_path: {"shape": (5, 5, 3)}})
+
+    with open(image_path, "wb") as f:
+        f.write(b"changed image")
+    assert cache.read([image_path]) == {}
+
+    os.remove(image_path)
+    assert cache.read([image_path]) == {}
+    cache.write({image_path: {"shape": (5, 5, 3)}})  # missing files are not added
+    assert cache.read([image_path]) == {}
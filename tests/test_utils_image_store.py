@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from mapreader.utils.image_store import ColumnarImageStore
+
+
+@pytest.fixture
+def records():
+    return {
+        f"patch-{i}-0-{i + 1}-1-#parent.png#.png": {
+            "parent_id": "parent.png",
+            "image_path": f"./patches/patch-{i}-0-{i + 1}-1-#parent.png#.png",
+            "shape": (1, 1, 3),
+            "pixel_bounds": (i, 0, i + 1, 1),
+            "coordinates": (0.1 * i, 0.0, 0.1 * (i + 1), 0.1),
+            "geometry": box(0.1 * i, 0.0, 0.1 * (i + 1), 0.1),
+        }
+        for i in range(3)
+    }
+
+
+def test_store_like_dict(records):
+    store = ColumnarImageStore(records)
+    assert len(store) == 3
+    assert list(store) == list(records)
+    for image_id, record in records.items():
+        assert image_id in store
+        assert store[image_id] == record
+        assert list(store[image_id].keys()) == list(record.keys())
+        assert isinstance(store[image_id]["pixel_bounds"][0], int)
+        assert isinstance(store[image_id]["coordinates"][0], float)
+
+    image_id = list(records)[0]
+    store[image_id]["mean_pixel_R"] = 0.5
+    assert store[image_id]["mean_pixel_R"] == 0.5
+    del store[image_id]["mean_pixel_R"]
+    assert "mean_pixel_R" not in store[image_id]
+    assert store.get("fake", False) is False
+    with pytest.raises(KeyError):
+        store[image_id]["fake"]
+
+    del store[image_id]
+    assert image_id not in store
+    assert len(store) == 2
+    store.clear()
+    assert len(store) == 0
+
+
+def test_store_mutable_values():
+    store = ColumnarImageStore()
+    store["parent.png"] = {"parent_id": None, "patches": []}
+    store["parent.png"]["patches"].append("patch.png")
+    assert store["parent.png"]["patches"] == ["patch.png"]
+    assert store["parent.png"]["parent_id"] is None
+
+
+def test_store_mixed_types():
+    store = ColumnarImageStore()
+    store["a"] = {"value": (1, 2)}
+    store["b"] = {"value": (1.5, 2.5)}  # falls back to objects
+    store["c"] = {"value": "string"}
+    store["d"] = {"count": 1}
+    store["e"] = {"count": 1.5}
+    assert store["a"]["value"] == (1, 2)
+    assert isinstance(store["a"]["value"][0], int)
+    assert store["b"]["value"] == (1.5, 2.5)
+    assert store["c"]["value"] == "string"
+    assert store["d"]["count"] == 1
+    assert store["e"]["count"] == 1.5
+
+
+def test_store_overwrite(records):
+    store = ColumnarImageStore(records)
+    image_id = list(records)[1]
+    store[image_id] = {"parent_id": "other.png"}
+    assert store[image_id] == {"parent_id": "other.png"}
+    assert list(store) == list(records)  # order is kept
+    store[image_id] = store[image_id]
+    assert store[image_id] == {"parent_id": "other.png"}
+
+
+def test_store_to_dataframe(records):
+    store = ColumnarImageStore(records)
+    store["extra"] = {"parent_id": None, "mean_pixel_R": 0.5}
+    records["extra"] = {"parent_id": None, "mean_pixel_R": 0.5}
+    df = store.to_dataframe()
+    expected_df = pd.DataFrame.from_dict(records, orient="index")
+    assert list(df.columns) == list(expected_df.columns)
+    assert list(df.index) == list(expected_df.index)
+    for col in ["parent_id", "image_path", "shape", "pixel_bounds", "coordinates"]:
+        assert df[col].iloc[:3].tolist() == expected_df[col].iloc[:3].tolist()
+    assert df["parent_id"].iloc[3] is None
+    assert np.isnan(df["shape"].iloc[3])
+    assert df["mean_pixel_R"].iloc[3] == 0.5
+    assert np.isnan(df["mean_pixel_R"].iloc[0])
+
+
+def test_store_empty_dataframe():
+    df = ColumnarImageStore().to_dataframe()
+    assert df.empty
@@ -15,6 +15,8 @@ from mapreader.utils.load_frames import (
     load_from_csv,
     load_from_excel,
     load_from_geojson,
+    load_from_parquet,
+    save_to_parquet,
 )
 
 
@@ -54,6 +56,44 @@ def test_eval_dataframe(init_dataframes, tmp_path):
     assert isinstance(parent_df_csv.iloc[0]["patches"], list)
 
 
+def test_eval_dataframe_columns():
+    df = pd.DataFrame(
+        {
+            "pixel_bounds": ["(0, 0, 1, 1)", "(1, 0, 2, 1)"],
+            "coordinates": ["(-1.5, 50.0, -1.25, 50.5)", "(1e-05, 2.0, 3.0, 4.0)"],
+            "mixed_tuple": ["(1, 2.5)", "(3, 4)"],
+            "list": ["[1, 2]", "['a']"],
+            "missing": ["(0, 0, 1, 1)", None],
+            "leading_zero": ["(01, 2)", "(1, 2)"],  # not valid python
+            "zero": ["(0, -0)", "(00, 1)"],
+            "text": ["no", "railspace"],
+            "image_path": ["(0, 0)", "(1, 1)"],  # known string column
+        }
+    )
+    df = eval_dataframe(df)
+    assert df["pixel_bounds"].tolist() == [(0, 0, 1, 1), (1, 0, 2, 1)]
+    assert isinstance(df["pixel_bounds"][0][0], int)
+    assert df["coordinates"].tolist() == [
+        (-1.5, 50.0, -1.25, 50.5),
+        (1e-05, 2.0, 3.0, 4.0),
+    ]
+    assert df["mixed_tuple"].tolist() == [(1, 2.5), (3, 4)]
+    assert isinstance(df["mixed_tuple"][1][0], int)
+    assert df["list"].tolist() == [[1, 2], ["a"]]
+    assert df["missing"].tolist() == ["(0, 0, 1, 1)", None]  # not evaluated
+    assert df["leading_zero"].tolist() == ["(01, 2)", "(1, 2)"]  # not evaluated
+    assert df["zero"].tolist() == [(0, 0), (0, 1)]
+    assert df["text"].tolist() == ["no", "railspace"]
+    assert df["image_path"].tolist() == ["(0, 0)", "(1, 1)"]
+
+
+def test_eval_dataframe_sample():
+    # only the last value cannot be evaluated
+    df = pd.DataFrame({"col": ["[1]"] * 1000 + ["text"]})
+    df = eval_dataframe(df, sample_size=10)
+    assert df["col"].tolist() == ["[1]"] * 1000 + ["text"]
+
+
 def test_load_from_csv(init_dataframes, tmp_path):
     parent_df, _ = init_dataframes
     parent_df.rename(
@@ -193,6 +233,61 @@ def test_load_from_geojson(init_dataframes, tmp_path):
     )  # should be shapely Polygon (always)
 
 
+def test_load_from_parquet(init_dataframes, tmp_path):
+    parent_df, patch_df = init_dataframes
+    mixed = [1, "a", (1, 2), {"k": 1}, [1, "b"]]
+    patch_df["mixed"] = mixed + [None] * (len(patch_df) - len(mixed))
+    for df, name in [(parent_df, "parent_df"), (patch_df, "patch_df")]:
+        save_to_parquet(df, f"{tmp_path}/{name}.parquet")
+        df_parquet = load_from_parquet(f"{tmp_path}/{name}.parquet")
+        assert isinstance(df_parquet, gpd.GeoDataFrame)
+        assert df_parquet.crs == df.crs
+        assert df_parquet.index.name == "image_id"
+        assert list(df_parquet.index) == list(df.index)
+        assert list(df_parquet.columns) == list(df.columns)
+        assert df_parquet.dtypes.equals(df.dtypes)
+        assert df_parquet.geometry.geom_equals(df.geometry).all()
+        assert df_parquet["shape"].tolist() == df["shape"].tolist()
+        assert isinstance(df_parquet.iloc[0]["shape"], tuple)
+        assert isinstance(df_parquet.iloc[0]["coordinates"], tuple)
+
+    # mixed types are kept
+    assert df_parquet["mixed"].tolist() == patch_df["mixed"].tolist()
+    assert isinstance(df_parquet.iloc[2]["mixed"], tuple)
+    parent_df_parquet = load_from_parquet(f"{tmp_path}/parent_df.parquet")
+    assert parent_df_parquet.iloc[0]["patches"] == parent_df.iloc[0]["patches"]
+
+    assert get_load_function(f"{tmp_path}/patch_df.parquet") == load_from_parquet
+
+    # GeoParquet files can be read by geopandas
+    patch_df_gpd = gpd.read_parquet(f"{tmp_path}/patch_df.parquet")
+    assert patch_df_gpd.crs == patch_df.crs
+    assert patch_df_gpd.geometry.geom_equals(patch_df.geometry).all()
+
+
+def test_load_from_parquet_no_geo(init_dataframes, tmp_path):
+    parent_df, _ = init_dataframes
+    parent_df = pd.DataFrame(parent_df.drop(columns="geometry"))
+    save_to_parquet(parent_df, f"{tmp_path}/parent_df_no_geo.parquet")
+    parent_df_parquet = load_from_parquet(f"{tmp_path}/parent_df_no_geo.parquet")
+    assert not isinstance(parent_df_parquet, gpd.GeoDataFrame)
+    assert isinstance(parent_df_parquet.iloc[0]["shape"], tuple)
+    assert isinstance(parent_df_parquet.iloc[0]["patches"], list)
+
+    df = pd.DataFrame({"mixed": [(1, 2), "a", None], "number": [1, 2, 3]})
+    save_to_parquet(df, f"{tmp_path}/mixed.parquet")
+    df_parquet = load_from_parquet(f"{tmp_path}/mixed.parquet")
+    assert df_parquet["mixed"].tolist() == [(1, 2), "a", None]
+    assert df_parquet["number"].tolist() == [1, 2, 3]
+
+
+def test_save_to_parquet_error(init_dataframes, tmp_path):
+    _, patch_df = init_dataframes
+    patch_df["mixed"] = [object()] + ["a"] * (len(patch_df) - 1)
+    with pytest.raises(ValueError, match="Cannot save column 'mixed'"):
+        save_to_parquet(patch_df, f"{tmp_path}/patch_df.parquet")
+
+
 def test_get_load_function(sample_dir):
     assert (
         get_load_function(f"{sample_dir}/post_processing_patch_df.csv") == load_from_csv
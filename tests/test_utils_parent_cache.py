@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mapreader.utils.parent_cache import ParentPixelCache
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P", "1"])
+def test_parent_cache(tmp_path, mode):
+    image_path = f"{tmp_path}/image.png"
+    image = Image.fromarray(np.random.randint(0, 255, (5, 6, 3), dtype=np.uint8))
+    image.convert(mode).save(image_path)
+    expected = np.array(Image.open(image_path))
+
+    cache = ParentPixelCache(f"{tmp_path}/cache")
+    array = cache.get(image_path)
+    assert isinstance(array, np.memmap)
+    assert not array.flags.writeable
+    assert array.dtype == expected.dtype
+    assert (array == expected).all()
+    assert len(os.listdir(cache.cache_dir)) == 1
+
+    # cache persists and can be pickled
+    cache = pickle.loads(pickle.dumps(ParentPixelCache(cache.cache_dir)))
+    assert (cache.get(image_path) == expected).all()
+    assert len(os.listdir(cache.cache_dir)) == 1
+
+    img = cache.get_image(image_path)
+    assert img.mode == mode
+    assert (np.array(img) == expected).all()
+
+
+def test_parent_cache_changed_file(tmp_path):
+    image_path = f"{tmp_path}/image.png"
+    Image.new("RGB", (5, 5)).save(image_path)
+    cache = ParentPixelCache(f"{tmp_path}/cache")
+    assert cache.get(image_path).shape == (5, 5, 3)
+
+    Image.new("RGB", (6, 4), (1, 2, 3)).save(image_path)
+    os.utime(image_path, ns=(0, 0))  # make sure the modification time changes
+    array = cache.get(image_path)
+    assert array.shape == (4, 6, 3)
+    assert (array == [1, 2, 3]).all()
+
+    cache.clear()
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_parent_cache_evict(tmp_path):
+    image_paths = [f"{tmp_path}/image_{i}.png" for i in range(3)]
+    for image_path in image_paths:
+        Image.new("RGB", (10, 10)).save(image_path)
+
+    cache = ParentPixelCache(f"{tmp_path}/cache", max_bytes=1000)
+    cache.get(image_paths[0])
+    cache.get(image_paths[1])
+    os.utime(cache._cache_path(image_paths[0]), ns=(0, 0))  # least recently used
+    cache.get(image_paths[2])
+
+    cached = os.listdir(cache.cache_dir)
+    assert len(cached) == 2
+    assert os.path.basename(cache._cache_path(image_paths[0])) not in cached
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from PIL import Image
+
+from mapreader.utils.patch_shards import (
+    PatchShardWriter,
+    is_complete_shard,
+    iter_shard,
+    load_patch_from_shard,
+    read_shard_index,
+)
+
+
+@pytest.fixture
+def patches():
+    return {
+        f"patch-{i}-0-{i + 1}-1-#parent.png#.png": Image.new(
+            "RGB", (3, 2), color=(i, i, i)
+        )
+        for i in range(3)
+    }
+
+
+def test_write_and_read_shard(patches, tmp_path):
+    shard_path = f"{tmp_path}/patches.tar"
+    with PatchShardWriter(shard_path) as shard_writer:
+        for patch_id, patch in patches.items():
+            shard_writer.add(patch_id, patch, "png")
+    assert is_complete_shard(shard_path)
+    assert not os.path.exists(f"{shard_path}.tmp")
+
+    index = read_shard_index(shard_path)
+    assert list(index.keys()) == list(patches.keys())
+    assert all(entry["shape"] == (2, 3, 3) for entry in index.values())
+
+    for patch_id, patch in patches.items():
+        loaded = load_patch_from_shard(shard_path, patch_id)
+        assert list(loaded.getdata()) == list(patch.getdata())
+
+    for (patch_id, loaded), (expected_id, patch) in zip(
+        iter_shard(shard_path), patches.items()
+    ):
+        assert patch_id == expected_id
+        assert list(loaded.getdata()) == list(patch.getdata())
+
+
+def test_incomplete_shard(patches, tmp_path):
+    shard_path = f"{tmp_path}/patches.tar"
+    with pytest.raises(RuntimeError):
+        with PatchShardWriter(shard_path) as shard_writer:
+            for patch_id, patch in patches.items():
+                shard_writer.add(patch_id, patch, "png")
+            raise RuntimeError("Interrupted")
+    assert not is_complete_shard(shard_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_rewritten_shard(patches, tmp_path):
+    shard_path = f"{tmp_path}/patches.tar"
+    with PatchShardWriter(shard_path) as shard_writer:
+        for patch_id, patch in patches.items():
+            shard_writer.add(patch_id, patch, "png")
+    assert list(read_shard_index(shard_path)) == list(patches)
+
+    # rewrite the shard without using ``PatchShardWriter`` in this process (e.g. in a worker process)
+    os.rename(shard_path, f"{tmp_path}/old.tar")
+    os.rename(f"{shard_path}.index.json", f"{tmp_path}/old.tar.index.json")
+    new_patches = {"patch-0-0-2-2-#parent.png#.png": Image.new("L", (2, 2), color=5)}
+    with PatchShardWriter(f"{tmp_path}/new.tar") as shard_writer:
+        for patch_id, patch in new_patches.items():
+            shard_writer.add(patch_id, patch, "png")
+    os.replace(f"{tmp_path}/new.tar", shard_path)
+    os.replace(f"{tmp_path}/new.tar.index.json", f"{shard_path}.index.json")
+
+    assert list(read_shard_index(shard_path)) == list(new_patches)
+    loaded = load_patch_from_shard(shard_path, "patch-0-0-2-2-#parent.png#.png")
+    assert list(loaded.getdata()) == [5, 5, 5, 5]
+
+
+def test_interrupted_rewrite(patches, tmp_path, monkeypatch):
+    shard_path = f"{tmp_path}/patches.tar"
+    with PatchShardWriter(shard_path) as shard_writer:
+        for patch_id, patch in patches.items():
+            shard_writer.add(patch_id, patch, "png")
+    assert is_complete_shard(shard_path)
+
+    def interrupt(*args, **kwargs):
+        raise RuntimeError("Interrupted")
+
+    # interrupted after the new shard has replaced the old one but before its index is written
+    monkeypatch.setattr("mapreader.utils.patch_shards.json.dump", interrupt)
+    shard_writer = PatchShardWriter(shard_path)
+    shard_writer.add("patch-0-0-2-2-#parent.png#.png", Image.new("L", (2, 2)), "png")
+    with pytest.raises(RuntimeError):
+        shard_writer.close()
+    assert not is_complete_shard(shard_path)
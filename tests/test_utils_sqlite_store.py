@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from mapreader.utils.sqlite_store import _LIVE_SIZE, SQLiteImageStore
+
+
+@pytest.fixture
+def records():
+    return {
+        f"patch-{i}-0-{i + 1}-1-#parent.png#.png": {
+            "parent_id": "parent.png",
+            "image_path": f"./patches/patch-{i}-0-{i + 1}-1-#parent.png#.png",
+            "shape": (1, 1, 3),
+            "pixel_bounds": (i, 0, i + 1, 1),
+            "coordinates": (0.1 * i, 0.0, 0.1 * (i + 1), 0.1),
+            "geometry": box(0.1 * i, 0.0, 0.1 * (i + 1), 0.1),
+        }
+        for i in range(3)
+    }
+
+
+@pytest.fixture
+def store(records, tmp_path):
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db", table="patch")
+    store.update(records)
+    yield store
+    store.close()
+
+
+def test_store_like_dict(store, records):
+    assert len(store) == 3
+    assert list(store) == list(records)
+    for image_id, record in records.items():
+        assert image_id in store
+        assert store[image_id] == record
+        assert list(store[image_id].keys()) == list(record.keys())
+        assert isinstance(store[image_id]["pixel_bounds"][0], int)
+
+    image_id = list(records)[0]
+    store[image_id]["mean_pixel_R"] = 0.5
+    assert store[image_id]["mean_pixel_R"] == 0.5
+    del store[image_id]["mean_pixel_R"]
+    assert "mean_pixel_R" not in store[image_id]
+    assert store.get("fake", False) is False
+    with pytest.raises(KeyError):
+        store[image_id]["fake"]
+
+    del store[image_id]
+    assert image_id not in store
+    assert len(store) == 2
+    store.clear()
+    assert len(store) == 0
+
+
+def test_store_mutable_values(tmp_path):
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    store["parent.png"] = {"parent_id": None, "patches": []}
+    store["parent.png"]["patches"].append("patch.png")
+    assert store["parent.png"]["patches"] == ["patch.png"]
+    assert store["parent.png"]["parent_id"] is None
+    store.close()
+
+    # in place changes are saved when the store is closed
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    assert store["parent.png"]["patches"] == ["patch.png"]
+    store.close()
+
+
+def test_store_held_mutable_values(tmp_path):
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    for i in range(_LIVE_SIZE + 44):
+        store[f"p{i}"] = {"patches": []}
+    patches = store["p0"]["patches"]
+    # reading more mutable values than are kept in memory
+    for i in range(1, _LIVE_SIZE + 44):
+        store[f"p{i}"]["patches"]
+    patches.append("x")
+    assert store["p0"]["patches"] == ["x"]
+    store.close()
+
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    assert store["p0"]["patches"] == ["x"]
+    store.close()
+
+
+def test_store_value_types(tmp_path):
+    values = {
+        "none": None,
+        "bool": True,
+        "tuple": (1, 2.5, "a"),
+        "nested": [(0, 1), {"k": (1, 2)}, {3}],
+        "dict": {"k": 1, (1, 2): [None]},
+        "geometry": box(0, 0, 1, 1),
+        "array": np.arange(3, dtype="uint8"),
+        "numpy": np.float32(0.5),
+    }
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    store["image.png"] = values
+    store.close()
+
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    record = store["image.png"].copy()
+    assert record.pop("array").tolist() == [0, 1, 2]
+    assert record.pop("geometry").equals(box(0, 0, 1, 1))
+    assert record == {k: v for k, v in values.items() if k not in ["array", "geometry"]}
+    assert isinstance(record["nested"][0], tuple)
+    with pytest.raises(TypeError, match="cannot be saved"):
+        store["image.png"]["fake"] = object()
+    store.close()
+
+
+def test_store_rejects_pickles(tmp_path):
+    store = SQLiteImageStore(f"{tmp_path}/catalog.db")
+    store["image.png"] = {"shape": None}
+    store._connection.execute("UPDATE images SET shape = ?", [pickle.dumps((1, 1, 3))])
+    with pytest.raises(ValueError, match="Cannot decode value"):
+        store["image.png"]["shape"]
+    store.close()
+
+
+def test_store_overwrite(store, records):
+    image_id = list(records)[1]
+    store[image_id] = {"parent_id": "other.png", "label": None}
+    assert store[image_id] == {"parent_id": "other.png", "label": None}
+    assert list(store) == list(records)  # order is kept
+    store[image_id] = store[image_id]
+    assert store[image_id] == {"parent_id": "other.png", "label": None}
+    store[image_id] = {"image_id": image_id}  # e.g. added by ``add_metadata``
+    assert store[image_id] == {"image_id": image_id}
+
+
+def test_store_queries(store, records):
+    image_ids = list(records)
+    store[image_ids[0]]["label"] = "railspace"
+    assert store.find("parent_id", "parent.png") == image_ids
+    assert store.find("label", "railspace") == image_ids[:1]
+    assert store.find("fake", "railspace") == []
+    assert store.query_bounds((0.15, 0.05, 0.25, 0.2)) == image_ids[1:]
+    assert store.query_bounds((1, 1, 2, 2)) == []
+    store[image_ids[1]]["coordinates"] = (1.0, 1.0, 1.5, 1.5)
+    assert store.query_bounds((1, 1, 2, 2)) == image_ids[1:2]
+
+
+def test_store_to_dataframe(store, records):
+    store["extra"] = {"parent_id": None, "mean_pixel_R": 0.5}
+    records["extra"] = {"parent_id": None, "mean_pixel_R": 0.5}
+    df = store.to_dataframe()
+    expected_df = pd.DataFrame.from_dict(records, orient="index")
+    assert list(df.columns) == list(expected_df.columns)
+    assert list(df.index) == list(expected_df.index)
+    for col in ["parent_id", "image_path", "shape", "pixel_bounds", "coordinates"]:
+        assert df[col].iloc[:3].tolist() == expected_df[col].iloc[:3].tolist()
+    assert df["parent_id"].iloc[3] is None
+    assert np.isnan(df["shape"].iloc[3])
+    assert df["mean_pixel_R"].iloc[3] == 0.5
+    assert np.isnan(df["mean_pixel_R"].iloc[0])
+
+
+def test_store_empty_dataframe():
+    store = SQLiteImageStore()
+    assert store.to_dataframe().empty
+    db_path = store.db_path
+    store.close()
+    assert not os.path.exists(db_path)